@@ -1,53 +1,166 @@
-from typing import Any, Dict, List
+import asyncio
+import functools
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi import status as http_status
+from fastapi.responses import PlainTextResponse, StreamingResponse, Response
 from starlette.authentication import requires
 from pymongo import UpdateOne, ASCENDING
 
 from models.returnset import ReturnSetModel
 from models.course import CourseModel, AssignEvaluatorsPayload
 from config.app import uvicornLogger
-from core.dbdata import db_collection
 from core.uvicorn_logger import UvicornLogger
-from data import course, department
-from pydantic import BaseModel, Field
-import re
+from data import course
+from pydantic import BaseModel, Field, ValidationError
+import codecs
+import csv
+import json
+import zlib
+
+# Mongo access through the metered wrapper so route round trips show up in /metrics
+db_collection = course.metered_collection
 
 router = APIRouter(tags=["course"])
+# ensure the course indexes (and optionally verify query plans) once, then
+# pre-warm the term cache from application startup until shutdown
+router.add_event_handler("startup", course.course_index_startup)
+router.add_event_handler("startup", course.start_cache_warmer)
+router.add_event_handler("shutdown", course.stop_cache_warmer)
+# write out queued read-path backfills before the worker exits
+router.add_event_handler("shutdown", course.stop_course_write_behind)
+# follow the shared metrics on/off setting
+router.add_event_handler("startup", course.start_metrics_setting_watcher)
+router.add_event_handler("shutdown", course.stop_metrics_setting_watcher)
 class RequestsSearchFilter(BaseModel) :
     search : str = Field('', max_length=6)
 
 from bson import ObjectId
 
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_ROWS_PER_CHUNK = 500
+
+# One course per line, a few hundred lines per chunk
+def _ndjson_rows(docs: Iterable[Dict[str, Any]], removed: Iterable[str] = ()):
+    lines: List[bytes] = []
+    for doc in docs:
+        lines.append(course.encode_json(doc))
+        if len(lines) >= NDJSON_ROWS_PER_CHUNK:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    # ?since=: courses that dropped out of the filter come last, one
+    # {"removed": id} line each
+    for course_id in removed:
+        lines.append(course.encode_json({"removed": course_id}))
+        if len(lines) >= NDJSON_ROWS_PER_CHUNK:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+# ReturnSetModel body built around already-encoded data, so large course
+# payloads (normalized when cached) skip response_model validation and the
+# stdlib encoder
+_DATA_PLACEHOLDER = "__course_data__"
+
+@functools.lru_cache(maxsize=None)
+def _envelope(status: str):
+    body = course.encode_json(ReturnSetModel(status=status, data=_DATA_PLACEHOLDER).model_dump())
+    return tuple(body.split(course.encode_json(_DATA_PLACEHOLDER), 1))
+
+def _fast_response(data: Any = None, encoded: Optional[bytes] = None,
+                   headers: Optional[Dict[str, str]] = None, status: str = "success") -> Response:
+    before, after = _envelope(status)
+    body = encoded if encoded is not None else course.encode_json(data)
+    return Response(content=before + body + after, media_type="application/json", headers=headers)
+
+# Weak ETag for a filtered view of the term snapshot: same snapshot version,
+# row count and filter -> same body
+def _course_list_etag(term_code: str, version: int, count: int, search: str) -> str:
+    return f'W/"{term_code}-{version}-{count}-{zlib.crc32(search.encode()):08x}"'
+
+def _course_list_headers(term_code: str, snapshot: Dict[str, Any], search: str) -> Dict[str, str]:
+    return {
+        "ETag": _course_list_etag(term_code, snapshot["version"], snapshot["count"], search),
+        "X-Course-Version": str(snapshot["version"]),
+    }
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
 @router.post("/course", response_model=ReturnSetModel)
-def display_course(request: Request, term_code: str, searchFilter : RequestsSearchFilter):
+@course.instrumented_route("display_course")
+def display_course(request: Request, term_code: str, searchFilter : RequestsSearchFilter,
+                   stream: bool = False, since: Optional[int] = None):
 
     if not any(role in ["******.Admin"] for role in request.user.roles):
         raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
 
     try:
-        # _doc is to update/refresh the mongo
-        _docs = course.list_courses_for_term(term_code, ttl_hours=2)
-        # get courses from mongo with status 'RF' or 'RT'
         search_args = (searchFilter.search or '').strip()
-        query: Dict[str, Any] = {
-            "term_code": term_code,
-            "status": {"$in": ["RF", "RT"]}
-        }
-        if search_args:
-            query["college_code"] = {"$regex": f"^{re.escape(search_args)}"}
 
-        col = db_collection("course")
-        cursor = col.find(query)
-        docs = []
-        for doc in cursor:
-            doc['_id'] = str(doc['_id'])
-            docs.append(doc)
-        return ReturnSetModel(status="success", data=docs)
+        # Nothing changed since the client's copy: skip building the list
+        if since is None and request.headers.get("if-none-match"):
+            version, count = course.course_term_version(term_code, ttl_hours=2)
+            etag = _course_list_etag(term_code, version, count, search_args)
+            if _etag_matches(request, etag):
+                return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        # Opt-in streaming (?stream=true or Accept: application/x-ndjson) so the
+        # client can render large terms before the whole list arrives
+        streaming = stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+        # get courses with status 'RF' or 'RT' from the cached term snapshot,
+        # as JSON encoded once per snapshot change
+        if since is None and not streaming:
+            view = course.encoded_course_view(term_code, ["RF", "RT"], search_args, ttl_hours=2)
+            return _fast_response(encoded=view["body"], headers=_course_list_headers(term_code, view, search_args))
+
+        # (?since=<version>: only those added/changed after that version)
+        snapshot = course.course_snapshot_rows(term_code, ["RF", "RT"], search_args, since=since, ttl_hours=2)
+        headers = _course_list_headers(term_code, snapshot, search_args)
+        docs = course.iter_course_rows(snapshot["fields"], snapshot["rows"])
+
+        # rows are unpacked and encoded as the stream is consumed
+        if streaming:
+            return StreamingResponse(_ndjson_rows(docs, snapshot["removed"]),
+                                     media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+        return _fast_response({
+            "version": snapshot["version"],
+            "since": since,
+            "courses": list(docs),
+            "removed": snapshot["removed"],
+        }, headers=headers)
+
+    except Exception as e:
+        uvicornLogger.exception(e)
+        raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+class CourseSearchPayload(BaseModel):
+    query: str = Field(..., max_length=100)
+    statuses: List[str] = ["RF", "RT"]
+    page: int = Field(1, ge=1)
+    page_size: int = Field(50, ge=1, le=200)
+
+# Ranked search over the cached term by college code/name, transfer and
+# institution subject/number
+@router.post("/course/search", response_model=ReturnSetModel)
+@course.instrumented_route("search_courses")
+def search_courses(request: Request, term_code: str, body: CourseSearchPayload):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
 
+    try:
+        results = course.search_courses_for_term(
+            term_code, body.query, statuses=body.statuses, page=body.page, page_size=body.page_size, ttl_hours=2
+        )
+        return _fast_response(results)
     except Exception as e:
         uvicornLogger.exception(e)
         raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -57,6 +170,7 @@ class CourseDetailsPayload(BaseModel):
     id: str
 
 @router.post("********/details", response_model=ReturnSetModel)
+@course.instrumented_route("get_course_details")
 async def get_course_details(request: Request, term_code: str, body: CourseDetailsPayload):
     if not any(role in ["******.Admin"] for role in request.user.roles):
         raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
@@ -66,48 +180,39 @@ async def get_course_details(request: Request, term_code: str, body: CourseDetai
         trans_subj = body.trans_subj
 
         course_col = db_collection("course")
-        course = course_col.find_one({"_id": ObjectId(id)})
+        # department config is only needed when the course has no assignment yet,
+        # but it's independent of the course lookup so fetch both together
+        course_doc, dept_config = await asyncio.gather(
+            course.run_blocking(course_col.find_one, {"_id": ObjectId(id)}),
+            course.run_blocking(course.get_dept_config, trans_subj),
+        )
 
         # If course already has evaluator info, ensure evaluators_names exists and return it
-        if course and course.get('assigned_evaluator'):
+        if course_doc and course_doc.get('assigned_evaluator'):
             # Get names for the evaluators list
-            evaluator_ids = course.get('evaluators', []) or []
-            names = department.get_evaluator_name(evaluator_ids) or []
-
-            # If not stored yet, persist evaluators_names to Mongo
-            if course.get('evaluators_names') != names:
-                course_col.update_one(
-                    {"_id": ObjectId(id)},
-                    {"$set": {"evaluators_names": names}}
-                )
+            evaluator_ids = course_doc.get('evaluators', []) or []
+            names = await course.run_blocking(course.evaluator_names, evaluator_ids) or []
+
+            # If not stored yet, queue evaluators_names for the next write-behind flush
+            # (written only while the course still has these evaluators)
+            if course_doc.get('evaluators_names') != names:
+                await course.run_blocking(course.queue_course_update, ObjectId(id), {"evaluators_names": names}, term_code,
+                                          {"evaluators": course_doc.get('evaluators')})
 
             return ReturnSetModel(
                 status="success",
                 data={
-                    "assigned_evaluator": course.get('assigned_evaluator'),
-                    "assigned_coll_code": course.get('assigned_coll_code'),
-                    "assigned_coll_desc": course.get('assigned_coll_desc'),
-                    "assigned_dept_code": course.get('assigned_dept_code'),
-                    "assigned_dept_desc": course.get('assigned_dept_desc'),
+                    "assigned_evaluator": course_doc.get('assigned_evaluator'),
+                    "assigned_coll_code": course_doc.get('assigned_coll_code'),
+                    "assigned_coll_desc": course_doc.get('assigned_coll_desc'),
+                    "assigned_dept_code": course_doc.get('assigned_dept_code'),
+                    "assigned_dept_desc": course_doc.get('assigned_dept_desc'),
                     "evaluators": evaluator_ids,
                     "evaluators_names": names,
                 }
             )
 
         # Else, get evaluator info from department config
-        col = db_collection("departmentconfig")
-        dept_config = col.find_one(
-            {"transfer_course": trans_subj},
-            {
-                "_id": 0,
-                "evaluator": 1,
-                "coll_code": 1,
-                "coll_desc": 1,
-                "dept_code": 1,
-                "dept_desc": 1
-            }
-        )
-
         if not dept_config or 'evaluator' not in dept_config:
             return ReturnSetModel(
                 status="success",
@@ -138,9 +243,13 @@ async def get_course_details(request: Request, term_code: str, body: CourseDetai
             )
 
         primary_evaluator = evaluator_ids[0]
-        evaluators = department.dept_for_evaluator(primary_evaluator) or []
+        evaluators, names = await asyncio.gather(
+            course.run_blocking(course.evaluator_dept, primary_evaluator),
+            course.run_blocking(course.evaluator_names, evaluator_ids),
+        )
+        evaluators = evaluators or []
         if evaluators:
-            names = department.get_evaluator_name(evaluator_ids) or []
+            names = names or []
             info = evaluators[0]
             update_fields = {
                 "evaluators": evaluator_ids,
@@ -151,7 +260,9 @@ async def get_course_details(request: Request, term_code: str, body: CourseDetai
                 "assigned_dept_code": info.get("dept_code"),
                 "assigned_dept_desc": info.get("dept_desc"),
             }
-            course_col.update_one({"_id": ObjectId(id)}, {"$set": update_fields})
+            # written only while the course is still unassigned
+            await course.run_blocking(course.queue_course_update, ObjectId(id), update_fields, term_code,
+                                      {"assigned_evaluator": None})
 
             return ReturnSetModel(
                 status="success",
@@ -191,7 +302,129 @@ async def get_course_details(request: Request, term_code: str, body: CourseDetai
 
 
 
+# Capped per request (422 past the cap); larger batches are split by the caller
+BULK_DETAILS_MAX_IDS = 200
+
+class BulkCourseDetailsPayload(BaseModel):
+    ids: List[str] = Field(..., max_length=BULK_DETAILS_MAX_IDS)
+
+def _empty_details() -> Dict[str, Any]:
+    return {
+        "assigned_evaluator": None,
+        "assigned_coll_code": None,
+        "assigned_coll_desc": None,
+        "assigned_dept_code": None,
+        "assigned_dept_desc": None,
+        "evaluators": [],
+        "evaluators_names": [],
+    }
+
+# Same resolution as get_course_details for many courses of a term at once:
+# one $in fetch for the courses, department configs from the in-memory index,
+# evaluators resolved once per distinct subject,
+# backfilled fields persisted through the write-behind queue
+@router.post("********/details/bulk", response_model=ReturnSetModel)
+@course.instrumented_route("get_course_details_bulk")
+def get_course_details_bulk(request: Request, term_code: str, body: BulkCourseDetailsPayload):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    ids = list(dict.fromkeys(body.ids))
+    try:
+        object_ids = [ObjectId(i) for i in ids]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid course ID format")
+
+    try:
+        course_col = db_collection("course")
+        courses = {
+            str(doc["_id"]): doc
+            for doc in course_col.find({"_id": {"$in": object_ids}, "term_code": term_code})
+        }
+
+        # Department configs for every subject that still needs an assignment
+        subjects = {
+            doc.get("trans_subj") for doc in courses.values()
+            if not doc.get("assigned_evaluator") and doc.get("trans_subj")
+        }
+        dept_configs = course.get_dept_configs(list(subjects))
+
+        # Warm the evaluator name cache for all ids in one batched lookup
+        all_evaluators: List[Any] = []
+        for doc in courses.values():
+            if doc.get("assigned_evaluator"):
+                all_evaluators.extend(doc.get("evaluators") or [])
+        for cfg in dept_configs.values():
+            if isinstance(cfg.get("evaluator"), list):
+                all_evaluators.extend(cfg["evaluator"])
+        if all_evaluators:
+            course.evaluator_names(list(dict.fromkeys(all_evaluators)))
+
+        # Resolve assignment fields once per subject
+        resolved: Dict[str, Dict[str, Any]] = {}
+        for subj, cfg in dept_configs.items():
+            evaluator_ids = cfg.get("evaluator") or []
+            if not isinstance(evaluator_ids, list) or len(evaluator_ids) == 0:
+                continue
+            evaluators = course.evaluator_dept(evaluator_ids[0]) or []
+            if not evaluators:
+                continue
+            info = evaluators[0]
+            resolved[subj] = {
+                "evaluators": evaluator_ids,
+                "evaluators_names": course.evaluator_names(evaluator_ids) or [],
+                "assigned_evaluator": evaluator_ids[0],
+                "assigned_coll_code": info.get("coll_code"),
+                "assigned_coll_desc": info.get("coll_desc"),
+                "assigned_dept_code": info.get("dept_code"),
+                "assigned_dept_desc": info.get("dept_desc"),
+            }
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for course_id in ids:
+            course_doc = courses.get(course_id)
+            if course_doc is None:
+                results[course_id] = _empty_details()
+                continue
+
+            if course_doc.get("assigned_evaluator"):
+                evaluator_ids = course_doc.get("evaluators", []) or []
+                names = course.evaluator_names(evaluator_ids) or []
+                if course_doc.get("evaluators_names") != names:
+                    course.queue_course_update(course_doc["_id"], {"evaluators_names": names}, term_code,
+                                               {"evaluators": course_doc.get("evaluators")})
+                results[course_id] = {
+                    "assigned_evaluator": course_doc.get("assigned_evaluator"),
+                    "assigned_coll_code": course_doc.get("assigned_coll_code"),
+                    "assigned_coll_desc": course_doc.get("assigned_coll_desc"),
+                    "assigned_dept_code": course_doc.get("assigned_dept_code"),
+                    "assigned_dept_desc": course_doc.get("assigned_dept_desc"),
+                    "evaluators": evaluator_ids,
+                    "evaluators_names": names,
+                }
+                continue
+
+            update_fields = resolved.get(course_doc.get("trans_subj"))
+            if update_fields is None:
+                results[course_id] = _empty_details()
+                continue
+            course.queue_course_update(course_doc["_id"], update_fields, term_code, {"assigned_evaluator": None})
+            results[course_id] = dict(update_fields)
+
+        return _fast_response(results)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        uvicornLogger.exception(e)
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error finding department configuration: {str(e)}"
+        )
+
+
 @router.patch("***/send", response_model=ReturnSetModel)
+@course.instrumented_route("assign_evaluators_to_course")
 def assign_evaluators_to_course(request: Request, body: AssignEvaluatorsPayload):
     if not any(role in ["******.Admin"] for role in request.user.roles):
         raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
@@ -201,23 +434,23 @@ def assign_evaluators_to_course(request: Request, body: AssignEvaluatorsPayload)
     course_id = ObjectId(body.course_id)
     
     # Get the current course data
-    course = course_col.find_one({"_id": course_id})
+    course_doc = course_col.find_one({"_id": course_id})
     
-    if not course:
+    if not course_doc:
         raise HTTPException(status_code=404, detail="Course not found")
     
     # If course already has evaluators, just update the status
-    if course.get('evaluators') and course.get('assigned_evaluator'):
+    if course_doc.get('evaluators') and course_doc.get('assigned_evaluator'):
         update_doc = {
-            "$set": {
-                "updated_at": datetime.utcnow(),
+            "$set": course.course_write_fields({
                 "status": "SE"
-            }
+            })
         }
         
         res = course_col.update_one({"_id": course_id}, update_doc)
         if res.matched_count == 0:
             raise HTTPException(status_code=404, detail="Course not found")
+        course.update_cached_course(course_doc.get("term_code"), course_id, update_doc["$set"])
             
         return ReturnSetModel(
             status="success",
@@ -226,18 +459,7 @@ def assign_evaluators_to_course(request: Request, body: AssignEvaluatorsPayload)
     
     # Fall back to department config if no evaluators exist
     try:
-        col = db_collection("departmentconfig")
-        dept_config = col.find_one(
-            {"transfer_course": body.trans_subj},
-            {
-                "_id": 0,
-                "evaluator": 1,
-                "coll_code": 1,
-                "coll_desc": 1,
-                "dept_code": 1,
-                "dept_desc": 1
-            }
-        )
+        dept_config = course.get_dept_config(body.trans_subj)
         
         if not dept_config:
             raise HTTPException(
@@ -252,7 +474,7 @@ def assign_evaluators_to_course(request: Request, body: AssignEvaluatorsPayload)
                 status_code=404,
                 detail=f"No evaluators found for subject: {body.trans_subj}"
             )
-        names = department.get_evaluator_name(evaluators) or []
+        names = course.evaluator_names(evaluators) or []
         # Convert to list if not already and ensure all are strings
         matched = [str(e) for e in (evaluators if isinstance(evaluators, list) else [evaluators])]
         
@@ -296,17 +518,17 @@ def assign_evaluators_to_course(request: Request, body: AssignEvaluatorsPayload)
     try:
         # Update evaluators list and assigned fields in a single operation
         update_doc = {
-            "$set": {
-                "updated_at": datetime.utcnow(),
+            "$set": course.course_write_fields({
                 "evaluators": matched,
                 **assigned_fields
-            }
+            })
         }
 
         res = col.update_one(query, update_doc, upsert=False)
 
         if res.matched_count == 0:
             raise HTTPException(status_code=404, detail="Course not found")
+        course.update_cached_course(course_doc.get("term_code"), course_id, update_doc["$set"])
 
         return ReturnSetModel(status="success", data={"evaluators": matched, **assigned_fields})
     except HTTPException:
@@ -317,7 +539,42 @@ def assign_evaluators_to_course(request: Request, body: AssignEvaluatorsPayload)
 
 
 
+class BulkSendPayload(BaseModel):
+    term_code: str
+    college_code: Optional[str] = None
+    trans_subj: Optional[str] = None
+
+@router.post("***/send/bulk", response_model=ReturnSetModel)
+@course.instrumented_route("bulk_assign_evaluators")
+def bulk_assign_evaluators(request: Request, body: BulkSendPayload):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    try:
+        job = course.start_bulk_send_job(
+            body.term_code.strip(),
+            college_code=(body.college_code or "").strip() or None,
+            trans_subj=(body.trans_subj or "").strip().upper() or None,
+        )
+        return ReturnSetModel(status="success", data=job)
+    except Exception as e:
+        uvicornLogger.exception(e)
+        raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.get("***/send/bulk/{job_id}", response_model=ReturnSetModel)
+def bulk_assign_evaluators_status(request: Request, job_id: str):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    job = course.get_bulk_send_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Bulk send job not found")
+    return ReturnSetModel(status="success", data=job)
+
+
+
 @router.post("/manualcourse", response_model=ReturnSetModel)
+@course.instrumented_route("create_manual_course")
 async def create_manual_course(request: Request, course_data: CourseModel):
     if not any(role in ['******.Admin'] for role in request.user.roles):
         raise HTTPException(
@@ -328,26 +585,8 @@ async def create_manual_course(request: Request, course_data: CourseModel):
     try:
         col = db_collection('course')
 
-        # Create a copy of the model data and update with normalized values
-        course_dict = course_data.model_dump()
-        
         # Normalize fields used for uniqueness (prevents case/whitespace dupes)
-        normalized_data = {
-            "term_code": (course_dict.get("term_code") or "").strip(),
-            "college_code": (course_dict.get("college_code") or "").strip(),
-            "college_name": (course_dict.get("college_name") or "").strip(),
-            "trans_subj": (course_dict.get("trans_subj") or "").strip().upper(),
-            "trans_numb": (course_dict.get("trans_numb") or "").strip(),
-            "inst_subj": (course_dict.get("inst_subj") or "").strip().upper(),
-            "inst_numb": (course_dict.get("inst_numb") or "").strip(),
-            "standard": "Lower" if (course_dict.get("inst_numb") or "").strip() == "1910" else "Higher",
-            "status": "RF", 
-            "source": "manual",
-            "fsid": None,
-            "filename": None,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
+        normalized_data = course.normalize_manual_course(course_data.model_dump())
 
         # Duplicate check using the normalized key
         key = {
@@ -356,16 +595,18 @@ async def create_manual_course(request: Request, course_data: CourseModel):
             "trans_subj": normalized_data["trans_subj"],
             "trans_numb": normalized_data["trans_numb"],
         }
-        if col.find_one(key):
+        if await course.run_blocking(col.find_one, key):
             raise HTTPException(
                 status_code=http_status.HTTP_400_BAD_REQUEST,
                 detail="A manual course with these details already exists"
             )
 
-        result = col.insert_one(normalized_data)
+        normalized_data = course.course_write_fields(normalized_data)
+        result = await course.run_blocking(col.insert_one, normalized_data)
+        await course.run_blocking(course.add_cached_course, {**normalized_data, "_id": result.inserted_id})
 
         # Return the inserted doc (serialize _id)
-        new_course = col.find_one({"_id": result.inserted_id}, {"_id": 0})
+        new_course = await course.run_blocking(col.find_one, {"_id": result.inserted_id}, {"_id": 0})
         return ReturnSetModel(status="success", data=new_course)
 
     except HTTPException:
@@ -377,11 +618,173 @@ async def create_manual_course(request: Request, course_data: CourseModel):
             detail=f"Error creating course: {str(e)}"
         )
 
+MANUAL_IMPORT_JSONL_TYPES = ("application/x-ndjson", "application/jsonl", "application/x-jsonlines")
+
+# Lines of the request body as they arrive
+async def _body_lines(request: Request):
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+# Lines one CSV record may span before its open quote is taken as stray
+CSV_RECORD_MAX_LINES = 50
+
+# CSV records of a body as it streams in, keyed by the header row. csv.reader
+# reads the lines buffered so far; a record cut off at the end of the buffer
+# (a quoted field running over several lines) is parsed again from its first
+# line once more has arrived. A record that doesn't parse, or whose quote is
+# still open CSV_RECORD_MAX_LINES lines on, comes back as (line, None) and
+# parsing resumes on the line after it, so a stray quote costs that row
+# rather than the rest of the file.
+class _CsvRecords:
+    def __init__(self) -> None:
+        self._pending: Deque[str] = deque()
+        self._taken: List[str] = []
+        self._line = 1
+        self._closed = False
+        self._starved = False
+        self._header: Optional[List[str]] = None
+
+    def __iter__(self):
+        return self
+
+    # line source for csv.reader: the buffered lines, recording those taken
+    def __next__(self) -> str:
+        if not self._pending:
+            self._starved = not self._closed
+            raise StopIteration
+        line = self._pending.popleft()
+        self._taken.append(line)
+        return line
+
+    def feed(self, line: str) -> List[Tuple[int, Optional[Dict[str, str]]]]:
+        self._pending.append(line + "\n")
+        return list(self._records())
+
+    def close(self) -> List[Tuple[int, Optional[Dict[str, str]]]]:
+        self._closed = True
+        return list(self._records())
+
+    def _records(self):
+        while self._pending:
+            self._taken, self._starved = [], False
+            try:
+                values, error = next(csv.reader(self, strict=True)), False
+            except csv.Error:
+                values, error = None, True
+            if self._starved:
+                if len(self._taken) < CSV_RECORD_MAX_LINES:
+                    self._pending.extendleft(reversed(self._taken))
+                    return
+                error = True
+            start = self._line
+            if error:
+                self._pending.extendleft(reversed(self._taken[1:]))
+                self._line += 1
+                yield start, None
+                continue
+            self._line += len(self._taken)
+            if not "".join(values).strip():
+                continue
+            if self._header is None:
+                self._header = [h.strip().lower() for h in values]
+                continue
+            yield start, dict(zip(self._header, values))
+
+async def _csv_rows(lines):
+    records = _CsvRecords()
+    async for line in lines:
+        for record in records.feed(line):
+            yield record
+    for record in records.close():
+        yield record
+
+async def _jsonl_rows(lines):
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else None
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+
+# Bulk manual course import. The body is CSV (header row with the CourseModel
+# field names) or JSON lines (?format=jsonl or a JSON-lines Content-Type),
+# parsed as it streams in; rows get the same normalization as /manualcourse.
+# Every input row comes back as inserted, duplicate or invalid.
+@router.post("/manualcourse/import", response_model=ReturnSetModel)
+@course.instrumented_route("import_manual_courses")
+async def import_manual_courses(request: Request, format: Optional[str] = None):
+    if not any(role in ['******.Admin'] for role in request.user.roles):
+        raise HTTPException(
+            status_code=http_status.HTTP_403_FORBIDDEN,
+            detail="Unauthorized: Admin access required"
+        )
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = (format or ("jsonl" if content_type in MANUAL_IMPORT_JSONL_TYPES else "csv")).lower()
+    if fmt not in ("csv", "jsonl"):
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="format must be csv or jsonl")
+
+    try:
+        parsed = _csv_rows(_body_lines(request)) if fmt == "csv" else _jsonl_rows(_body_lines(request))
+        entries: List[Any] = []
+        invalid: List[Dict[str, Any]] = []
+        now = datetime.utcnow()
+        async for line, row in parsed:
+            if len(entries) + len(invalid) >= course.MANUAL_IMPORT_MAX_ROWS:
+                raise HTTPException(
+                    status_code=http_status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"At most {course.MANUAL_IMPORT_MAX_ROWS} courses per import"
+                )
+            if row is None:
+                invalid.append({"line": line, "status": "invalid", "error": f"unreadable {fmt} row"})
+                continue
+            try:
+                course_data = CourseModel(**{k: v for k, v in row.items() if k})
+            except ValidationError as e:
+                invalid.append({"line": line, "status": "invalid", "error": _validation_message(e)})
+                continue
+            normalized_data = course.normalize_manual_course(course_data.model_dump(), now)
+            missing = [k for k in course.UNIQUE_KEYS if not normalized_data[k]]
+            if missing:
+                invalid.append({"line": line, "status": "invalid", "error": f"missing {', '.join(missing)}"})
+                continue
+            entries.append((line, normalized_data))
+
+        report = await course.run_blocking(course.import_manual_courses, entries)
+        report["invalid"] = len(invalid)
+        report["rows"] = sorted(report["rows"] + invalid, key=lambda r: r["line"])
+        return ReturnSetModel(status="success", data=report)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        UvicornLogger().exception(f"Error importing manual courses: {str(e)}")
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error importing courses: {str(e)}"
+        )
+
 class EvaluatorUpdate(BaseModel):
     id: str
     evaluator_id: str
 
 @router.patch("***/update_evaluator", response_model=ReturnSetModel)
+@course.instrumented_route("update_evaluator")
 async def update_evaluator(request: Request, payload: EvaluatorUpdate):
     if not any(role in ['******.Admin'] for role in request.user.roles):
         raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Unauthorized: Admin access required")
@@ -391,18 +794,19 @@ async def update_evaluator(request: Request, payload: EvaluatorUpdate):
         new_evaluator_id = payload.evaluator_id
         
         course_collection = db_collection("course")
-        course = course_collection.find_one({"_id": ObjectId(course_id)})
-        
-        # Get evaluators for the department
-        evaluators = department.dept_for_evaluator(new_evaluator_id)
+        # Course and the evaluator's department are independent lookups
+        course_doc, evaluators = await asyncio.gather(
+            course.run_blocking(course_collection.find_one, {"_id": ObjectId(course_id)}),
+            course.run_blocking(course.evaluator_dept, new_evaluator_id),
+        )
         
         if not evaluators:
-            raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND,detail=f"No evaluators found for department {course.get('dept_code')}")
+            raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND,detail=f"No evaluators found for department {course_doc.get('dept_code')}")
         
         # Update course with new evaluator information
         update_fields = {
             "evaluators": [new_evaluator_id],
-            "evaluators_names": department.get_evaluator_name([new_evaluator_id]),
+            "evaluators_names": await course.run_blocking(course.evaluator_names, [new_evaluator_id]),
             "assigned_evaluator": new_evaluator_id,
             "assigned_coll_code": evaluators[0].get("coll_code"),
             "assigned_coll_desc": evaluators[0].get("coll_desc"),
@@ -410,17 +814,20 @@ async def update_evaluator(request: Request, payload: EvaluatorUpdate):
             "assigned_dept_desc": evaluators[0].get("dept_desc"),
         }
         
-        # Update the course in the database
-        result = course_collection.update_one(
+        # Update the course in the database (stamped now, after the lookups above)
+        update_fields = course.course_write_fields(update_fields)
+        result = await course.run_blocking(
+            course_collection.update_one,
             {"_id": ObjectId(course_id)},
             {"$set": update_fields}
         )
         
         if result.modified_count == 0:
             raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,detail="Failed to update course with new evaluator information")
+        await course.run_blocking(course.update_cached_course, course_doc.get("term_code"), course_id, update_fields)
             
         # Get the updated course
-        updated_course = course_collection.find_one({"_id": ObjectId(course_id)})
+        updated_course = await course.run_blocking(course_collection.find_one, {"_id": ObjectId(course_id)})
         updated_course['_id'] = str(updated_course['_id'])
         
         return ReturnSetModel(status='success', data=updated_course)
@@ -429,4 +836,88 @@ async def update_evaluator(request: Request, payload: EvaluatorUpdate):
         raise
     except Exception as e:
         uvicornLogger.exception(f"Error updating evaluator: {str(e)}")
-        raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,detail=f"Error updating evaluator: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,detail=f"Error updating evaluator: {str(e)}")
+
+
+# Prometheus scrape endpoint for the course subsystem. Each scrape answers
+# for the worker it lands on (series are labelled worker=<pid>); the scraper
+# authenticates like any admin client.
+@router.get("/metrics", response_class=PlainTextResponse)
+def course_metrics(request: Request):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    return PlainTextResponse(course.render_metrics(), media_type="text/plain; version=0.0.4")
+
+# Switch metrics recording on or off for every worker (each picks the shared
+# setting up within METRICS_SETTING_CHECK_SECONDS)
+@router.patch("/metrics", response_model=ReturnSetModel)
+def toggle_course_metrics(request: Request, enabled: bool):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    try:
+        course.set_metrics_enabled(enabled)
+        return ReturnSetModel(status="success", data={"enabled": enabled})
+    except Exception as e:
+        uvicornLogger.exception(e)
+        raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+# Ensure the declared course indexes and report the plan of each canonical
+# query (collscan=true means a query path is missing its index)
+@router.get("/course/indexes", response_model=ReturnSetModel)
+def check_course_indexes(request: Request):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    try:
+        ensured = course.ensure_course_indexes()
+        plans = course.check_course_query_plans(raise_on_collscan=False)
+        return ReturnSetModel(status="success", data={"ensured": ensured, "plans": plans})
+    except Exception as e:
+        uvicornLogger.exception(e)
+        raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+# Department config changed (admin screen save, script or manual edit): every
+# worker reloads its departmentconfig index within a few seconds
+@router.post("/course/departmentconfig/reload", response_model=ReturnSetModel)
+def reload_department_configs(request: Request):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    try:
+        course.department_configs_changed()
+        return ReturnSetModel(status="success", data={"reloaded": True})
+    except Exception as e:
+        uvicornLogger.exception(e)
+        raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+class RefreshTermsPayload(BaseModel):
+    term_codes: List[str] = Field(..., min_length=1, max_length=10)
+
+# Refresh the given terms in the background (bounded parallelism); poll
+# GET /course/refresh/{job_id} for per-term totals as they finish
+@router.post("/course/refresh", response_model=ReturnSetModel)
+@course.instrumented_route("refresh_terms")
+def refresh_course_terms(request: Request, body: RefreshTermsPayload):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    try:
+        job = course.start_refresh_job([t.strip() for t in body.term_codes])
+        return ReturnSetModel(status="success", data=job)
+    except course.RefreshJobsBusy as e:
+        raise HTTPException(status_code=http_status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    except Exception as e:
+        uvicornLogger.exception(e)
+        raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.get("/course/refresh/{job_id}", response_model=ReturnSetModel)
+def refresh_course_terms_status(request: Request, job_id: str):
+    if not any(role in ["******.Admin"] for role in request.user.roles):
+        raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Error: Unauthorized Access")
+
+    job = course.get_refresh_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return ReturnSetModel(status="success", data=job)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+# Offline microbenchmarks for the course refresh pipeline and routes.
+#
+#   python coursebench.py --sizes 1000 10000 100000 --output bench_course.json
+#
+# Everything runs against the stand-ins in coursefakes (in-memory Mongo, fake
+# Oracle driver, fake department helpers), so no database or network is
+# needed. Results are written as JSON; pass --compare with an earlier file to
+# print the change per stage.
+
+import argparse
+import asyncio
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import coursefakes
+from data import course as coursedata
+
+BENCH_TERM = "209910"
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+# Run fn once, recording wall time and (optionally) peak traced allocation
+def _stage(results: Dict[str, Any], name: str, fn: Callable[[], Any], trace_alloc: bool) -> Any:
+    if trace_alloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - started
+    stage: Dict[str, Any] = {"seconds": round(elapsed, 6)}
+    if trace_alloc:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stage["alloc_peak_bytes"] = peak
+        stage["alloc_retained_bytes"] = current
+    results[name] = stage
+    return value
+
+# Call fn `iterations` times and summarise per-call latency in milliseconds
+def _latency(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(coursefakes.percentile(samples, 50), 4),
+        "p95_ms": round(coursefakes.percentile(samples, 95), 4),
+        "p99_ms": round(coursefakes.percentile(samples, 99), 4),
+    }
+
+
+def bench_size(size: int, routes: Any, iterations: int, trace_alloc: bool) -> Dict[str, Any]:
+    rows = coursefakes.synthetic_term_rows(BENCH_TERM, size)
+    fakes = coursefakes.install(
+        coursedata, routes,
+        driver=coursefakes.FakeOracleDriver(terms={BENCH_TERM: rows}),
+    )
+    coursefakes.seed_department_configs(fakes.db)
+
+    pipeline: Dict[str, Any] = {}
+    _stage(pipeline, "normalize_oracle_rows", lambda: [coursedata._normalize_oracle_row(r) for r in rows], trace_alloc)
+    _stage(pipeline, "ensure_indexes", coursedata.ensure_course_indexes, trace_alloc)
+    full_sync = _stage(pipeline, "oracle_sync_full", lambda: coursedata._insert_new_courses_from_oracle(BENCH_TERM, force_full=True), trace_alloc)
+    delta_sync = _stage(pipeline, "oracle_sync_delta", lambda: coursedata._insert_new_courses_from_oracle(BENCH_TERM), trace_alloc)
+    docs = _stage(pipeline, "load_term_from_mongo", lambda: coursedata._load_term_from_mongo(BENCH_TERM), trace_alloc)
+    _stage(pipeline, "cache_snapshot_build", lambda: coursedata.CourseCacheEntry().set_data(docs), trace_alloc)
+    _stage(pipeline, "refresh_and_cache_term", lambda: coursedata._refresh_and_cache_term(BENCH_TERM), trace_alloc)
+
+    endpoints: Dict[str, Any] = {}
+    if routes is not None:
+        request = coursefakes.fake_request()
+        no_filter = routes.RequestsSearchFilter(search="")
+        prefix_filter = routes.RequestsSearchFilter(search="0001")
+        endpoints["display_course"] = _latency(lambda: routes.display_course(request, BENCH_TERM, no_filter), iterations)
+        endpoints["display_course_prefix"] = _latency(lambda: routes.display_course(request, BENCH_TERM, prefix_filter), iterations)
+
+        sample = [d for d in docs[:: max(1, len(docs) // 200)]][:200]
+        payloads = [routes.CourseDetailsPayload(id=str(d["_id"]), trans_subj=d["trans_subj"]) for d in sample]
+
+        async def details_loop() -> List[float]:
+            samples = []
+            for i in range(iterations):
+                payload = payloads[i % len(payloads)]
+                started = time.perf_counter()
+                await routes.get_course_details(request, BENCH_TERM, payload)
+                samples.append((time.perf_counter() - started) * 1000.0)
+            return samples
+
+        samples = asyncio.run(details_loop())
+        endpoints["get_course_details"] = {
+            "iterations": iterations,
+            "mean_ms": round(statistics.fmean(samples), 4),
+            "p50_ms": round(coursefakes.percentile(samples, 50), 4),
+            "p95_ms": round(coursefakes.percentile(samples, 95), 4),
+            "p99_ms": round(coursefakes.percentile(samples, 99), 4),
+        }
+
+    return {
+        "rows": size,
+        "pipeline": pipeline,
+        "endpoints": endpoints,
+        "cache_memory": coursedata.course_cache_memory().get(BENCH_TERM),
+        "sync": {"full": full_sync, "delta": delta_sync},
+        "mongo_calls": fakes.db.call_counts(),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def _print_summary(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    base_sizes = {str(r["rows"]): r for r in (baseline or {}).get("results", [])}
+    for result in report["results"]:
+        print(f"== {result['rows']} rows")
+        base = base_sizes.get(str(result["rows"]))
+        for name, stage in result["pipeline"].items():
+            line = f"  {name:<26} {stage['seconds'] * 1000:10.2f} ms"
+            if "alloc_peak_bytes" in stage:
+                line += f"  peak {stage['alloc_peak_bytes'] / 1024 / 1024:8.2f} MiB"
+            if base and name in base["pipeline"] and base["pipeline"][name]["seconds"]:
+                change = stage["seconds"] / base["pipeline"][name]["seconds"] - 1
+                line += f"  ({change:+.1%} vs baseline)"
+            print(line)
+        for name, lat in result["endpoints"].items():
+            line = f"  {name:<26} p50 {lat['p50_ms']:8.3f} ms  p95 {lat['p95_ms']:8.3f} ms  p99 {lat['p99_ms']:8.3f} ms"
+            if base and name in base["endpoints"] and base["endpoints"][name]["p50_ms"]:
+                change = lat["p50_ms"] / base["endpoints"][name]["p50_ms"] - 1
+                line += f"  ({change:+.1%} p50 vs baseline)"
+            print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Offline course pipeline/route benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--iterations", type=int, default=50, help="calls per endpoint latency measurement")
+    parser.add_argument("--no-alloc", action="store_true", help="skip tracemalloc (faster, timings unskewed)")
+    parser.add_argument("--router-module", default="course", help="module that defines the course APIRouter")
+    parser.add_argument("--no-routes", action="store_true", help="benchmark the data pipeline only")
+    parser.add_argument("--output", default="bench_course.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    routes = None if args.no_routes else importlib.import_module(args.router_module)
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "tracemalloc": not args.no_alloc,
+        "results": [bench_size(size, routes, args.iterations, not args.no_alloc) for size in args.sizes],
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    _print_summary(report, baseline)
+    print(f"results written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
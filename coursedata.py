@@ -6,26 +6,786 @@ from core.oradata import oradata_anon_block
 from pydantic import BaseModel
 
 
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from array import array
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import asyncio
+import bisect
+import contextvars
+import fcntl
+import functools
+import heapq
+import json
+import operator
+import os
+import queue
+import random
+import re
+import stat
+import sys
+import tempfile
+import threading
+import time
+import uuid
 
-from pymongo import ASCENDING, UpdateOne
+import oracledb
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+from core.oradata import oradata_connection_parameters
+from data import department
+
+import bson
+from bson import ObjectId
+from pymongo import ASCENDING, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 
 from config.app import uvicornLogger
 from core.dbdata import db_collection
 
+# Marks a field a cached row doesn't have (distinct from a stored None)
+_MISSING = object()
+
+# Short strings (statuses, college names, "Lower"/"Higher", ...) repeat on
+# almost every row, so cached rows share one interned copy of each
+INTERN_MAX_LEN = 64
+
+def _compact_value(value: Any) -> Any:
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LEN:
+        return sys.intern(value)
+    return value
+
+# JSON encoding for course payloads: orjson when installed (datetimes handled
+# natively), otherwise the stdlib encoder. ObjectIds become strings.
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_encode_default)
+    return json.dumps(value, default=_encode_default, separators=(",", ":")).encode()
+
+# Encoded row lists kept per cached term, for the most requested filters
+ENCODED_VIEWS_PER_TERM = 16
+
+# Search over a cached term. Each searchable field group has a sorted token
+# list and, per token, the row positions holding it (an inverted index);
+# query words match tokens by prefix, so "comm 101" finds "Community ...
+# College" rows with a 101 course. Scores add up per query word, using the
+# best field it matched: the field weight, doubled for a whole-token match.
+SEARCH_FIELD_WEIGHTS = {"college_code": 4, "trans": 3, "trans_code": 3, "inst": 2, "inst_code": 2, "college_name": 1}
+# subject+number joined ("math101"); only searched for words mixing letters and digits
+SEARCH_JOINED_FIELDS = {"trans_code", "inst_code"}
+SEARCH_MAX_TERMS = 8
+
+def _search_words(value: Any) -> List[str]:
+    if value is None or value is _MISSING:
+        return []
+    return re.findall(r"[a-z0-9]+", str(value).lower())
+
+# Course fields the search tokens are made from
+SEARCH_SOURCE_FIELDS = ("college_code", "college_name", "trans_subj", "trans_numb", "inst_subj", "inst_numb")
+
+# tokens per field group for one course; subject+number is also indexed
+# joined ("math101") so either spelling matches
+def _course_search_tokens(get) -> Dict[str, Set[str]]:
+    tokens = {
+        "college_code": set(_search_words(get("college_code"))),
+        "college_name": set(_search_words(get("college_name"))),
+    }
+    for group, subj, numb in (("trans", "trans_subj", "trans_numb"), ("inst", "inst_subj", "inst_numb")):
+        words = _search_words(get(subj)) + _search_words(get(numb))
+        tokens[group] = set(words)
+        tokens[f"{group}_code"] = {"".join(words)} if len(words) > 1 else set()
+    return tokens
+
+# Tokens on at least this many rows also get a bitmap (built on first use),
+# so later query words can test a few candidate rows instead of scanning them
+SEARCH_BITMAP_MIN_ROWS = 1024
+
+class CourseSearchIndex:
+    def __init__(self) -> None:
+        self.tokens: Dict[str, List[str]] = {f: [] for f in SEARCH_FIELD_WEIGHTS}
+        self.postings: Dict[str, Dict[str, Any]] = {f: {} for f in SEARCH_FIELD_WEIGHTS}
+        self.bitmaps: Dict[Tuple[str, str], bytearray] = {}
+
+    def add(self, i: int, tokens: Dict[str, Set[str]]) -> None:
+        for field, field_tokens in tokens.items():
+            postings = self.postings[field]
+            for token in field_tokens:
+                rows = postings.get(token)
+                if rows is None:
+                    rows = postings[token] = array("I")
+                    bisect.insort(self.tokens[field], token)
+                rows.append(i)
+                self.bitmaps.pop((field, token), None)
+
+    def remove(self, i: int, tokens: Dict[str, Set[str]]) -> None:
+        for field, field_tokens in tokens.items():
+            postings = self.postings[field]
+            for token in field_tokens:
+                rows = postings.get(token)
+                if rows is None:
+                    continue
+                try:
+                    rows.remove(i)
+                except ValueError:
+                    continue
+                self.bitmaps.pop((field, token), None)
+                if not rows:
+                    del postings[token]
+                    sorted_tokens = self.tokens[field]
+                    del sorted_tokens[bisect.bisect_left(sorted_tokens, token)]
+
+    # (weight, field, token, row positions) for each token the word prefixes
+    def _matches(self, word: str) -> List[Tuple[int, str, str, Any]]:
+        matches = []
+        mixed = not (word.isdigit() or word.isalpha())
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            if field in SEARCH_JOINED_FIELDS and not mixed:
+                continue
+            sorted_tokens = self.tokens[field]
+            postings = self.postings[field]
+            lo = bisect.bisect_left(sorted_tokens, word)
+            hi = bisect.bisect_left(sorted_tokens, word + "\uffff", lo)
+            for token in sorted_tokens[lo:hi]:
+                matches.append((weight * 2 if token == word else weight, field, token, postings[token]))
+        matches.sort(key=lambda m: -m[0])
+        return matches
+
+    def _bitmap(self, field: str, token: str, rows: Any) -> bytearray:
+        bitmap = self.bitmaps.get((field, token))
+        if bitmap is None:
+            bitmap = bytearray((max(rows) >> 3) + 1)
+            for i in rows:
+                bitmap[i >> 3] |= 1 << (i & 7)
+            self.bitmaps[(field, token)] = bitmap
+        return bitmap
+
+    # row position -> score for rows matching every query word. The most
+    # selective word goes first; later words only score rows still in the running.
+    def search(self, words: List[str]) -> Dict[int, int]:
+        per_word = sorted((self._matches(word) for word in words), key=lambda matches: sum(len(m[3]) for m in matches))
+        scores: Optional[Dict[int, int]] = None
+        for matches in per_word:
+            best: Dict[int, int] = {}
+            # lowest weight first, so a row's best match is written last
+            for w, field, token, rows in reversed(matches):
+                if scores is None:
+                    hits = rows
+                elif len(rows) >= SEARCH_BITMAP_MIN_ROWS and len(rows) > 4 * len(scores):
+                    bitmap = self._bitmap(field, token, rows)
+                    size = len(bitmap)
+                    hits = [i for i in scores if (i >> 3) < size and bitmap[i >> 3] & (1 << (i & 7))]
+                else:
+                    hits = scores.keys() & set(rows)
+                best.update(dict.fromkeys(hits, w))
+            scores = best if scores is None else {i: scores[i] + w for i, w in best.items()}
+            if not scores:
+                return {}
+        return scores or {}
+
+    # Index of a new snapshot from this one (which is no longer changed):
+    # moved[old position] is a row's new position, or -1 for rows that are
+    # gone or need new tokens; the caller adds those.
+    def carried(self, moved: List[int]) -> "CourseSearchIndex":
+        index = CourseSearchIndex()
+        for field in SEARCH_FIELD_WEIGHTS:
+            postings = index.postings[field]
+            for token in self.tokens[field]:
+                rows = array("I", [i for i in map(moved.__getitem__, self.postings[field][token]) if i >= 0])
+                if rows:
+                    postings[token] = rows
+            index.tokens[field] = [token for token in self.tokens[field] if token in postings]
+        return index
+
+    def measure(self) -> int:
+        total = 0
+        for field in SEARCH_FIELD_WEIGHTS:
+            total += sys.getsizeof(self.tokens[field]) + sys.getsizeof(self.postings[field])
+            total += sum(rows.buffer_info()[1] * rows.itemsize for rows in self.postings[field].values())
+        return total + sum(len(bitmap) for bitmap in self.bitmaps.values())
+
+# A search index with the rows and field positions it was kept in step with,
+# once its entry has moved on to a new snapshot (nothing changes it after that)
+class SearchIndexBase(NamedTuple):
+    index: CourseSearchIndex
+    rows: List[Tuple[Any, ...]]
+    field_pos: Dict[str, int]
+
+# One cached term. Rows are stored as tuples against a shared field list
+# rather than one dict per course; dicts are only built for the rows a caller
+# asks for. Rows are never mutated in place (updates swap in a new tuple), so
+# a list of rows taken under _cache_lock can be read after releasing it.
 class CourseCacheEntry:
     def __init__(self) -> None:
-        self.data: List[Dict[str, Any]] = []
+        self.fields: List[str] = []
+        self.field_pos: Dict[str, int] = {}
+        self.rows: List[Tuple[Any, ...]] = []
         self.cache_timestamp: float = 0.0 
+        self.last_access: float = 0.0
+        self.size_bytes: int = 0
+        # highest write sequence (`seq`) among the rows
+        self.max_seq: int = 0
+        # bumped on every change; encoded views are only valid for one revision
+        self.revision: int = 0
+        # built on the first search, then kept in step with row changes
+        self.search_index: Optional[CourseSearchIndex] = None
+        # (statuses, prefix) -> (revision, JSON bytes of the rows), LRU order
+        self.encoded_views: "OrderedDict[Tuple[Any, ...], Tuple[int, bytes]]" = OrderedDict()
+        # version of the shared snapshot this entry was loaded from/published as
+        self.shared_version: Optional[int] = None
+        self.shared_checked_at: float = 0.0
+        # term write counter the rows are current with: every write sequenced
+        # at or below it is in the rows. This is the snapshot version served
+        # to clients (ETag, ?since=). See _catch_up_writes.
+        self.write_version: int = 0
+        self.write_checked_at: float = 0.0
+        # bumped each time the rows are replaced by a reload
+        self.generation: int = 0
+        self.catchup_lock = threading.Lock()
+        # refresh coordination (guarded by _cache_lock)
+        self.refreshing: bool = False
+        self.refresh_done = threading.Event()
+        self.refresh_done.set()
+        self.failures: int = 0
+        self.retry_at: float = 0.0
+        self.last_error: Optional[Exception] = None
+        # secondary indexes over `rows`, holding row positions (guarded by _cache_lock)
+        self.by_id: Dict[str, int] = {}
+        self.by_status: Dict[Any, List[int]] = {}
+        self.status_college_codes: Dict[Any, List[str]] = {}
+
+    def has_data(self) -> bool:
+        return self.cache_timestamp > 0
+
+    def _pack(self, doc: Dict[str, Any]) -> Tuple[Any, ...]:
+        for k in doc:
+            if k not in self.field_pos:
+                self.field_pos[sys.intern(k)] = len(self.fields)
+                self.fields.append(sys.intern(k))
+        values = [_MISSING] * len(self.fields)
+        for k, v in doc.items():
+            values[self.field_pos[k]] = _compact_value(v)
+        return tuple(values)
+
+    # Rows packed before a field was added are shorter; zip stops at their end
+    @staticmethod
+    def unpack(fields: Tuple[str, ...], row: Tuple[Any, ...]) -> Dict[str, Any]:
+        return {f: v for f, v in zip(fields, row) if v is not _MISSING}
+
+    def _value(self, row: Tuple[Any, ...], field: str) -> Any:
+        pos = self.field_pos.get(field)
+        if pos is None or pos >= len(row) or row[pos] is _MISSING:
+            return None
+        return row[pos]
+
+    def _college_code(self, i: int) -> str:
+        return self._value(self.rows[i], "college_code") or ""
+
+    def _changed(self) -> None:
+        self.revision += 1
+        self.size_bytes -= sum(len(body) for _, body in self.encoded_views.values())
+        self.encoded_views.clear()
+
+    def _search_tokens(self, row: Tuple[Any, ...]) -> Dict[str, Set[str]]:
+        return _course_search_tokens(lambda field: self._value(row, field))
+
+    def set_data(self, docs: List[Dict[str, Any]]) -> None:
+        self._changed()
+        self.search_index = None
+        self.fields = []
+        self.field_pos = {}
+        self.rows = [self._pack(d) for d in docs]
+        self.by_id = {}
+        self.by_status = {}
+        self.max_seq = 0
+        for i, row in enumerate(self.rows):
+            _id = self._value(row, "_id")
+            if _id is not None:
+                self.by_id[_id] = i
+            self.max_seq = max(self.max_seq, self._seq(row))
+            self.by_status.setdefault(self._value(row, "status"), []).append(i)
+        self.status_college_codes = {}
+        for status, positions in self.by_status.items():
+            positions.sort(key=self._college_code)
+            self.status_college_codes[status] = [self._college_code(i) for i in positions]
+        self.size_bytes = self.measure()
+
+    # Swap in the rows and indexes of an entry built with set_data, keeping
+    # this entry's identity and refresh/sync state (caller holds _cache_lock).
+    # Returns the replaced search index with the rows it indexes, if there
+    # was one, for _ensure_search_index to carry over.
+    def take_data(self, built: "CourseCacheEntry") -> Optional["SearchIndexBase"]:
+        self._changed()
+        base = None
+        if self.search_index is not None:
+            base = SearchIndexBase(self.search_index, self.rows, self.field_pos)
+        self.search_index = None
+        self.fields, self.field_pos, self.rows = built.fields, built.field_pos, built.rows
+        self.by_id, self.by_status = built.by_id, built.by_status
+        self.status_college_codes = built.status_college_codes
+        self.max_seq, self.size_bytes = built.max_seq, built.size_bytes
+        return base
+
+    def _index_row(self, i: int) -> None:
+        status = self._value(self.rows[i], "status")
+        code = self._college_code(i)
+        codes = self.status_college_codes.setdefault(status, [])
+        pos = bisect.bisect_right(codes, code)
+        codes.insert(pos, code)
+        self.by_status.setdefault(status, []).insert(pos, i)
+
+    def _unindex_row(self, i: int) -> None:
+        status = self._value(self.rows[i], "status")
+        positions = self.by_status.get(status) or []
+        codes = self.status_college_codes.get(status) or []
+        code = self._college_code(i)
+        lo = bisect.bisect_left(codes, code)
+        hi = bisect.bisect_right(codes, code, lo)
+        for k in range(lo, hi):
+            if positions[k] == i:
+                del positions[k]
+                del codes[k]
+                break
+
+    def _seq(self, row: Tuple[Any, ...]) -> int:
+        return self._value(row, "seq") or 0
+
+    # Writes that don't stamp updated_at still get the time of the write
+    def _touch(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        if doc.get("updated_at") is None:
+            doc = {**doc, "updated_at": datetime.utcnow()}
+        self.max_seq = max(self.max_seq, doc.get("seq") or 0)
+        return doc
+
+    def add_doc(self, doc: Dict[str, Any]) -> None:
+        if doc["_id"] in self.by_id:
+            self.update_doc(doc["_id"], doc)
+            return
+        self._changed()
+        doc = self._touch(doc)
+        self.rows.append(self._pack(doc))
+        i = len(self.rows) - 1
+        self.by_id[doc["_id"]] = i
+        self._index_row(i)
+        if self.search_index is not None:
+            self.search_index.add(i, self._search_tokens(self.rows[i]))
+        self.size_bytes += sys.getsizeof(self.rows[i])
+
+    def update_doc(self, course_id: str, fields: Dict[str, Any]) -> bool:
+        i = self.by_id.get(course_id)
+        if i is None:
+            return False
+        self._changed()
+        self._unindex_row(i)
+        doc = self.unpack(tuple(self.fields), self.rows[i])
+        doc.update({k: v for k, v in fields.items() if k not in ("_id", "updated_at")})
+        doc["updated_at"] = fields.get("updated_at")
+        old_row = self.rows[i]
+        self.rows[i] = self._pack(self._touch(doc))
+        self._index_row(i)
+        if self.search_index is not None:
+            old_tokens, new_tokens = self._search_tokens(old_row), self._search_tokens(self.rows[i])
+            if old_tokens != new_tokens:
+                self.search_index.remove(i, old_tokens)
+                self.search_index.add(i, new_tokens)
+        return True
+
+    # True if the cached course has the `expected` field values (see
+    # _expected_filter; None stands for unset)
+    def matches(self, course_id: str, expected: Dict[str, Any]) -> bool:
+        i = self.by_id.get(course_id)
+        if i is None:
+            return False
+        for field, value in expected.items():
+            current = self._value(self.rows[i], field)
+            if current != value and not (value is None and current == ""):
+                return False
+        return True
+
+    # Apply a course as currently stored in Mongo; no-op if the cached row
+    # already matches it
+    def merge_doc(self, doc: Dict[str, Any]) -> bool:
+        i = self.by_id.get(doc["_id"])
+        if i is not None and self.unpack(tuple(self.fields), self.rows[i]) == doc:
+            return False
+        self.add_doc(doc)
+        return True
+
+    # Rows with one of `statuses` whose college_code starts with `prefix`,
+    # ordered by college_code. Returns the field list to unpack them with.
+    def query_rows(self, statuses: List[str], prefix: str = "") -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+        positions: List[int] = []
+        for status in statuses:
+            status_positions = self.by_status.get(status) or []
+            if not prefix:
+                positions.extend(status_positions)
+                continue
+            codes = self.status_college_codes.get(status) or []
+            lo = bisect.bisect_left(codes, prefix)
+            hi = bisect.bisect_left(codes, prefix + "\uffff", lo)
+            positions.extend(status_positions[lo:hi])
+        if len(statuses) > 1:
+            positions.sort(key=self._college_code)
+        return tuple(self.fields), [self.rows[i] for i in positions]
+
+    # Rows added or changed after write sequence `since`
+    def changed_rows(self, since: int) -> List[Tuple[Any, ...]]:
+        if since >= self.max_seq:
+            return []
+        return [row for row in self.rows if self._seq(row) > since]
+
+    def encoded_view(self, key: Tuple[Any, ...]) -> Optional[bytes]:
+        cached = self.encoded_views.get(key)
+        if cached is None or cached[0] != self.revision:
+            return None
+        self.encoded_views.move_to_end(key)
+        return cached[1]
+
+    def store_encoded_view(self, key: Tuple[Any, ...], revision: int, body: bytes) -> None:
+        if revision != self.revision:
+            return
+        previous = self.encoded_views.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous[1])
+        self.encoded_views[key] = (revision, body)
+        self.size_bytes += len(body)
+        while len(self.encoded_views) > ENCODED_VIEWS_PER_TERM:
+            _, (_, dropped) = self.encoded_views.popitem(last=False)
+            self.size_bytes -= len(dropped)
+
+    def all_rows(self) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+        return tuple(self.fields), list(self.rows)
+
+    # Approximate resident size of the snapshot and its indexes; shared
+    # (interned) values are counted once
+    def measure(self) -> int:
+        seen = set()
+        total = sys.getsizeof(self.rows) + sys.getsizeof(self.by_id)
+        for row in self.rows:
+            total += sys.getsizeof(row)
+            for v in row:
+                if id(v) not in seen:
+                    seen.add(id(v))
+                    total += sys.getsizeof(v)
+        for status, positions in self.by_status.items():
+            total += sys.getsizeof(positions) + sys.getsizeof(self.status_college_codes.get(status, []))
+        return total
 
     def is_expired(self, hours: int = 2) -> bool:
         #Return True if the cache is older than `hours` hours.
         return (datetime.now() - timedelta(hours=hours)).timestamp() > self.cache_timestamp
 
 
-# In-memory cache keyed by term_code(follows sec auth tool pattern for cache)
-_course_cache: Dict[str, CourseCacheEntry] = {}
+def _unpack_rows(fields: Tuple[str, ...], rows: List[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+    return [CourseCacheEntry.unpack(fields, row) for row in rows]
+
+
+# In-memory cache keyed by term_code(follows sec auth tool pattern for cache),
+# kept in least-recently-used order
+_course_cache: "OrderedDict[str, CourseCacheEntry]" = OrderedDict()
+
+# Cache budget; least recently used terms are evicted past either limit
+# (None disables that limit)
+COURSE_CACHE_MAX_TERMS: Optional[int] = 8
+COURSE_CACHE_MAX_BYTES: Optional[int] = 512 * 1024 * 1024
+
+# Guards _course_cache membership, entry refresh flags and _cache_stats
+_cache_lock = threading.Lock()
+
+# Backoff (seconds) after a failed refresh: base * 2^(failures-1), capped
+REFRESH_BACKOFF_BASE = 30
+REFRESH_BACKOFF_MAX = 15 * 60
+
+_cache_stats: Dict[str, int] = {
+    "hits": 0,
+    "stale_serves": 0,
+    "refreshes_in_flight": 0,
+    "refresh_failures": 0,
+    "evictions": 0,
+    "encoded_hits": 0,
+}
+
+# Bounded executor for the async routes: pymongo and the department helpers
+# are blocking, so they run here instead of on the event loop thread
+DB_EXECUTOR_WORKERS = 16
+_db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="course-db")
+
+async def run_blocking(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # carry contextvars (route label for metrics) into the worker thread
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(_db_executor, functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+# Course subsystem metrics, rendered in Prometheus text format by
+# render_metrics(), one set per worker process (labelled worker=<pid>).
+# Recording is a dict update under a lock and can be switched off at runtime
+# with set_metrics_enabled(False).
+METRICS_ENABLED = os.environ.get("COURSE_METRICS", "1") != "0"
+METRIC_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_METRIC_HELP: Dict[str, Tuple[str, str]] = {
+    "course_refresh_stage_seconds": ("histogram", "Duration of each term refresh stage"),
+    "course_route_seconds": ("histogram", "Course route latency"),
+    "course_mongo_seconds": ("histogram", "Mongo call latency by route, collection and operation"),
+    "course_oracle_seconds": ("histogram", "Oracle query latency including row fetches"),
+    "course_sync_rows_total": ("counter", "Oracle rows seen by the Mongo sync"),
+    "course_sync_writes_total": ("counter", "Mongo insert results from the Oracle sync"),
+    "course_encode_seconds": ("histogram", "JSON encoding time of course payloads"),
+    "course_search_seconds": ("histogram", "Course search index query time"),
+}
+
+_metrics_lock = threading.Lock()
+# (name, labels) -> [bucket counts..., sum, count]
+_histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]] = {}
+_counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+# Route currently being served, used to label Mongo timings
+_current_route: contextvars.ContextVar[str] = contextvars.ContextVar("course_route", default="")
+
+# The on/off switch is shared by all workers: set_metrics_enabled stores it
+# in CACHE_VERSION_COLLECTION and every worker re-reads it each
+# METRICS_SETTING_CHECK_SECONDS. COURSE_METRICS applies until it is first set.
+METRICS_SETTING_KEY = "metrics"
+METRICS_SETTING_CHECK_SECONDS = 10
+
+def set_metrics_enabled(enabled: bool) -> None:
+    global METRICS_ENABLED
+    db_collection(CACHE_VERSION_COLLECTION).update_one(
+        {"_id": METRICS_SETTING_KEY}, {"$set": {"enabled": enabled, "updated_at": datetime.utcnow()}}, upsert=True,
+    )
+    METRICS_ENABLED = enabled
+
+def _load_metrics_setting() -> None:
+    global METRICS_ENABLED
+    doc = db_collection(CACHE_VERSION_COLLECTION).find_one({"_id": METRICS_SETTING_KEY}, {"enabled": 1})
+    if doc is not None and "enabled" in doc:
+        METRICS_ENABLED = bool(doc["enabled"])
+
+class MetricsSettingWatcher:
+    def __init__(self, interval_seconds: float = METRICS_SETTING_CHECK_SECONDS) -> None:
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="course-metrics-setting", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        delay = 0.0
+        while not self._stop.wait(delay):
+            try:
+                _load_metrics_setting()
+            except Exception as e:
+                uvicornLogger.warning(f"course metrics setting: {e}")
+            delay = self.interval_seconds
+
+_metrics_setting_watcher = MetricsSettingWatcher()
+
+def start_metrics_setting_watcher() -> None:
+    _metrics_setting_watcher.start()
+
+def stop_metrics_setting_watcher() -> None:
+    _metrics_setting_watcher.stop(timeout=5)
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    if not METRICS_ENABLED:
+        return
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _metrics_lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0.0] * (len(METRIC_BUCKETS) + 2)
+        hist[bisect.bisect_left(METRIC_BUCKETS, seconds)] += 1
+        hist[-2] += seconds
+        hist[-1] += 1
+
+def inc(name: str, amount: float = 1, **labels: Any) -> None:
+    if not METRICS_ENABLED or not amount:
+        return
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _metrics_lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+@contextmanager
+def timed(name: str, **labels: Any):
+    if not METRICS_ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+# Decorator for course routes (sync or async): records the route latency and
+# labels Mongo timings made while serving it
+def instrumented_route(route: str):
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                token = _current_route.set(route)
+                try:
+                    with timed("course_route_seconds", route=route):
+                        return await fn(*args, **kwargs)
+                finally:
+                    _current_route.reset(token)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            token = _current_route.set(route)
+            try:
+                with timed("course_route_seconds", route=route):
+                    return fn(*args, **kwargs)
+            finally:
+                _current_route.reset(token)
+        return wrapper
+    return decorate
+
+# Collection wrapper that times round trips. find() is timed until the cursor
+# is exhausted, since that's when pymongo actually talks to the server.
+_METERED_METHODS = {"find_one", "update_one", "insert_one", "insert_many", "bulk_write",
+                    "count_documents", "delete_one", "delete_many"}
+
+class _MeteredCursor:
+    def __init__(self, cursor: Any, labels: Dict[str, Any]) -> None:
+        self._cursor = cursor
+        self._labels = labels
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._cursor, attr)
+        if attr in ("sort", "limit", "batch_size", "skip", "hint"):
+            def chain(*args, **kwargs):
+                self._cursor = value(*args, **kwargs)
+                return self
+            return chain
+        return value
+
+    def __iter__(self):
+        started = time.perf_counter()
+        try:
+            yield from self._cursor
+        finally:
+            observe("course_mongo_seconds", time.perf_counter() - started, **self._labels)
+
+class _MeteredCollection:
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._col = db_collection(name)
+
+    def __getattr__(self, attr: str) -> Any:
+        target = getattr(self._col, attr)
+        if not METRICS_ENABLED or (attr not in _METERED_METHODS and attr != "find"):
+            return target
+        labels = {"route": _current_route.get(), "collection": self._name, "op": attr}
+        if attr == "find":
+            return lambda *args, **kwargs: _MeteredCursor(target(*args, **kwargs), labels)
+
+        def call(*args, **kwargs):
+            with timed("course_mongo_seconds", **labels):
+                return target(*args, **kwargs)
+        return call
+
+def metered_collection(name: str) -> Any:
+    return _MeteredCollection(name)
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+# Prometheus text exposition of this worker's course metrics plus cache/pool
+# gauges; every series carries worker=<pid>, so scrapes landing on different
+# workers stay apart and can be summed by the collector
+def render_metrics() -> str:
+    lines: List[str] = []
+    worker = (("worker", str(os.getpid())),)
+    with _metrics_lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters = dict(_counters)
+
+    def header(name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for name, (kind, help_text) in _METRIC_HELP.items():
+        series = histograms if kind == "histogram" else counters
+        keys = sorted(k for k in series if k[0] == name)
+        if not keys:
+            continue
+        header(name, kind, help_text)
+        for key in keys:
+            labels = key[1]
+            if kind == "counter":
+                lines.append(f"{name}{_format_labels(worker + labels)} {series[key]:g}")
+                continue
+            hist = series[key]
+            cumulative = 0.0
+            for bound, count in zip(METRIC_BUCKETS, hist):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(worker + labels, ('le', f'{bound:g}'))} {cumulative:g}")
+            lines.append(f"{name}_bucket{_format_labels(worker + labels, ('le', '+Inf'))} {hist[-1]:g}")
+            lines.append(f"{name}_sum{_format_labels(worker + labels)} {hist[-2]:.6f}")
+            lines.append(f"{name}_count{_format_labels(worker + labels)} {hist[-1]:g}")
+
+    cache_stats = course_cache_stats()
+    for name in ("hits", "stale_serves", "refresh_failures", "evictions", "encoded_hits"):
+        header(f"course_cache_{name}_total", "counter", f"Course cache {name.replace('_', ' ')}")
+        lines.append(f"course_cache_{name}_total{_format_labels(worker)} {cache_stats.get(name, 0)}")
+    header("course_cache_refreshes_in_flight", "gauge", "Term refreshes currently running")
+    lines.append(f"course_cache_refreshes_in_flight{_format_labels(worker)} {cache_stats.get('refreshes_in_flight', 0)}")
+    header("course_cache_bytes", "gauge", "Approximate memory held per cached term")
+    for term, info in course_cache_memory().items():
+        lines.append(f"course_cache_bytes{_format_labels(worker + (('term', term),))} {info['bytes']}")
+
+    evaluator_stats = evaluator_cache_stats()
+    for name in ("hits", "misses", "backend_queries"):
+        header(f"course_evaluator_cache_{name}_total", "counter", f"Evaluator directory {name.replace('_', ' ')}")
+        lines.append(f"course_evaluator_cache_{name}_total{_format_labels(worker)} {evaluator_stats.get(name, 0)}")
+
+    write_stats = course_write_behind_stats()
+    for name in ("written", "coalesced", "failures", "dropped", "discarded", "skipped"):
+        header(f"course_write_behind_{name}_total", "counter", f"Course write-behind {name}")
+        lines.append(f"course_write_behind_{name}_total{_format_labels(worker)} {write_stats.get(name, 0)}")
+    header("course_write_behind_pending", "gauge", "Course updates waiting to be written")
+    lines.append(f"course_write_behind_pending{_format_labels(worker)} {write_stats.get('pending', 0)}")
+
+    header("course_metrics_enabled", "gauge", "Whether course metrics are being recorded")
+    lines.append(f"course_metrics_enabled{_format_labels(worker)} {int(METRICS_ENABLED)}")
+
+    pool_stats = oracle_pool_stats()
+    header("course_oracle_pool_checkouts_total", "counter", "Oracle pool session checkouts")
+    lines.append(f"course_oracle_pool_checkouts_total{_format_labels(worker)} {pool_stats['checkouts']:g}")
+    header("course_oracle_pool_wait_seconds_total", "counter", "Time spent waiting for Oracle pool sessions")
+    lines.append(f"course_oracle_pool_wait_seconds_total{_format_labels(worker)} {pool_stats['wait_seconds']:.6f}")
+    header("course_oracle_pool_sessions", "gauge", "Oracle pool sessions by state")
+    lines.append(f'course_oracle_pool_sessions{_format_labels(worker, ("state", "opened"))} {pool_stats["pool_opened"]}')
+    lines.append(f'course_oracle_pool_sessions{_format_labels(worker, ("state", "busy"))} {pool_stats["pool_busy"]}')
+
+    return "\n".join(lines) + "\n"
 
 
 UNIQUE_KEYS = ["term_code", "college_code", "trans_subj", "trans_numb"]
@@ -46,51 +806,444 @@ def _normalize_oracle_row(row: Dict[str, Any]) -> Dict[str, Any]:
         "fsid":     None,
     }
 
+# Manual course normalisation (single create and bulk import): trimmed,
+# subjects upper-cased so case/whitespace variants can't duplicate a key
+def normalize_manual_course(course_dict: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    now = now or datetime.utcnow()
+    return {
+        "term_code": (course_dict.get("term_code") or "").strip(),
+        "college_code": (course_dict.get("college_code") or "").strip(),
+        "college_name": (course_dict.get("college_name") or "").strip(),
+        "trans_subj": (course_dict.get("trans_subj") or "").strip().upper(),
+        "trans_numb": (course_dict.get("trans_numb") or "").strip(),
+        "inst_subj": (course_dict.get("inst_subj") or "").strip().upper(),
+        "inst_numb": (course_dict.get("inst_numb") or "").strip(),
+        "standard": "Lower" if (course_dict.get("inst_numb") or "").strip() == "1910" else "Higher",
+        "status": "RF",
+        "source": "manual",
+        "fsid": None,
+        "filename": None,
+        "created_at": now,
+        "updated_at": now
+    }
+
+MANUAL_IMPORT_MAX_ROWS = 5000
+
+# Keys already in Mongo are only caught by uq_course_key; without it an
+# import would insert them again, so refuse to run instead
+def _require_course_key_index() -> None:
+    ensure_course_indexes()
+    if "uq_course_key" not in db_collection("course").index_information():
+        raise Exception("course index uq_course_key is missing; imports need it to reject existing courses")
+
+# Insert normalised manual courses given as (line, doc) pairs. Repeats within
+# the upload are reported against the first line with that key; the rest go
+# out in one unordered insert_many and uq_course_key rejects keys that already
+# exist. Returns per-line statuses plus totals.
+def import_manual_courses(entries: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+    _require_course_key_index()
+    rows: List[Dict[str, Any]] = []
+    first_line: Dict[Tuple[Any, ...], int] = {}
+    docs: List[Dict[str, Any]] = []
+    doc_lines: List[int] = []
+    for line, doc in entries:
+        key = tuple(doc[k] for k in UNIQUE_KEYS)
+        if key in first_line:
+            rows.append({"line": line, "status": "duplicate", "error": f"same course as line {first_line[key]}"})
+            continue
+        first_line[key] = line
+        docs.append(doc)
+        doc_lines.append(line)
+    # one write token for the whole upload, sequenced once per term
+    if docs:
+        token = course_write_fields({})["seq_pending"]
+        docs = [{**doc, "seq_pending": token} for doc in docs]
+
+    errors: Dict[int, Dict[str, Any]] = {}
+    if docs:
+        try:
+            db_collection("course").insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            errors = {err["index"]: err for err in e.details.get("writeErrors", [])}
+
+    written = [doc for i, doc in enumerate(docs) if i not in errors]
+    seqs = {term_code: _sequence_term_writes(term_code, token)
+            for term_code in {doc["term_code"] for doc in written}}
+    for doc in written:
+        _apply_cached_add(_sequenced(doc, seqs[doc["term_code"]]))
+    for i, (line, doc) in enumerate(zip(doc_lines, docs)):
+        err = errors.get(i)
+        if err is None:
+            rows.append({"line": line, "status": "inserted", "id": str(doc["_id"])})
+        elif err.get("code") == 11000:
+            rows.append({"line": line, "status": "duplicate", "error": "course already exists"})
+        else:
+            rows.append({"line": line, "status": "failed", "error": err.get("errmsg")})
+
+    rows.sort(key=lambda r: r["line"])
+    totals = {status: sum(1 for r in rows if r["status"] == status) for status in ("inserted", "duplicate", "failed")}
+    return {**totals, "rows": rows}
+
+
+# Per-term watermark for the incremental Oracle sync
+SYNC_STATE_COLLECTION = "coursesyncstate"
+# Bulk send-to-evaluators jobs and how long they are kept
+SEND_JOB_COLLECTION = "coursesendjob"
+BULK_SEND_JOB_TTL_SECONDS = 7 * 24 * 60 * 60
+# Background term refresh jobs, kept as long as send jobs
+REFRESH_JOB_COLLECTION = "courserefreshjob"
+# Full re-pull of the term at least this often, as a safety net for rows the
+# activity-date watermark can miss (back-dated edits, clock skew)
+FULL_SYNC_HOURS = 24
+
+# Indexes each course query path relies on, per collection. Ensured once per
+# process: at startup, or on the next refresh if Mongo wasn't reachable then.
+COURSE_INDEXES: Dict[str, List[Dict[str, Any]]] = {
+    "course": [
+        # Oracle sync upserts, and the per-term reload sorted by college/subject/number
+        {"name": "uq_course_key", "keys": [(k, ASCENDING) for k in UNIQUE_KEYS], "unique": True},
+        # RF/RT listings and bulk send: term + status, then college_code (prefix)
+        {"name": "course_term_status_college",
+         "keys": [("term_code", ASCENDING), ("status", ASCENDING), ("college_code", ASCENDING)]},
+        # courses of a term written after a sequence, or still pending (write catch-up)
+        {"name": "course_term_seq", "keys": [("term_code", ASCENDING), ("seq", ASCENDING)]},
+        {"name": "course_term_seq_pending", "keys": [("term_code", ASCENDING), ("seq_pending", ASCENDING)]},
+    ],
+    "departmentconfig": [
+        {"name": "deptconfig_transfer_course", "keys": [("transfer_course", ASCENDING)]},
+    ],
+    SYNC_STATE_COLLECTION: [
+        {"name": "coursesyncstate_term", "keys": [("term_code", ASCENDING)]},
+    ],
+    # bulk send jobs are dropped by Mongo once they expire
+    SEND_JOB_COLLECTION: [
+        {"name": "coursesendjob_started_at", "keys": [("started_at", ASCENDING)],
+         "expire_after_seconds": BULK_SEND_JOB_TTL_SECONDS},
+    ],
+    REFRESH_JOB_COLLECTION: [
+        {"name": "courserefreshjob_started_at", "keys": [("started_at", ASCENDING)],
+         "expire_after_seconds": BULK_SEND_JOB_TTL_SECONDS},
+    ],
+}
+
+# Representative queries for each path above; the plan check explains these
+COURSE_CANONICAL_QUERIES: List[Dict[str, Any]] = [
+    {"name": "load_term", "collection": "course", "filter": {"term_code": "000000"},
+     "sort": [("college_code", ASCENDING), ("trans_subj", ASCENDING), ("trans_numb", ASCENDING)]},
+    {"name": "rf_rt_by_college_prefix", "collection": "course",
+     "filter": {"term_code": "000000", "status": {"$in": ["RF", "RT"]}, "college_code": {"$regex": "^0"}},
+     "sort": [("college_code", ASCENDING)]},
+    {"name": "bulk_send_by_college", "collection": "course",
+     "filter": {"term_code": "000000", "status": {"$in": ["RF", "RT"]}, "college_code": "0"}},
+    {"name": "term_writes_since", "collection": "course",
+     "filter": {"term_code": "000000", "seq": {"$gt": 0}}},
+    {"name": "term_pending_writes", "collection": "course",
+     "filter": {"term_code": "000000", "seq_pending": {"$exists": True}}},
+    {"name": "dept_config_by_subject", "collection": "departmentconfig", "filter": {"transfer_course": "X"}},
+    {"name": "sync_state_by_term", "collection": SYNC_STATE_COLLECTION, "filter": {"term_code": "000000"}},
+]
+
+# Run the query plan check at startup and refuse to start on a COLLSCAN
+COURSE_INDEX_CHECK = os.environ.get("COURSE_INDEX_CHECK", "").lower() in ("1", "true", "yes")
+
+_indexes_ensured = False
+_indexes_lock = threading.Lock()
+
+def ensure_course_indexes() -> bool:
+    global _indexes_ensured
+    with _indexes_lock:
+        if _indexes_ensured:
+            return True
+        done = True
+        for collection, indexes in COURSE_INDEXES.items():
+            col = db_collection(collection)
+            for spec in indexes:
+                try:
+                    options = {"expireAfterSeconds": spec["expire_after_seconds"]} if "expire_after_seconds" in spec else {}
+                    col.create_index(spec["keys"], name=spec["name"], unique=spec.get("unique", False), background=True, **options)
+                except OperationFailure as e:
+                    # conflicting existing index or duplicate data: retrying won't help
+                    uvicornLogger.warning(f"{collection} index {spec['name']}: {e}")
+                except Exception as e:
+                    uvicornLogger.warning(f"{collection} index {spec['name']}: {e}")
+                    done = False
+        _indexes_ensured = done
+        return done
+
+def _plan_stages(plan: Any) -> List[str]:
+    stages: List[str] = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
 
-    # Create the unique index once (idempotent)
-def _ensure_unique_index():
+# Explain each canonical query; raises if any winning plan scans the collection
+def check_course_query_plans(raise_on_collscan: bool = True) -> List[Dict[str, Any]]:
+    report: List[Dict[str, Any]] = []
+    for query in COURSE_CANONICAL_QUERIES:
+        cursor = db_collection(query["collection"]).find(query["filter"])
+        if query.get("sort"):
+            cursor = cursor.sort(query["sort"])
+        if query.get("limit"):
+            cursor = cursor.limit(query["limit"])
+        planner = cursor.explain().get("queryPlanner", {})
+        stages = _plan_stages(planner.get("winningPlan", {}))
+        report.append({
+            "query": query["name"],
+            "collection": query["collection"],
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+        })
+    scans = [r["query"] for r in report if r["collscan"]]
+    if scans and raise_on_collscan:
+        raise Exception(f"course queries fall back to COLLSCAN: {', '.join(scans)}")
+    return report
+
+def course_index_startup() -> None:
+    ensure_course_indexes()
+    if COURSE_INDEX_CHECK:
+        check_course_query_plans()
+
+def _get_sync_state(term_code: str) -> Dict[str, Any]:
+    col = db_collection(SYNC_STATE_COLLECTION)
+    return col.find_one({"term_code": term_code}, {"_id": 0}) or {}
+
+def _save_sync_state(term_code: str, watermark: Optional[datetime], full_sync: bool) -> None:
+    now = datetime.utcnow()
+    fields: Dict[str, Any] = {"watermark": watermark, "updated_at": now}
+    if full_sync:
+        fields["last_full_sync"] = now
+    col = db_collection(SYNC_STATE_COLLECTION)
+    col.update_one({"term_code": term_code}, {"$set": fields}, upsert=True)
+
+def _needs_full_sync(state: Dict[str, Any]) -> bool:
+    last_full = state.get("last_full_sync")
+    if not state.get("watermark") or not last_full:
+        return True
+    return datetime.utcnow() - last_full > timedelta(hours=FULL_SYNC_HOURS)
+
+# Keys of the term already in Mongo, as tuples in UNIQUE_KEYS order: from this
+# worker's cached snapshot when it has one, otherwise one projection query
+# covered by uq_course_key
+def _existing_course_keys(term_code: str) -> Set[Tuple[Any, ...]]:
+    with _cache_lock:
+        entry = _course_cache.get(term_code)
+        if entry is not None and entry.has_data():
+            positions = [entry.field_pos.get(k) for k in UNIQUE_KEYS]
+            rows = list(entry.rows)
+        else:
+            rows = None
+    if rows is not None and None not in positions:
+        return {tuple(row[p] if p < len(row) else None for p in positions) for row in rows}
     col = db_collection("course")
-    try:
-        col.create_index(
-            [(k, ASCENDING) for k in UNIQUE_KEYS],
-            name="uq_course_key",
-            unique=True,
-            background=True,
-        )
-    except Exception as e:
-        # Likely already exists or racing; not fatal.
-        uvicornLogger.warning(f"course unique index creation: {e}")
+    projection = {"_id": 0, **{k: 1 for k in UNIQUE_KEYS}}
+    return {tuple(d.get(k) for k in UNIQUE_KEYS) for d in col.find({"term_code": term_code}, projection)}
 
-def _insert_new_courses_from_oracle(term_code: str) -> None:
+# Split the term's course query into this many college_code ranges, fetched
+# on parallel Oracle sessions (1 = a single query)
+ORACLE_SYNC_PARTITIONS = int(os.environ.get("COURSE_SYNC_PARTITIONS", "1"))
 
-    rows: List[Dict[str, Any]] = course_query(term_code) or []
-    if not rows:
+# College ranges holding roughly equal numbers of the term's known courses.
+# Ends are open, so colleges not seen yet still fall into a range.
+def _college_partitions(known_keys: Set[Tuple[Any, ...]], partitions: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    pos = UNIQUE_KEYS.index("college_code")
+    codes = sorted(key[pos] for key in known_keys if key[pos])
+    if partitions <= 1 or len(codes) < partitions:
+        return [(None, None)]
+    bounds = sorted({codes[len(codes) * i // partitions] for i in range(1, partitions)})
+    edges: List[Optional[str]] = [None, *bounds, None]
+    return list(zip(edges[:-1], edges[1:]))
+
+# Chunks from several course_query_chunks partitions, merged in arrival order.
+# Each partition is read on its own thread (and Oracle session); the queue
+# bound keeps fast partitions from running far ahead of the Mongo writes.
+def _merged_course_chunks(term_code: str, since: Optional[datetime],
+                          ranges: List[Tuple[Optional[str], Optional[str]]]) -> Iterator[List[Dict[str, Any]]]:
+    if len(ranges) == 1:
+        yield from course_query_chunks(term_code, since=since, college_range=ranges[0])
         return
 
+    chunks: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=len(ranges) * 2)
+    stop = threading.Event()
+
+    def put(item: Tuple[str, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(college_range: Tuple[Optional[str], Optional[str]]) -> None:
+        try:
+            for rows in course_query_chunks(term_code, since=since, college_range=college_range):
+                if not put(("rows", rows)):
+                    return
+            put(("done", None))
+        except Exception as e:
+            put(("done", e))
+
+    threads = [
+        threading.Thread(target=produce, args=(r,), name=f"course-sync-{term_code}-{i}", daemon=True)
+        for i, r in enumerate(ranges)
+    ]
+    for t in threads:
+        t.start()
+    error: Optional[Exception] = None
+    try:
+        remaining = len(threads)
+        while remaining:
+            kind, value = chunks.get()
+            if kind == "rows":
+                yield value
+                continue
+            remaining -= 1
+            error = error or value
+    finally:
+        stop.set()
+    if error is not None:
+        raise error
+
+# Outcome of the last Oracle sync per term
+_sync_reports: Dict[str, Dict[str, Any]] = {}
+
+# Oracle -> Mongo sync for a term. Incoming rows are diffed against the keys
+# the term already has and only missing keys are sent, as plain inserts; a
+# key another writer inserted meanwhile comes back as a duplicate-key error
+# and is counted as conflicted rather than failing the sync. Each chunk's
+# inserts are stamped when written and sequenced once they land.
+def _insert_new_courses_from_oracle(term_code: str, force_full: bool = False, partitions: Optional[int] = None) -> Dict[str, Any]:
+
+    state = _get_sync_state(term_code)
+    full_sync = force_full or _needs_full_sync(state)
+    since = None if full_sync else state.get("watermark")
+
+    # Highest activity date seen; never move the watermark backwards
+    watermark = since
     col = db_collection("course")
     now = datetime.utcnow()
-    ops: List[UpdateOne] = []
+    failed = False
 
-    for r in rows:
-        doc = _normalize_oracle_row(r)
-        # skip if identity incomplete
-        if not all(doc.get(k) for k in UNIQUE_KEYS):
-            continue
+    oracle_seconds = normalize_seconds = write_seconds = 0.0
+    fetched = incomplete = existing = inserted = conflicted = 0
 
-        key = {k: doc[k] for k in UNIQUE_KEYS}
-        ops.append(
-            UpdateOne(
-                key,
-                {"$setOnInsert": {**doc, "created_at": now, "updated_at": now}},
-                upsert=True,
-            )
-        )
+    known_keys: Optional[Set[Tuple[Any, ...]]] = None
 
-    if ops:
-        try:
-            col.bulk_write(ops, ordered=False)
-        except Exception as e:
-            uvicornLogger.exception(e)
+    def load_known_keys() -> Set[Tuple[Any, ...]]:
+        started = time.perf_counter()
+        keys = _existing_course_keys(term_code)
+        observe("course_refresh_stage_seconds", time.perf_counter() - started, stage="existing_keys")
+        return keys
+
+    # Only full syncs are split by college, using the known keys for the
+    # ranges; a delta sync (usually a handful of rows, often none) is a single
+    # query and reads the keys only once it has rows to check
+    partitions = ORACLE_SYNC_PARTITIONS if partitions is None else partitions
+    ranges: List[Tuple[Optional[str], Optional[str]]] = [(None, None)]
+    if full_sync and partitions > 1:
+        known_keys = load_known_keys()
+        ranges = _college_partitions(known_keys, partitions)
+
+    # Write each Oracle chunk to Mongo as it arrives (from every partition)
+    chunks = _merged_course_chunks(term_code, since, ranges)
+    while True:
+        started = time.perf_counter()
+        rows = next(chunks, None)
+        oracle_seconds += time.perf_counter() - started
+        if rows is None:
+            break
+
+        if rows and known_keys is None:
+            known_keys = load_known_keys()
+
+        started = time.perf_counter()
+        fetched += len(rows)
+        ops: List[InsertOne] = []
+        stamp = course_write_fields({})
+
+        for r in rows:
+            activity_date = r.get("ACTIVITY_DATE")
+            if activity_date is not None and (watermark is None or activity_date > watermark):
+                watermark = activity_date
+
+            doc = _normalize_oracle_row(r)
+            # skip if identity incomplete
+            if not all(doc.get(k) for k in UNIQUE_KEYS):
+                incomplete += 1
+                continue
+
+            key = tuple(doc[k] for k in UNIQUE_KEYS)
+            if key in known_keys:
+                existing += 1
+                continue
+            known_keys.add(key)
+            ops.append(InsertOne({**doc, "created_at": stamp["updated_at"], **stamp}))
+        normalize_seconds += time.perf_counter() - started
+
+        if ops:
+            started = time.perf_counter()
+            chunk_inserted = 0
+            try:
+                result = col.bulk_write(ops, ordered=False)
+                chunk_inserted = result.inserted_count
+            except BulkWriteError as e:
+                chunk_inserted = e.details.get("nInserted", 0)
+                for error in e.details.get("writeErrors", []):
+                    if error.get("code") == 11000:
+                        conflicted += 1
+                    else:
+                        failed = True
+                if failed:
+                    uvicornLogger.exception(e)
+            except Exception as e:
+                uvicornLogger.exception(e)
+                failed = True
+            if chunk_inserted:
+                inserted += chunk_inserted
+                _sequence_term_writes(term_code, stamp["seq_pending"])
+            write_seconds += time.perf_counter() - started
+
+    observe("course_refresh_stage_seconds", oracle_seconds, stage="oracle_query")
+    observe("course_refresh_stage_seconds", normalize_seconds, stage="normalize")
+    observe("course_refresh_stage_seconds", write_seconds, stage="bulk_write")
+    observe("course_oracle_seconds", oracle_seconds, query="course_query")
+    inc("course_sync_rows_total", fetched, result="fetched")
+    inc("course_sync_rows_total", incomplete, result="incomplete_key")
+    inc("course_sync_rows_total", existing, result="skipped")
+    inc("course_sync_writes_total", inserted, result="inserted")
+    inc("course_sync_writes_total", conflicted, result="conflicted")
+
+    report = {
+        "term_code": term_code,
+        "full_sync": full_sync,
+        "partitions": len(ranges),
+        "fetched": fetched,
+        "skipped": existing,
+        "incomplete": incomplete,
+        "inserted": inserted,
+        "conflicted": conflicted,
+        "failed": failed,
+        "synced_at": now,
+    }
+    _sync_reports[term_code] = report
+    uvicornLogger.info(
+        f"course sync {term_code}: fetched={fetched} skipped={existing} inserted={inserted} "
+        f"conflicted={conflicted} incomplete={incomplete}{' (failed)' if failed else ''}"
+    )
+
+    # Keep the old watermark so the next sync picks failed rows up again
+    if not failed:
+        _save_sync_state(term_code, watermark, full_sync)
+    return report
+
+def course_sync_reports() -> Dict[str, Dict[str, Any]]:
+    return {term: dict(report) for term, report in _sync_reports.items()}
 
 # getting term code for caching
 def _load_term_from_mongo(term_code: str) -> List[Dict[str, Any]]:
@@ -105,48 +1258,1620 @@ def _load_term_from_mongo(term_code: str) -> List[Dict[str, Any]]:
             d["_id"] = str(_id)
     return docs
 
-# Main function to refresh and cache term 
-#     Refresh pipeline for a term:
-#       1) Insert-only upsert from Oracle into Mongo
-#       2) Read from Mongo
-#       3) Cache in memory
+# Cross-worker visibility and versioning of course writes. Each write to a
+# course also sets `seq_pending` to a token of its own. Once the write has
+# landed, the writer takes the next value of a per-term counter in Mongo and
+# stamps it as the course's `seq` (clearing the token). Counter values are
+# handed out by the server in the order writes finish, so, unlike updated_at
+# stamps from each host's clock, a write can't come out older than one a
+# reader has already seen.
+#
+# A cached term records the counter value it is current with (write_version,
+# read before its rows); that value is the snapshot version clients get in
+# ETags and pass back as ?since=. Cached reads compare it with the counter
+# and, when it moved, pull courses with a higher `seq` plus those still
+# pending (landed, not yet stamped), so a send or evaluator change on one
+# worker is listed by every worker within WRITE_CHECK_SECONDS rather than
+# after the TTL.
+CACHE_VERSION_COLLECTION = "coursecacheversion"
+# Minimum seconds between counter checks per term, so steady-state cached
+# reads (list, 304 check, search) make at most one Mongo round trip per term
+# per interval. A write made on another worker can be missing from this
+# worker's reads for up to this long; this worker's own writes are visible on
+# its next read (0 = check on every cached read).
+WRITE_CHECK_SECONDS = float(os.environ.get("COURSE_WRITE_CHECK_SECONDS", "1"))
+
+def _term_version_key(term_code: str) -> str:
+    return f"term:{term_code}"
+
+def _read_cache_version(key: str) -> int:
+    doc = db_collection(CACHE_VERSION_COLLECTION).find_one({"_id": key}, {"version": 1})
+    return (doc or {}).get("version", 0)
+
+def _bump_cache_version(key: str) -> int:
+    doc = db_collection(CACHE_VERSION_COLLECTION).find_one_and_update(
+        {"_id": key}, {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        projection={"version": 1}, upsert=True, return_document=ReturnDocument.AFTER,
+    )
+    return doc["version"]
+
+# `fields` for a course write ($set or insert), marked as pending until
+# _sequence_term_writes stamps it
+def course_write_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {**fields, "updated_at": datetime.utcnow(), "seq_pending": uuid.uuid4().hex}
+
+# A course doc as it reads once its write is sequenced as `seq`
+def _sequenced(doc: Dict[str, Any], seq: Optional[int]) -> Dict[str, Any]:
+    doc = {k: v for k, v in doc.items() if k != "seq_pending"}
+    if seq is not None:
+        doc["seq"] = seq
+    return doc
+
+# Stamp the term's courses written with `token` with the next sequence value.
+# The write itself succeeded; if this fails the courses stay pending, which
+# readers still pick up. Returns the sequence, or None on failure.
+def _sequence_term_writes(term_code: Optional[str], token: Optional[str]) -> Optional[int]:
+    if not term_code or not token:
+        return None
+    try:
+        seq = _bump_cache_version(_term_version_key(term_code))
+        db_collection("course").update_many(
+            {"term_code": term_code, "seq_pending": token},
+            {"$set": {"seq": seq}, "$unset": {"seq_pending": ""}},
+        )
+    except Exception as e:
+        uvicornLogger.warning(f"course write sequencing for {term_code}: {e}")
+        return None
+    _recheck_writes(term_code)
+    return seq
+
+# The local cache's next read of the term checks the counter right away
+def _recheck_writes(term_code: str) -> None:
+    with _cache_lock:
+        entry = _course_cache.get(term_code)
+        if entry is not None:
+            entry.write_checked_at = 0.0
+
+# Writes not marked with course_write_fields only move the counter
+def _bump_term_version(term_code: Optional[str]) -> None:
+    if not term_code:
+        return
+    try:
+        _bump_cache_version(_term_version_key(term_code))
+    except Exception as e:
+        uvicornLogger.warning(f"course write version bump for {term_code}: {e}")
+        return
+    _recheck_writes(term_code)
+
+# Write counter to record against rows about to be read from Mongo
+def _term_write_mark(term_code: str) -> int:
+    return _read_cache_version(_term_version_key(term_code))
+
+# Courses read while their write was still pending count as written at `seq`
+# (the counter value read before them); they're pulled again once stamped
+def _settle_pending(docs: List[Dict[str, Any]], seq: int) -> List[Dict[str, Any]]:
+    return [_sequenced(d, seq) if "seq_pending" in d else d for d in docs]
+
+def _load_term_changes(term_code: str, since: int) -> List[Dict[str, Any]]:
+    col = db_collection("course")
+    docs = list(col.find({"term_code": term_code, "seq": {"$gt": since}}))
+    docs += list(col.find({"term_code": term_code, "seq_pending": {"$exists": True}}))
+    for d in docs:
+        d["_id"] = str(d["_id"])
+    return docs
+
+# Bring a cached term up to date with writes made since it was loaded (by any
+# worker). Readers only serialise on catchup_lock when the counter moved.
+def _catch_up_writes(term_code: str, entry: CourseCacheEntry) -> None:
+    now = time.monotonic()
+    with _cache_lock:
+        if not entry.has_data() or (WRITE_CHECK_SECONDS and now - entry.write_checked_at < WRITE_CHECK_SECONDS):
+            return
+        entry.write_checked_at = now
+    try:
+        current = _read_cache_version(_term_version_key(term_code))
+        with _cache_lock:
+            if current <= entry.write_version:
+                return
+        with entry.catchup_lock:
+            with _cache_lock:
+                if current <= entry.write_version:
+                    return
+                since, generation = entry.write_version, entry.generation
+            with timed("course_refresh_stage_seconds", stage="write_catchup"):
+                docs = _settle_pending(_load_term_changes(term_code, since), current)
+            with _cache_lock:
+                # rows were replaced meanwhile; they carry their own write mark
+                if entry.generation != generation:
+                    return
+                for doc in docs:
+                    entry.merge_doc(doc)
+                entry.write_version = current
+    except Exception as e:
+        uvicornLogger.warning(f"course write catch-up for {term_code}: {e}")
+
+# Shared snapshot tier so uvicorn workers on a host don't each refresh the
+# same term. Each published term is a snapshot file (its mtime is the version)
+# plus a lock file; the worker holding the lock runs the Oracle/Mongo pipeline
+# and publishes, the others load what it published. Any object with the same
+# methods can be plugged in with set_shared_store (None = per-process only).
+# Opt-in: only used when COURSE_SNAPSHOT_DIR names a directory owned by this
+# user and closed to group/other.
+COURSE_SNAPSHOT_DIR = os.environ.get("COURSE_SNAPSHOT_DIR")
+SHARED_LOCK_TIMEOUT_SECONDS = 10 * 60
+SHARED_VERSION_CHECK_SECONDS = 5
+
+# Snapshot files are a BSON stream: a header document, then the term's docs
+class LocalSnapshotStore:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode):
+            raise PermissionError(f"{directory} is not a directory")
+        self._check_private(directory, info, 0o077)
+
+    @staticmethod
+    def _check_private(path: str, info: os.stat_result, forbidden_mode: int) -> None:
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"{path} is owned by uid {info.st_uid}, not {os.getuid()}")
+        if info.st_mode & forbidden_mode:
+            raise PermissionError(f"{path} has mode {stat.S_IMODE(info.st_mode):o}")
+
+    def _path(self, term_code: str, suffix: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_-]", "_", term_code) + suffix)
+
+    def version(self, term_code: str) -> Optional[int]:
+        try:
+            return os.stat(self._path(term_code, ".snapshot")).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    # (version, published_at, docs, write_mark) or None if the term was never
+    # published; write_mark is the publisher's _term_write_mark, if it had one
+    def read(self, term_code: str) -> Optional[Tuple[int, float, List[Dict[str, Any]], Optional[int]]]:
+        try:
+            with open(self._path(term_code, ".snapshot"), "rb") as f:
+                info = os.fstat(f.fileno())
+                self._check_private(f.name, info, 0o022)
+                documents = bson.decode_file_iter(f)
+                header = next(documents)
+                docs = list(documents)
+        except FileNotFoundError:
+            return None
+        return info.st_mtime_ns, header["published_at"], docs, header.get("write_version")
+
+    def publish(self, term_code: str, docs: List[Dict[str, Any]], published_at: float,
+                write_mark: Optional[int] = None) -> int:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(bson.encode({
+                    "published_at": published_at,
+                    "write_version": write_mark,
+                }))
+                for doc in docs:
+                    f.write(bson.encode(doc))
+            # atomic swap: readers see the old or the new snapshot, never half of one
+            os.replace(tmp_path, self._path(term_code, ".snapshot"))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return self.version(term_code)
+
+    # Interprocess refresh lock; yields False if it couldn't be taken in time
+    @contextmanager
+    def refresh_lock(self, term_code: str, timeout: float = SHARED_LOCK_TIMEOUT_SECONDS):
+        with open(os.open(self._path(term_code, ".lock"), os.O_RDWR | os.O_CREAT, 0o600), "a+") as f:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        yield False
+                        return
+                    time.sleep(0.2)
+            try:
+                yield True
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+_shared_store: Any = None
+
+def set_shared_store(store: Any) -> None:
+    global _shared_store
+    _shared_store = store
+
+def _default_shared_store() -> Any:
+    if not COURSE_SNAPSHOT_DIR:
+        return None
+    try:
+        return LocalSnapshotStore(COURSE_SNAPSHOT_DIR)
+    except OSError as e:
+        uvicornLogger.warning(f"course snapshot store disabled: {e}")
+        return None
+
+_shared_store = _default_shared_store()
+
+# write_mark is the _term_write_mark taken before `docs` were read from Mongo
+# (carried along in shared snapshots); without one, every sequenced write is
+# caught up on the next read
+def _cache_term(term_code: str, docs: List[Dict[str, Any]], cached_at: float, shared_version: Optional[int] = None,
+                write_mark: Optional[int] = None) -> None:
+    # packing, indexing and measuring happen outside the lock; readers keep
+    # the old rows until the swap
+    with timed("course_refresh_stage_seconds", stage="cache_build"):
+        built = CourseCacheEntry()
+        built.set_data(docs)
+    with _cache_lock:
+        entry = _course_cache.get(term_code) or CourseCacheEntry()
+        search_base = entry.take_data(built)
+        entry.cache_timestamp = cached_at
+        entry.shared_version = shared_version
+        entry.shared_checked_at = time.monotonic()
+        entry.generation += 1
+        entry.write_checked_at = 0.0
+        entry.write_version = write_mark or 0
+        _course_cache[term_code] = entry
+        _evict_lru(keep=term_code)
+    # a term that was being searched gets its index carried over now, rather
+    # than rebuilt in full by the next search
+    if search_base is not None:
+        _ensure_search_index(entry, search_base)
 
-def _refresh_and_cache_term(term_code: str) -> List[Dict[str, Any]]:
+# Shared snapshot for the term if one was published within the TTL
+def _fresh_shared_snapshot(term_code: str, ttl_hours: int):
+    snapshot = _shared_store.read(term_code)
+    if snapshot is None:
+        return None
+    published_at = snapshot[1]
+    if (datetime.now() - timedelta(hours=ttl_hours)).timestamp() > published_at:
+        return None
+    return snapshot
 
-    _ensure_unique_index()
-    _insert_new_courses_from_oracle(term_code)
-    docs = _load_term_from_mongo(term_code)
+# Pick up a snapshot another worker published since this entry was loaded.
+# Checked at most every SHARED_VERSION_CHECK_SECONDS.
+def _sync_from_shared(term_code: str, entry: CourseCacheEntry) -> None:
+    if _shared_store is None:
+        return
+    now = time.monotonic()
+    with _cache_lock:
+        if now - entry.shared_checked_at < SHARED_VERSION_CHECK_SECONDS:
+            return
+        entry.shared_checked_at = now
+        known = entry.shared_version
+    try:
+        if _shared_store.version(term_code) in (None, known):
+            return
+        snapshot = _shared_store.read(term_code)
+    except Exception as e:
+        uvicornLogger.warning(f"course snapshot read for {term_code}: {e}")
+        return
+    if snapshot is not None and snapshot[0] != known:
+        # write-throughs made here after the publisher read Mongo are pulled
+        # back in by _catch_up_writes from the snapshot's write mark
+        version, published_at, docs, write_mark = snapshot
+        _cache_term(term_code, docs, published_at, shared_version=version, write_mark=write_mark)
+
+# Refresh pipeline for a term:
+#   1) Insert-only upsert from Oracle into Mongo
+#   2) Read from Mongo
+# Returns the docs and the write mark they were read at.
+def _run_refresh_pipeline(term_code: str) -> Tuple[List[Dict[str, Any]], int]:
+    with timed("course_refresh_stage_seconds", stage="ensure_index"):
+        ensure_course_indexes()
+    with timed("course_refresh_stage_seconds", stage="oracle_sync"):
+        _insert_new_courses_from_oracle(term_code)
+    with timed("course_refresh_stage_seconds", stage="mongo_reload"):
+        write_mark = _term_write_mark(term_code)
+        return _settle_pending(_load_term_from_mongo(term_code), write_mark), write_mark
+
+# Main function to refresh and cache term. With a shared store, a snapshot
+# another worker published within the TTL is reused; otherwise the pipeline
+# runs under the interprocess lock and the result is published.
+def _refresh_and_cache_term(term_code: str, ttl_hours: int = 2) -> List[Dict[str, Any]]:
+    with timed("course_refresh_stage_seconds", stage="total"):
+        return _refresh_term(term_code, ttl_hours)
 
-    entry = _course_cache.get(term_code) or CourseCacheEntry()
-    entry.data = docs
-    entry.cache_timestamp = datetime.now().timestamp()
-    _course_cache[term_code] = entry
+def _refresh_term(term_code: str, ttl_hours: int) -> List[Dict[str, Any]]:
 
+    if _shared_store is None:
+        docs, write_mark = _run_refresh_pipeline(term_code)
+        _cache_term(term_code, docs, datetime.now().timestamp(), write_mark=write_mark)
+        return docs
+
+    snapshot = _fresh_shared_snapshot(term_code, ttl_hours)
+    if snapshot is None:
+        with _shared_store.refresh_lock(term_code) as locked:
+            if not locked:
+                raise Exception(f"Timed out waiting for another worker to refresh term {term_code}")
+            # another worker may have published while we waited for the lock
+            snapshot = _fresh_shared_snapshot(term_code, ttl_hours)
+            if snapshot is None:
+                docs, write_mark = _run_refresh_pipeline(term_code)
+                published_at = datetime.now().timestamp()
+                version = None
+                try:
+                    with timed("course_refresh_stage_seconds", stage="snapshot_publish"):
+                        version = _shared_store.publish(term_code, docs, published_at, write_mark=write_mark)
+                except Exception as e:
+                    uvicornLogger.warning(f"course snapshot publish for {term_code}: {e}")
+                _cache_term(term_code, docs, published_at, shared_version=version, write_mark=write_mark)
+                return docs
+
+    version, published_at, docs, write_mark = snapshot
+    _cache_term(term_code, docs, published_at, shared_version=version, write_mark=write_mark)
     return docs
 
-# Public API for router/service:
-#   - If cache is missing/stale -> refresh
-#   - Return cached data
+# Drop least recently used terms until the cache is within budget. Terms with
+# a refresh in flight are skipped. Caller must hold _cache_lock.
+def _evict_lru(keep: Optional[str] = None) -> None:
+    def over_budget() -> bool:
+        if COURSE_CACHE_MAX_TERMS is not None and len(_course_cache) > COURSE_CACHE_MAX_TERMS:
+            return True
+        if COURSE_CACHE_MAX_BYTES is not None:
+            return sum(e.size_bytes for e in _course_cache.values()) > COURSE_CACHE_MAX_BYTES
+        return False
+
+    for term in list(_course_cache):
+        if not over_budget():
+            break
+        if term == keep or _course_cache[term].refreshing:
+            continue
+        del _course_cache[term]
+        _cache_stats["evictions"] += 1
+
+# Single-flight refresh for one term. Only the caller that claimed the entry
+# (entry.refreshing set under _cache_lock) runs this. On failure the last good
+# snapshot stays in place and the next attempt is pushed out with backoff.
+def _run_refresh(term_code: str, entry: CourseCacheEntry, ttl_hours: int = 2) -> None:
+    try:
+        _refresh_and_cache_term(term_code, ttl_hours=ttl_hours)
+        with _cache_lock:
+            entry.failures = 0
+            entry.retry_at = 0.0
+            entry.last_error = None
+    except Exception as e:
+        uvicornLogger.exception(e)
+        with _cache_lock:
+            entry.failures += 1
+            delay = min(REFRESH_BACKOFF_BASE * 2 ** (entry.failures - 1), REFRESH_BACKOFF_MAX)
+            entry.retry_at = datetime.now().timestamp() + delay
+            entry.last_error = e
+            _cache_stats["refresh_failures"] += 1
+    finally:
+        with _cache_lock:
+            entry.refreshing = False
+            _cache_stats["refreshes_in_flight"] -= 1
+        entry.refresh_done.set()
+
+# Claim the refresh slot for an entry; caller must hold _cache_lock
+def _claim_refresh(entry: CourseCacheEntry) -> bool:
+    if entry.refreshing or datetime.now().timestamp() < entry.retry_at:
+        return False
+    entry.refreshing = True
+    entry.refresh_done.clear()
+    _cache_stats["refreshes_in_flight"] += 1
+    return True
+
+# Cache lookup for a term:
+#   - Fresh cache -> return it
+#   - Stale cache -> return it now, refresh in the background (one per term)
+#   - No cache yet -> one caller refreshes, concurrent callers wait for it
+# Cached entries are first brought up to date with other workers' writes.
+def _get_term_entry(term_code: str, ttl_hours: int = 2) -> CourseCacheEntry:
+
+    with _cache_lock:
+        entry = _course_cache.get(term_code)
+        if entry is None:
+            entry = CourseCacheEntry()
+            _course_cache[term_code] = entry
+        _course_cache.move_to_end(term_code)
+        entry.last_access = time.time()
+        _recent_terms[term_code] = entry.last_access
+        fresh = entry.has_data() and not entry.is_expired(hours=ttl_hours)
+    if fresh:
+        _sync_from_shared(term_code, entry)
+    with _cache_lock:
+        entry = _course_cache.get(term_code) or entry
+        if entry.has_data() and not entry.is_expired(hours=ttl_hours):
+            _cache_stats["hits"] += 1
+            cached = True
+        else:
+            claimed = _claim_refresh(entry)
+            cached = entry.has_data()
+            if cached:
+                _cache_stats["stale_serves"] += 1
+                if claimed:
+                    threading.Thread(
+                        target=_run_refresh, args=(term_code, entry, ttl_hours),
+                        name=f"course-refresh-{term_code}", daemon=True,
+                    ).start()
+    if cached:
+        _catch_up_writes(term_code, entry)
+        return entry
+
+    # Cold term: nothing to serve yet
+    if claimed:
+        _run_refresh(term_code, entry, ttl_hours)
+    else:
+        entry.refresh_done.wait()
+
+    with _cache_lock:
+        if entry.has_data():
+            return entry
+        error = entry.last_error
+    raise error or Exception(f"Course cache refresh failed for term {term_code}")
+
+# Public API for router/service: every cached course of the term
 def list_courses_for_term(term_code: str, ttl_hours: int = 2) -> List[Dict[str, Any]]:
+    entry = _get_term_entry(term_code, ttl_hours=ttl_hours)
+    with _cache_lock:
+        fields, rows = entry.all_rows()
+    return _unpack_rows(fields, rows)
+
+# Filter the cached term snapshot by status and college_code prefix, with no
+# Mongo round trip once the term is warm
+def find_courses_for_term(term_code: str, statuses: List[str], college_prefix: str = "", ttl_hours: int = 2) -> List[Dict[str, Any]]:
+    entry = _get_term_entry(term_code, ttl_hours=ttl_hours)
+    with _cache_lock:
+        fields, rows = entry.query_rows(statuses, college_prefix)
+    return _unpack_rows(fields, rows)
+
+# Version of the cached term snapshot and its row count (for ETags); warms
+# the term like any other read
+def course_term_version(term_code: str, ttl_hours: int = 2) -> Tuple[int, int]:
+    entry = _get_term_entry(term_code, ttl_hours=ttl_hours)
+    with _cache_lock:
+        return entry.write_version, len(entry.rows)
+
+# find_courses_for_term plus the snapshot version the rows were read at, all
+# under one lock, still packed as (fields, rows) so callers can unpack them
+# as they go. With `since`, only courses added or changed after that version
+# are returned; changed courses that no longer match the filter come back as
+# `removed` ids so the client can drop them.
+def course_snapshot_rows(term_code: str, statuses: List[str], college_prefix: str = "",
+                         since: Optional[int] = None, ttl_hours: int = 2) -> Dict[str, Any]:
+    entry = _get_term_entry(term_code, ttl_hours=ttl_hours)
+    removed: List[str] = []
+    with _cache_lock:
+        version, count = entry.write_version, len(entry.rows)
+        if since is None:
+            fields, rows = entry.query_rows(statuses, college_prefix)
+        else:
+            fields = tuple(entry.fields)
+            rows = []
+            for row in entry.changed_rows(since):
+                code = entry._value(row, "college_code") or ""
+                if entry._value(row, "status") in statuses and code.startswith(college_prefix):
+                    rows.append(row)
+                else:
+                    removed.append(entry._value(row, "_id"))
+            rows.sort(key=lambda row: entry._value(row, "college_code") or "")
+    return {
+        "version": version,
+        "count": count,
+        "fields": fields,
+        "rows": rows,
+        "removed": removed,
+    }
+
+# Unpack course_snapshot_rows output one course at a time
+def iter_course_rows(fields: Tuple[str, ...], rows: List[Tuple[Any, ...]]) -> Iterator[Dict[str, Any]]:
+    for row in rows:
+        yield CourseCacheEntry.unpack(fields, row)
+
+# course_snapshot_rows with the rows unpacked into course dicts
+def find_course_snapshot(term_code: str, statuses: List[str], college_prefix: str = "",
+                         since: Optional[int] = None, ttl_hours: int = 2) -> Dict[str, Any]:
+    snapshot = course_snapshot_rows(term_code, statuses, college_prefix, since=since, ttl_hours=ttl_hours)
+    return {
+        "version": snapshot["version"],
+        "count": snapshot["count"],
+        "courses": _unpack_rows(snapshot["fields"], snapshot["rows"]),
+        "removed": snapshot["removed"],
+    }
+
+# The term's rows for a status/college prefix filter as encoded JSON bytes.
+# The encoding is kept on the cache entry and reused until the snapshot
+# changes, so repeat listings skip both unpacking and encoding.
+def encoded_course_view(term_code: str, statuses: List[str], college_prefix: str = "", ttl_hours: int = 2) -> Dict[str, Any]:
+    entry = _get_term_entry(term_code, ttl_hours=ttl_hours)
+    key = (tuple(statuses), college_prefix)
+    with _cache_lock:
+        version, count, revision = entry.write_version, len(entry.rows), entry.revision
+        body = entry.encoded_view(key)
+        if body is not None:
+            _cache_stats["encoded_hits"] += 1
+            return {"version": version, "count": count, "body": body}
+        fields, rows = entry.query_rows(statuses, college_prefix)
+    with timed("course_encode_seconds", view="course_list"):
+        body = encode_json(_unpack_rows(fields, rows))
+    with _cache_lock:
+        entry.store_encoded_view(key, revision, body)
+    return {"version": version, "count": count, "body": body}
+
+# Build the term's search index from a copy of its rows taken under the lock,
+# so searches don't block other cache users while it's built. If the snapshot
+# keeps changing underneath, the last attempt builds under the lock.
+SEARCH_BUILD_ATTEMPTS = 3
+
+# With `base` (the index of the snapshot these rows replaced) only courses
+# that are new or whose searchable fields changed are tokenized; the rest keep
+# their tokens under their new row positions.
+def _build_search_index(rows: List[Tuple[Any, ...]], field_pos: Dict[str, int],
+                        base: Optional[SearchIndexBase] = None) -> CourseSearchIndex:
+    def getter(row: Tuple[Any, ...]):
+        def get(field: str) -> Any:
+            pos = field_pos.get(field)
+            return row[pos] if pos is not None and pos < len(row) else None
+        return get
+
+    fresh: Iterable[int] = range(len(rows))
+    index = CourseSearchIndex()
+    if base is not None and "_id" in base.field_pos and "_id" in field_pos:
+        old_id, new_id = base.field_pos["_id"], field_pos["_id"]
+        old_source, new_source = _row_reader(base.field_pos), _row_reader(field_pos)
+        old_positions = {row[old_id]: i for i, row in enumerate(base.rows)}
+        moved = [-1] * len(base.rows)
+        fresh = []
+        for i, row in enumerate(rows):
+            old_i = old_positions.get(row[new_id])
+            if old_i is not None and old_source(base.rows[old_i]) == new_source(row):
+                moved[old_i] = i
+            else:
+                fresh.append(i)
+        index = base.index.carried(moved)
+    for i in fresh:
+        index.add(i, _course_search_tokens(getter(rows[i])))
+    return index
+
+# Row -> its SEARCH_SOURCE_FIELDS values (None where a row has no such field)
+def _row_reader(field_pos: Dict[str, int]) -> Callable[[Tuple[Any, ...]], Tuple[Any, ...]]:
+    positions = [field_pos.get(f) for f in SEARCH_SOURCE_FIELDS]
+    if None not in positions:
+        width = max(positions) + 1
+        take = operator.itemgetter(*positions)
+    else:
+        width, take = -1, None
+
+    def read(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        if len(row) >= width and take is not None:
+            return take(row)
+        return tuple(row[p] if p is not None and p < len(row) else None for p in positions)
+    return read
+
+def _ensure_search_index(entry: CourseCacheEntry, base: Optional[SearchIndexBase] = None) -> None:
+    for attempt in range(SEARCH_BUILD_ATTEMPTS):
+        with _cache_lock:
+            if entry.search_index is not None:
+                return
+            revision, rows, field_pos = entry.revision, list(entry.rows), dict(entry.field_pos)
+            if attempt == SEARCH_BUILD_ATTEMPTS - 1:
+                entry.search_index = _build_search_index(rows, field_pos, base)
+                entry.size_bytes += entry.search_index.measure()
+                return
+        with timed("course_refresh_stage_seconds", stage="search_index"):
+            index = _build_search_index(rows, field_pos, base)
+        with _cache_lock:
+            if entry.revision == revision and entry.search_index is None:
+                entry.search_index = index
+                entry.size_bytes += index.measure()
+                return
+
+SEARCH_PAGE_SIZE_MAX = 200
+
+# Ranked, paginated search of the cached term (see CourseSearchIndex). Only
+# rows with one of `statuses` are returned when given; ties keep snapshot
+# order (college_code, trans_subj, trans_numb as loaded from Mongo).
+def search_courses_for_term(term_code: str, query: str, statuses: Optional[List[str]] = None,
+                            page: int = 1, page_size: int = 50, ttl_hours: int = 2) -> Dict[str, Any]:
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), SEARCH_PAGE_SIZE_MAX)
+    words = list(dict.fromkeys(_search_words(query)))[:SEARCH_MAX_TERMS]
+    result: Dict[str, Any] = {"query": query, "total": 0, "page": page, "page_size": page_size, "results": []}
+    entry = _get_term_entry(term_code, ttl_hours=ttl_hours)
+    if not words:
+        return result
+    _ensure_search_index(entry)
+
+    with timed("course_search_seconds"), _cache_lock:
+        index = entry.search_index
+        if index is None:
+            index = entry.search_index = _build_search_index(list(entry.rows), dict(entry.field_pos))
+        scores = index.search(words)
+        candidates = list(scores)
+        if statuses:
+            candidates = [i for i in candidates if entry._value(entry.rows[i], "status") in statuses]
+
+        # by score, then snapshot order; only the rows up to this page are ranked
+        ranked = heapq.nsmallest(page * page_size, candidates, key=lambda i: (-scores[i], i))
+        top = ranked[(page - 1) * page_size:]
+        fields = tuple(entry.fields)
+        hits = [(entry.rows[i], scores[i]) for i in top]
+
+    result["total"] = len(candidates)
+    result["results"] = [{**CourseCacheEntry.unpack(fields, row), "score": score} for row, score in hits]
+    return result
+
+# Cache pre-warming. Active terms are the configured ones (COURSE_WARM_TERMS,
+# comma separated) plus terms users asked for recently. Every interval (with
+# jitter, so workers don't line up) each active term whose snapshot is missing
+# or expires within WARM_AHEAD_SECONDS is refreshed in the background, so
+# requests keep hitting a warm cache.
+WARM_TERMS = [t.strip() for t in os.environ.get("COURSE_WARM_TERMS", "").split(",") if t.strip()]
+WARM_INTERVAL_SECONDS = 10 * 60
+WARM_JITTER_SECONDS = 60
+WARM_AHEAD_SECONDS = 20 * 60
+WARM_CONCURRENCY = 2
+WARM_RECENT_SECONDS = 3 * 24 * 60 * 60
+WARM_MAX_RECENT_TERMS = 6
+WARM_TTL_HOURS = 2
+
+# term_code -> last request time (guarded by _cache_lock)
+_recent_terms: Dict[str, float] = {}
+
+def active_terms() -> List[str]:
+    cutoff = time.time() - WARM_RECENT_SECONDS
+    with _cache_lock:
+        for term in [t for t, seen in _recent_terms.items() if seen < cutoff]:
+            del _recent_terms[term]
+        recent = sorted(_recent_terms, key=_recent_terms.get, reverse=True)[:WARM_MAX_RECENT_TERMS]
+    return list(dict.fromkeys(WARM_TERMS + recent))
+
+# Claim and run a refresh for the term if it needs one; returns what happened
+def _warm_term(term_code: str, ttl_hours: float) -> str:
+    ahead_ttl = max(ttl_hours - WARM_AHEAD_SECONDS / 3600.0, 0)
+    with _cache_lock:
+        entry = _course_cache.get(term_code)
+        if entry is None:
+            entry = CourseCacheEntry()
+            _course_cache[term_code] = entry
+            _course_cache.move_to_end(term_code, last=False)
+        if entry.has_data() and not entry.is_expired(hours=ahead_ttl):
+            return "fresh"
+        if not _claim_refresh(entry):
+            return "skipped"
+    _run_refresh(term_code, entry, ahead_ttl)
+    with _cache_lock:
+        return "failed" if entry.last_error is not None else "refreshed"
+
+def warm_terms(terms: Optional[List[str]] = None, ttl_hours: float = WARM_TTL_HOURS,
+               concurrency: int = WARM_CONCURRENCY, jitter_seconds: float = 0.0) -> Dict[str, str]:
+    terms = active_terms() if terms is None else terms
+    results: Dict[str, str] = {}
+    if not terms:
+        return results
+
+    def run(term_code: str) -> None:
+        if jitter_seconds:
+            time.sleep(random.uniform(0, jitter_seconds))
+        try:
+            results[term_code] = _warm_term(term_code, ttl_hours)
+        except Exception as e:
+            uvicornLogger.exception(e)
+            results[term_code] = "failed"
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="course-warm") as pool:
+        list(pool.map(run, terms))
+    return results
+
+REFRESH_TERMS_CONCURRENCY = 3
+
+# Refresh several terms now (e.g. prior, current and next at rollover) on a
+# bounded pool, ignoring the TTL and any failure backoff. A term that is
+# already being refreshed is waited for rather than refreshed twice. Each
+# term's Oracle sync is itself split into ORACLE_SYNC_PARTITIONS ranges.
+# on_term, if given, is called with each term's report as it finishes.
+def refresh_terms(term_codes: List[str], concurrency: int = REFRESH_TERMS_CONCURRENCY,
+                  on_term: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+    reports: Dict[str, Dict[str, Any]] = {}
+
+    def run(term_code: str) -> None:
+        started = time.perf_counter()
+        with _cache_lock:
+            entry = _course_cache.get(term_code)
+            if entry is None:
+                entry = CourseCacheEntry()
+                _course_cache[term_code] = entry
+            if not entry.refreshing:
+                entry.retry_at = 0.0
+            claimed = _claim_refresh(entry)
+        if claimed:
+            _run_refresh(term_code, entry, ttl_hours=0)
+        else:
+            entry.refresh_done.wait()
+        with _cache_lock:
+            error = entry.last_error
+            rows = len(entry.rows)
+        reports[term_code] = {
+            "status": "failed" if error is not None else ("refreshed" if claimed else "joined"),
+            "seconds": round(time.perf_counter() - started, 3),
+            "rows": rows,
+            "sync": dict(_sync_reports[term_code]) if claimed and term_code in _sync_reports else None,
+            "error": str(error) if error is not None else None,
+        }
+        if on_term is not None:
+            on_term(term_code, reports[term_code])
+
+    terms = list(dict.fromkeys(term_codes))
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(terms) or 1)), thread_name_prefix="course-refresh") as pool:
+        list(pool.map(run, terms))
+    return {term: reports[term] for term in terms}
+
+# Term refreshes requested over HTTP run as background jobs, stored in
+# REFRESH_JOB_COLLECTION (_id = job_id) like bulk send jobs so a status poll
+# can land on any worker; each term's report is written as it finishes. A
+# worker runs at most REFRESH_JOBS_CONCURRENCY jobs at once, later ones wait
+# as pending, and it takes no more than REFRESH_JOBS_MAX_ACTIVE (running or
+# pending) at a time.
+REFRESH_JOBS_CONCURRENCY = 1
+REFRESH_JOBS_MAX_ACTIVE = 4
+
+_refresh_job_slots = threading.BoundedSemaphore(REFRESH_JOBS_CONCURRENCY)
+_refresh_jobs_lock = threading.Lock()
+_refresh_jobs_active = 0
+
+class RefreshJobsBusy(Exception):
+    pass
+
+# Apply progress (and a finished term's report) to the job dict and its
+# stored copy; as with send jobs a failed progress write is only logged
+def _update_refresh_job(job: Dict[str, Any], term_report: Optional[Tuple[str, Dict[str, Any]]] = None,
+                        **fields: Any) -> None:
+    fields["updated_at"] = datetime.utcnow()
+    job.update(fields)
+    update = dict(fields)
+    if term_report is not None:
+        term_code, report = term_report
+        job["terms"][term_code] = report
+        update[f"terms.{term_code}"] = report
+    try:
+        db_collection(REFRESH_JOB_COLLECTION).update_one({"_id": job["job_id"]}, {"$set": update})
+    except Exception as e:
+        uvicornLogger.warning(f"refresh job {job['job_id']} progress: {e}")
+
+def _run_refresh_job(job: Dict[str, Any]) -> None:
+    global _refresh_jobs_active
+    try:
+        with _refresh_job_slots:
+            _update_refresh_job(job, status="running")
+            reports = refresh_terms(
+                job["term_codes"],
+                on_term=lambda term_code, report: _update_refresh_job(job, term_report=(term_code, report)),
+            )
+            failed = any(r["status"] == "failed" for r in reports.values())
+            _update_refresh_job(job, terms=reports, status="failed" if failed else "done",
+                                finished_at=datetime.utcnow())
+    except Exception as e:
+        uvicornLogger.exception(e)
+        _update_refresh_job(job, status="failed", error=str(e), finished_at=datetime.utcnow())
+    finally:
+        with _refresh_jobs_lock:
+            _refresh_jobs_active -= 1
+
+# Start refreshing the terms in the background; poll get_refresh_job for
+# progress. Raises RefreshJobsBusy when this worker has too many jobs already.
+def start_refresh_job(term_codes: List[str]) -> Dict[str, Any]:
+    global _refresh_jobs_active
+    terms = list(dict.fromkeys(term_codes))
+    with _refresh_jobs_lock:
+        if _refresh_jobs_active >= REFRESH_JOBS_MAX_ACTIVE:
+            raise RefreshJobsBusy(f"{_refresh_jobs_active} refresh jobs are already running or waiting")
+        _refresh_jobs_active += 1
+    now = datetime.utcnow()
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "term_codes": terms,
+        "status": "pending",
+        "terms": {term: None for term in terms},
+        "error": None,
+        "started_at": now,
+        "updated_at": now,
+        "finished_at": None,
+    }
+    try:
+        db_collection(REFRESH_JOB_COLLECTION).insert_one({"_id": job["job_id"], **job})
+    except Exception:
+        with _refresh_jobs_lock:
+            _refresh_jobs_active -= 1
+        raise
+    snapshot = dict(job, terms=dict(job["terms"]))
+    threading.Thread(target=_run_refresh_job, args=(job,), name=f"course-refresh-job-{job['job_id'][:8]}", daemon=True).start()
+    return snapshot
+
+def get_refresh_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return db_collection(REFRESH_JOB_COLLECTION).find_one({"_id": job_id}, {"_id": 0})
+
+class CacheWarmer:
+    def __init__(self, interval_seconds: float = WARM_INTERVAL_SECONDS, jitter_seconds: float = WARM_JITTER_SECONDS) -> None:
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_run: Dict[str, str] = {}
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="course-cache-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        # first pass right away (spread across workers by jitter), then on a schedule
+        delay = random.uniform(0, self.jitter_seconds)
+        while not self._stop.wait(delay):
+            try:
+                self.last_run = warm_terms(jitter_seconds=min(self.jitter_seconds, 5))
+                if self.last_run:
+                    uvicornLogger.info(f"course cache warm: {self.last_run}")
+            except Exception as e:
+                uvicornLogger.exception(e)
+            delay = self.interval_seconds + random.uniform(-self.jitter_seconds, self.jitter_seconds)
+
+_cache_warmer = CacheWarmer()
+
+def start_cache_warmer() -> None:
+    _cache_warmer.start()
+
+def stop_cache_warmer() -> None:
+    _cache_warmer.stop(timeout=5)
+
+# Write-through hooks, called once a write has landed in Mongo: the change is
+# applied to this worker's snapshot right away and the term's write counter is
+# bumped so the other workers pull it in on their next read.
+def _apply_cached_update(term_code: str, course_id: Any, fields: Dict[str, Any],
+                         expected: Optional[Dict[str, Any]] = None) -> None:
+    with _cache_lock:
+        entry = _course_cache.get(term_code)
+        if entry is not None and (not expected or entry.matches(str(course_id), expected)):
+            entry.update_doc(str(course_id), fields)
+
+def _apply_cached_add(doc: Dict[str, Any]) -> None:
+    with _cache_lock:
+        entry = _course_cache.get(doc.get("term_code"))
+        if entry is not None:
+            entry.add_doc({**doc, "_id": str(doc["_id"])})
+
+# Called after a synchronous course write made with course_write_fields:
+# sequences it and applies it to the cached term. A backfill still pending for
+# the course was computed from the old document and is dropped.
+def update_cached_course(term_code: str, course_id: Any, fields: Dict[str, Any]) -> None:
+    _course_write_behind.discard(course_id)
+    if "seq_pending" not in fields:
+        _apply_cached_update(term_code, course_id, fields)
+        _bump_term_version(term_code)
+        return
+    seq = _sequence_term_writes(term_code, fields["seq_pending"])
+    _apply_cached_update(term_code, course_id, _sequenced(fields, seq))
+
+def add_cached_course(doc: Dict[str, Any]) -> None:
+    if "seq_pending" not in doc:
+        _apply_cached_add(doc)
+        _bump_term_version(doc.get("term_code"))
+        return
+    seq = _sequence_term_writes(doc.get("term_code"), doc["seq_pending"])
+    _apply_cached_add(_sequenced(doc, seq))
+
+def course_cache_stats() -> Dict[str, int]:
+    with _cache_lock:
+        return dict(_cache_stats)
+
+# Per-term size of the course cache, most recently used last
+def course_cache_memory() -> Dict[str, Dict[str, Any]]:
+    with _cache_lock:
+        return {
+            term: {
+                "rows": len(entry.rows),
+                "bytes": entry.size_bytes,
+                "last_access": entry.last_access,
+                "cached_at": entry.cache_timestamp,
+            }
+            for term, entry in _course_cache.items()
+        }
+
+# Write-behind buffer for course backfills done on read paths (evaluator
+# names, assignment fields). Updates are applied to the cached snapshot right
+# away, merged per course id, and written to Mongo by a background thread as
+# unordered bulk_write batches every WRITE_BEHIND_FLUSH_SECONDS (sooner once
+# WRITE_BEHIND_BATCH_SIZE are pending). Batches that fail are put back unless
+# a newer update for the course arrived meanwhile.
+#
+# A backfill carries the field values it was computed from (`expected`) and is
+# only written while the course still has them, so it can't overwrite an
+# evaluator change or assignment that landed first. Synchronous writers also
+# discard the course's pending backfill.
+WRITE_BEHIND_FLUSH_SECONDS = 2.0
+WRITE_BEHIND_BATCH_SIZE = 500
+WRITE_BEHIND_MAX_PENDING = 50000
+
+# Mongo filter for `expected` field values; None matches a missing, null or
+# empty field, like the truthiness checks the read paths make
+def _expected_filter(expected: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {field: {"$in": [None, ""]} if value is None else value for field, value in (expected or {}).items()}
+
+class CourseWriteBehind:
+    def __init__(self, flush_seconds: float = WRITE_BEHIND_FLUSH_SECONDS, batch_size: int = WRITE_BEHIND_BATCH_SIZE) -> None:
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        # str(course id) -> {"_id", "term_code", "fields", "expected"}
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # serialises flushes (background thread vs shutdown)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats: Dict[str, int] = {"queued": 0, "coalesced": 0, "written": 0, "batches": 0, "failures": 0,
+                                       "dropped": 0, "discarded": 0, "skipped": 0}
+
+    # Merge `update` into what's pending for its course. Backfills computed
+    # from the same field values coalesce; otherwise the newer one replaces
+    # the older (it was computed from a later read). Caller holds _lock.
+    def _merge_pending(self, key: str, update: Dict[str, Any], newer: bool = True) -> bool:
+        current = self._pending.get(key)
+        if current is None:
+            self._pending[key] = update
+            return False
+        if current["expected"] == update["expected"]:
+            if newer:
+                current["fields"].update(update["fields"])
+            else:
+                current["fields"] = {**update["fields"], **current["fields"]}
+            return True
+        if newer:
+            self._pending[key] = update
+        return False
+
+    def queue(self, course_id: Any, fields: Dict[str, Any], term_code: Optional[str] = None,
+              expected: Optional[Dict[str, Any]] = None) -> None:
+        # stamped now so the cached row and the eventual write agree
+        fields = {**fields, "updated_at": datetime.utcnow()}
+        if term_code is not None:
+            _apply_cached_update(term_code, course_id, fields, expected)
+        update = {"_id": course_id, "term_code": term_code, "fields": fields, "expected": dict(expected or {})}
+        with self._lock:
+            self._stats["queued"] += 1
+            if self._merge_pending(str(course_id), update):
+                self._stats["coalesced"] += 1
+            while len(self._pending) > WRITE_BEHIND_MAX_PENDING:
+                dropped, _ = self._pending.popitem(last=False)
+                self._stats["dropped"] += 1
+                uvicornLogger.warning(f"course write-behind full, dropped backfill for {dropped}")
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+        self._ensure_started()
+
+    # Drop the course's pending backfill (a synchronous write superseded it)
+    def discard(self, course_id: Any) -> None:
+        with self._lock:
+            if self._pending.pop(str(course_id), None) is not None:
+                self._stats["discarded"] += 1
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="course-write-behind", daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                uvicornLogger.exception(e)
+
+    # Write everything pending now; returns the number of courses written
+    def flush(self) -> int:
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = []
+                    while self._pending and len(batch) < self.batch_size:
+                        batch.append(self._pending.popitem(last=False))
+                if not batch:
+                    return written
+                token = course_write_fields({})["seq_pending"]
+                try:
+                    result = db_collection("course").bulk_write(
+                        [UpdateOne({"_id": update["_id"], **_expected_filter(update["expected"])},
+                                   {"$set": {**update["fields"], **({"seq_pending": token} if update["term_code"] else {})}})
+                         for _, update in batch],
+                        ordered=False,
+                    )
+                except Exception as e:
+                    uvicornLogger.warning(f"course write-behind flush of {len(batch)} updates: {e}")
+                    with self._lock:
+                        self._stats["failures"] += 1
+                        for key, update in batch:
+                            self._merge_pending(key, update, newer=False)
+                    return written
+                for term_code in {update["term_code"] for _, update in batch}:
+                    _sequence_term_writes(term_code, token)
+                written += result.matched_count
+                with self._lock:
+                    self._stats["written"] += result.matched_count
+                    # the course changed since the backfill was computed
+                    self._stats["skipped"] += len(batch) - result.matched_count
+                    self._stats["batches"] += 1
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending)}
+
+_course_write_behind = CourseWriteBehind()
+
+def queue_course_update(course_id: Any, fields: Dict[str, Any], term_code: Optional[str] = None,
+                        expected: Optional[Dict[str, Any]] = None) -> None:
+    _course_write_behind.queue(course_id, fields, term_code, expected)
+
+def flush_course_updates() -> int:
+    return _course_write_behind.flush()
+
+def stop_course_write_behind() -> None:
+    _course_write_behind.stop(timeout=5)
+
+def course_write_behind_stats() -> Dict[str, int]:
+    return _course_write_behind.get_stats()
+
+# Shared evaluator directory cache in front of the department lookups. Names
+# for many ids are fetched with one get_evaluator_name call; ids another
+# request is already fetching are waited on instead of fetched again.
+EVALUATOR_CACHE_TTL_SECONDS = 15 * 60
+
+# Fields a get_evaluator_name result may carry its evaluator id in
+EVALUATOR_NAME_ID_FIELDS = ("evaluator_id", "id")
+
+def _evaluator_name_id(name: Any) -> Optional[str]:
+    if isinstance(name, dict):
+        for field in EVALUATOR_NAME_ID_FIELDS:
+            for key in (field, field.upper()):
+                if name.get(key) is not None:
+                    return str(name[key])
+    return None
+
+class EvaluatorDirectory:
+    def __init__(self, ttl_seconds: int = EVALUATOR_CACHE_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # evaluator id -> (value, expires_at)
+        self._names: Dict[str, Any] = {}
+        self._depts: Dict[str, Any] = {}
+        self._in_flight: Dict[Any, threading.Event] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "backend_queries": 0}
+
+    def _get(self, store: Dict[str, Any], key: str, now: float):
+        cached = store.get(key)
+        if cached is not None and cached[1] > now:
+            return True, cached[0]
+        return False, None
+
+    def names(self, evaluator_ids: List[Any]) -> List[Any]:
+        if evaluator_ids and not isinstance(evaluator_ids, (list, tuple)):
+            evaluator_ids = [evaluator_ids]
+        ids = [str(e) for e in evaluator_ids or []]
+        while True:
+            now = time.monotonic()
+            to_fetch: List[str] = []
+            waits: List[threading.Event] = []
+            with self._lock:
+                for e in dict.fromkeys(ids):
+                    found, _ = self._get(self._names, e, now)
+                    if found:
+                        continue
+                    if ("name", e) in self._in_flight:
+                        waits.append(self._in_flight[("name", e)])
+                        continue
+                    done = threading.Event()
+                    self._in_flight[("name", e)] = done
+                    to_fetch.append(e)
+            if to_fetch:
+                self._fetch_names(to_fetch)
+            for done in waits:
+                done.wait()
+            with self._lock:
+                now = time.monotonic()
+                results = [self._get(self._names, e, now) for e in ids]
+                if all(found for found, _ in results):
+                    hits = len(ids) - len(to_fetch)
+                    self.stats["hits"] += hits
+                    self.stats["misses"] += len(to_fetch)
+                    return [name for _, name in results if name is not None]
+            # a concurrent fetch failed; retry for whatever is still missing
+
+    # Names are matched to ids by the id each result carries. Plain names
+    # (no id) can't be told apart once there's more than one, since the
+    # helper may reorder or drop them, so then each id is resolved on its own.
+    def _fetch_names(self, evaluator_ids: List[str]) -> None:
+        try:
+            with self._lock:
+                self.stats["backend_queries"] += 1
+            names = department.get_evaluator_name(evaluator_ids) or []
+            name_ids = [_evaluator_name_id(name) for name in names]
+            if len(evaluator_ids) == 1:
+                by_id = {evaluator_ids[0]: names[0] if names else None}
+            elif None not in name_ids:
+                by_id = dict(zip(name_ids, names))
+            else:
+                by_id = {}
+                for e in evaluator_ids:
+                    with self._lock:
+                        self.stats["backend_queries"] += 1
+                    one = department.get_evaluator_name([e]) or []
+                    by_id[e] = one[0] if one else None
+            expires_at = time.monotonic() + self.ttl_seconds
+            with self._lock:
+                for e in evaluator_ids:
+                    self._names[e] = (by_id.get(e), expires_at)
+        finally:
+            with self._lock:
+                for e in evaluator_ids:
+                    done = self._in_flight.pop(("name", e), None)
+                    if done is not None:
+                        done.set()
+
+    def dept(self, evaluator_id: Any) -> List[Dict[str, Any]]:
+        key = str(evaluator_id)
+        while True:
+            with self._lock:
+                found, value = self._get(self._depts, key, time.monotonic())
+                if found:
+                    self.stats["hits"] += 1
+                    return value
+                done = self._in_flight.get(("dept", key))
+                owner = done is None
+                if owner:
+                    done = threading.Event()
+                    self._in_flight[("dept", key)] = done
+            if not owner:
+                done.wait()
+                continue
+            try:
+                with self._lock:
+                    self.stats["misses"] += 1
+                    self.stats["backend_queries"] += 1
+                value = department.dept_for_evaluator(evaluator_id) or []
+                with self._lock:
+                    self._depts[key] = (value, time.monotonic() + self.ttl_seconds)
+                return value
+            finally:
+                with self._lock:
+                    self._in_flight.pop(("dept", key), None)
+                done.set()
+
+    def invalidate(self, evaluator_ids: Optional[List[Any]] = None) -> None:
+        with self._lock:
+            if evaluator_ids is None:
+                self._names.clear()
+                self._depts.clear()
+                return
+            for e in evaluator_ids:
+                self._names.pop(str(e), None)
+                self._depts.pop(str(e), None)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "names_cached": len(self._names), "depts_cached": len(self._depts)}
+
+_evaluator_directory = EvaluatorDirectory()
+
+def evaluator_names(evaluator_ids: List[Any]) -> List[Any]:
+    return _evaluator_directory.names(evaluator_ids)
+
+def evaluator_dept(evaluator_id: Any) -> List[Dict[str, Any]]:
+    return _evaluator_directory.dept(evaluator_id)
+
+def invalidate_evaluators(evaluator_ids: Optional[List[Any]] = None) -> None:
+    _evaluator_directory.invalidate(evaluator_ids)
+
+def evaluator_cache_stats() -> Dict[str, int]:
+    return _evaluator_directory.get_stats()
+
+# Process-local departmentconfig index keyed by transfer_course. The
+# collection is small and rarely edited, so it is loaded once (projected fields
+# only) and re-checked against a cheap fingerprint: count, newest _id and a
+# version document that department_configs_changed() bumps. In-place edits
+# made without calling it are picked up by the periodic full reload.
+DEPT_CONFIG_FIELDS = ["evaluator", "coll_code", "coll_desc", "dept_code", "dept_desc"]
+DEPT_CONFIG_CHECK_SECONDS = 5
+DEPT_CONFIG_MAX_AGE_SECONDS = 60
+DEPT_CONFIG_VERSION_KEY = "departmentconfig"
+DEPT_CONFIG_MAX_ENTRIES = 20000
+
+class DepartmentConfigIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._fingerprint: Any = None
+        self._loaded_at: float = 0.0
+        self._checked_at: float = 0.0
+        # False when the collection outgrew DEPT_CONFIG_MAX_ENTRIES
+        self._complete: bool = True
+
+    def _current_fingerprint(self, col) -> Any:
+        newest_id = col.find_one({}, {"_id": 1}, sort=[("_id", -1)]) or {}
+        return (col.estimated_document_count(), newest_id.get("_id"), _read_cache_version(DEPT_CONFIG_VERSION_KEY))
+
+    def _load(self, col) -> None:
+        fingerprint = self._current_fingerprint(col)
+        configs: Dict[str, Dict[str, Any]] = {}
+        complete = True
+        projection = {"_id": 0, "transfer_course": 1, **{f: 1 for f in DEPT_CONFIG_FIELDS}}
+        for cfg in col.find({}, projection):
+            subj = cfg.pop("transfer_course", None)
+            if subj is None or subj in configs:
+                continue
+            if len(configs) >= DEPT_CONFIG_MAX_ENTRIES:
+                complete = False
+                break
+            configs[subj] = cfg
+        if not complete:
+            uvicornLogger.warning(f"departmentconfig index truncated at {DEPT_CONFIG_MAX_ENTRIES} entries")
+        now = time.monotonic()
+        with self._lock:
+            self._configs = configs
+            self._fingerprint = fingerprint
+            self._complete = complete
+            self._loaded_at = now
+            self._checked_at = now
+
+    def _ensure_current(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._loaded_at and now - self._checked_at < DEPT_CONFIG_CHECK_SECONDS:
+                return
+            self._checked_at = now
+            loaded_at, fingerprint = self._loaded_at, self._fingerprint
+        col = db_collection("departmentconfig")
+        if not loaded_at or now - loaded_at > DEPT_CONFIG_MAX_AGE_SECONDS \
+                or self._current_fingerprint(col) != fingerprint:
+            self._load(col)
+
+    def get(self, trans_subj: Any) -> Optional[Dict[str, Any]]:
+        self._ensure_current()
+        with self._lock:
+            cfg = self._configs.get(trans_subj)
+            complete = self._complete
+        if cfg is not None:
+            return dict(cfg)
+        if complete:
+            return None
+        return db_collection("departmentconfig").find_one(
+            {"transfer_course": trans_subj}, {"_id": 0, **{f: 1 for f in DEPT_CONFIG_FIELDS}}
+        )
+
+    def reload(self) -> None:
+        self._load(db_collection("departmentconfig"))
+
+_dept_config_index = DepartmentConfigIndex()
+
+# departmentconfig fields for a transfer subject, or None if not configured
+def get_dept_config(trans_subj: Any) -> Optional[Dict[str, Any]]:
+    return _dept_config_index.get(trans_subj)
+
+def get_dept_configs(trans_subjs: List[Any]) -> Dict[Any, Dict[str, Any]]:
+    configs: Dict[Any, Dict[str, Any]] = {}
+    for subj in dict.fromkeys(trans_subjs):
+        cfg = get_dept_config(subj)
+        if cfg is not None:
+            configs[subj] = cfg
+    return configs
 
-    entry = _course_cache.get(term_code)
-    if entry is None or entry.is_expired(hours=ttl_hours):
-        return _refresh_and_cache_term(term_code)
-    return entry.data
+# Hook for whatever edits departmentconfig (admin screens, scripts): bumps the
+# shared version so every worker reloads within DEPT_CONFIG_CHECK_SECONDS, and
+# reloads this one now
+def department_configs_changed() -> None:
+    _bump_cache_version(DEPT_CONFIG_VERSION_KEY)
+    _dept_config_index.reload()
+
+# Term-wide "send to evaluators". Same rules as the single PATCH send route:
+# courses that already have evaluators only move to SE, the rest get their
+# evaluator fields from the departmentconfig of their trans_subj. Configs are
+# resolved once per subject and writes go out in unordered bulk_write batches.
+# Courses that can't be resolved are reported and skipped.
+BULK_SEND_STATUSES = ["RF", "RT"]
+BULK_SEND_BATCH_SIZE = 500
+
+# Jobs are kept in SEND_JOB_COLLECTION (_id = job_id) so a status poll can
+# land on any worker; the worker running a job writes its progress after
+# every batch. Jobs expire BULK_SEND_JOB_TTL_SECONDS after they start, and at
+# most BULK_SEND_FAILURES_KEPT failures are stored per job (the failed count
+# stays exact).
+BULK_SEND_FAILURES_KEPT = 1000
+
+def _new_send_job(term_code: str, college_code: Optional[str], trans_subj: Optional[str]) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
+        "job_id": uuid.uuid4().hex,
+        "term_code": term_code,
+        "college_code": college_code,
+        "trans_subj": trans_subj,
+        "status": "pending",
+        "total": 0,
+        "processed": 0,
+        "sent": 0,
+        "missing": 0,
+        "failed": 0,
+        "failures": [],
+        "error": None,
+        "started_at": now,
+        "updated_at": now,
+        "finished_at": None,
+    }
+
+def _insert_send_job(job: Dict[str, Any]) -> None:
+    db_collection(SEND_JOB_COLLECTION).insert_one({"_id": job["job_id"], **job})
+
+# Apply progress to the job dict and its stored copy. A failed progress write
+# is logged; the job itself carries on.
+def _update_send_job(job: Dict[str, Any], inc: Optional[Dict[str, int]] = None,
+                     failures: Optional[List[Dict[str, Any]]] = None, **fields: Any) -> None:
+    fields["updated_at"] = datetime.utcnow()
+    job.update(fields)
+    update: Dict[str, Any] = {"$set": fields}
+    if inc:
+        for k, v in inc.items():
+            job[k] += v
+        update["$inc"] = inc
+    if failures:
+        job["failures"] = (job["failures"] + failures)[:BULK_SEND_FAILURES_KEPT]
+        update["$push"] = {"failures": {"$each": failures, "$slice": BULK_SEND_FAILURES_KEPT}}
+    try:
+        db_collection(SEND_JOB_COLLECTION).update_one({"_id": job["job_id"]}, update)
+    except Exception as e:
+        uvicornLogger.warning(f"bulk send job {job['job_id']} progress: {e}")
+
+def _resolve_send_fields(dept_config: Optional[Dict[str, Any]], trans_subj: Any) -> Dict[str, Any]:
+    if not dept_config:
+        raise ValueError(f"No department configuration found for subject: {trans_subj}. Please add in Department Config")
+    evaluators = dept_config.get("evaluator", [])
+    if not evaluators:
+        raise ValueError(f"No evaluators found for subject: {trans_subj}")
+    names = evaluator_names(evaluators) or []
+    matched = [str(e) for e in (evaluators if isinstance(evaluators, list) else [evaluators])]
+    return {
+        "evaluators": matched,
+        "assigned_evaluator": matched[0] if matched else None,
+        "assigned_coll_code": dept_config.get("coll_code"),
+        "assigned_coll_desc": dept_config.get("coll_desc"),
+        "assigned_dept_code": dept_config.get("dept_code"),
+        "assigned_dept_desc": dept_config.get("dept_desc"),
+        "evaluators_names": names,
+    }
+
+def bulk_send_to_evaluators(term_code: str, college_code: Optional[str] = None,
+                            trans_subj: Optional[str] = None,
+                            job: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if job is None:
+        job = _new_send_job(term_code, college_code, trans_subj)
+        _insert_send_job(job)
+    _update_send_job(job, status="running")
+
+    col = db_collection("course")
+    query: Dict[str, Any] = {"term_code": term_code, "status": {"$in": BULK_SEND_STATUSES}}
+    if college_code:
+        query["college_code"] = college_code
+    if trans_subj:
+        query["trans_subj"] = trans_subj
+    courses = list(col.find(query, {"_id": 1, "trans_subj": 1, "evaluators": 1, "assigned_evaluator": 1}))
+    _update_send_job(job, total=len(courses))
+
+    # departmentconfig for each distinct subject, from the in-memory index
+    subjects = list({c.get("trans_subj") for c in courses
+                     if not (c.get("evaluators") and c.get("assigned_evaluator"))})
+    dept_configs = get_dept_configs(subjects)
+
+    resolved: Dict[Any, Any] = {}
+    for subj in subjects:
+        try:
+            resolved[subj] = _resolve_send_fields(dept_configs.get(subj), subj)
+        except Exception as e:
+            resolved[subj] = e
+
+    for start in range(0, len(courses), BULK_SEND_BATCH_SIZE):
+        batch = courses[start:start + BULK_SEND_BATCH_SIZE]
+        ops: List[UpdateOne] = []
+        batch_updates: List[Any] = []
+        failures: List[Dict[str, Any]] = []
+        # one write token per batch, sequenced once it has landed
+        sent_fields = course_write_fields({"status": "SE"})
+
+        for c in batch:
+            if c.get("evaluators") and c.get("assigned_evaluator"):
+                fields: Dict[str, Any] = dict(sent_fields)
+            else:
+                assigned = resolved.get(c.get("trans_subj"))
+                if isinstance(assigned, Exception):
+                    failures.append({"course_id": str(c["_id"]), "trans_subj": c.get("trans_subj"), "error": str(assigned)})
+                    continue
+                fields = {**sent_fields, **assigned}
+            ops.append(UpdateOne({"_id": c["_id"]}, {"$set": fields}))
+            batch_updates.append((str(c["_id"]), fields))
+
+        # sent = courses the server matched; an update that matched nothing
+        # (course deleted since it was listed) counts as missing
+        sent = missing = 0
+        if ops:
+            errors: Dict[int, Dict[str, Any]] = {}
+            try:
+                result = col.bulk_write(ops, ordered=False)
+                sent = result.matched_count
+            except BulkWriteError as e:
+                uvicornLogger.warning(f"bulk send {job['job_id']}: {len(e.details.get('writeErrors', []))} write errors")
+                sent = e.details.get("nMatched", 0)
+                errors = {err["index"]: err for err in e.details.get("writeErrors", [])}
+            except Exception as e:
+                uvicornLogger.exception(e)
+                errors = {i: {"errmsg": str(e)} for i in range(len(ops))}
+            missing = len(ops) - len(errors) - sent
+            for i, err in sorted(errors.items()):
+                failures.append({"course_id": batch_updates[i][0], "error": err.get("errmsg")})
+            if len(errors) < len(ops):
+                seq = _sequence_term_writes(term_code, sent_fields["seq_pending"])
+                for i, (course_id, fields) in enumerate(batch_updates):
+                    if i not in errors:
+                        _course_write_behind.discard(course_id)
+                        _apply_cached_update(term_code, course_id, _sequenced(fields, seq))
+
+        _update_send_job(job, inc={"processed": len(batch), "sent": sent, "missing": missing, "failed": len(failures)},
+                         failures=failures)
+
+    _update_send_job(job, status="done", finished_at=datetime.utcnow())
+    return job
+
+def _run_send_job(job: Dict[str, Any]) -> None:
+    try:
+        bulk_send_to_evaluators(job["term_code"], job["college_code"], job["trans_subj"], job=job)
+    except Exception as e:
+        uvicornLogger.exception(e)
+        _update_send_job(job, status="failed", error=str(e), finished_at=datetime.utcnow())
+
+# Start a bulk send in the background; poll get_bulk_send_job for progress
+def start_bulk_send_job(term_code: str, college_code: Optional[str] = None,
+                        trans_subj: Optional[str] = None) -> Dict[str, Any]:
+    job = _new_send_job(term_code, college_code, trans_subj)
+    _insert_send_job(job)
+    snapshot = dict(job)
+    threading.Thread(target=_run_send_job, args=(job,), name=f"course-send-{term_code}", daemon=True).start()
+    return snapshot
+
+def get_bulk_send_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return db_collection(SEND_JOB_COLLECTION).find_one({"_id": job_id}, {"_id": 0})
+
+# Oracle session pool sizing and default fetch size for streamed queries
+ORACLE_POOL_MIN = 1
+ORACLE_POOL_MAX = 8
+ORACLE_POOL_INCREMENT = 1
+ORACLE_ARRAYSIZE = 1000
 
 #To do: see if activity date is creating issue
-def course_query(term_code : str) :
-    query = """
+COURSE_QUERY = """
     SELECT DISTINCT
     ....
     """
-    results, error = oradata_query(query, {'term_code' : term_code})
+
+# college_range = (from, to) limits the rows to from <= COLLEGE_CODE < to,
+# either end open when None; used to split a term into parallel partitions
+def _course_query_args(term_code : str, since : Optional[datetime] = None,
+                       college_range : Optional[Tuple[Optional[str], Optional[str]]] = None) :
+    query = COURSE_QUERY
+    bind_args: Dict[str, Any] = {'term_code' : term_code}
+    conditions: List[str] = []
+    if since is not None :
+        conditions.append("ACTIVITY_DATE > :since")
+        bind_args['since'] = since
+    college_from, college_to = college_range or (None, None)
+    if college_from is not None :
+        conditions.append("COLLEGE_CODE >= :college_from")
+        bind_args['college_from'] = college_from
+    if college_to is not None :
+        conditions.append("COLLEGE_CODE < :college_to")
+        bind_args['college_to'] = college_to
+    if conditions :
+        query = f"SELECT * FROM ({COURSE_QUERY}) WHERE {' AND '.join(conditions)}"
+    return query, bind_args
+
+# since=None pulls the whole term; otherwise only rows whose ACTIVITY_DATE is
+# newer than the stored watermark
+def course_query(term_code : str, since : Optional[datetime] = None) :
+    query, bind_args = _course_query_args(term_code, since)
+    results, error = oradata_query(query, bind_args)
     if error is not None :
         raise Exception(error)
     
     return results
+
+# Same rows as course_query, fetched in chunks of `arraysize`
+def course_query_chunks(term_code : str, since : Optional[datetime] = None, arraysize : int = ORACLE_ARRAYSIZE,
+                        college_range : Optional[Tuple[Optional[str], Optional[str]]] = None) -> Iterator[List[Dict[str, Any]]] :
+    query, bind_args = _course_query_args(term_code, since, college_range)
+    try :
+        yield from oradata_stream(query, bind_args, arraysize=arraysize)
+    except (_oracle_driver.Error, _oracle_driver.NotSupportedError) as e :
+        raise Exception(_oracle_error(e))
     
     
+# Oracle session pool shared by oradata_query / oradata_stream. The driver is a
+# module global so a local fake (anything with create_pool/Error) can be swapped
+# in with set_oracle_driver for offline runs.
+_oracle_driver: Any = oracledb
+_oracle_pool: Any = None
+_oracle_pool_lock = threading.Lock()
+
+_pool_stats: Dict[str, float] = {
+    "checkouts": 0,
+    "wait_seconds": 0.0,
+}
+
+def set_oracle_driver(driver: Any) -> None:
+    global _oracle_driver, _oracle_pool
+    with _oracle_pool_lock:
+        if _oracle_pool is not None:
+            try:
+                _oracle_pool.close()
+            except Exception as e:
+                uvicornLogger.warning(f"oracle pool close: {e}")
+        _oracle_driver = driver
+        _oracle_pool = None
+
+def _get_oracle_pool(params = oradata_connection_parameters) :
+    global _oracle_pool
+    with _oracle_pool_lock:
+        if _oracle_pool is None:
+            _oracle_pool = _oracle_driver.create_pool(
+                params=params,
+                min=ORACLE_POOL_MIN,
+                max=ORACLE_POOL_MAX,
+                increment=ORACLE_POOL_INCREMENT,
+            )
+        return _oracle_pool
+
+def _acquire_connection(params = oradata_connection_parameters) :
+    pool = _get_oracle_pool(params)
+    started = time.perf_counter()
+    connection = pool.acquire()
+    with _oracle_pool_lock:
+        _pool_stats["checkouts"] += 1
+        _pool_stats["wait_seconds"] += time.perf_counter() - started
+    return connection
+
+def oracle_pool_stats() -> Dict[str, Any]:
+    with _oracle_pool_lock:
+        stats: Dict[str, Any] = dict(_pool_stats)
+        pool = _oracle_pool
+    stats["pool_opened"] = getattr(pool, "opened", 0) if pool is not None else 0
+    stats["pool_busy"] = getattr(pool, "busy", 0) if pool is not None else 0
+    stats["pool_max"] = ORACLE_POOL_MAX
+    return stats
+
+def _oracle_error(e) :
+    error_obj, = e.args
+    print(error_obj)
+    return {'status' : 'error', 'message' : getattr(error_obj, 'message', str(error_obj))}
+
 #helper function to query oracle database
 def oradata_query(query, bind_args, params = oradata_connection_parameters) :
 
@@ -154,25 +2879,36 @@ def oradata_query(query, bind_args, params = oradata_connection_parameters) :
     error = None
 
     try :
-        with oracledb.connect(params=params) as connection :
-            connection.autocommit = False 
-            with connection.cursor() as cursor:
-                cursor.execute(query, bind_args)
-                
-                # cursor.description will also help identify when an "implied" cursor is used - since straight up select queries return a description, which is used to identify columns and build dicts
-                results_sets = ([cursor], cursor.getimplicitresults())[cursor.description is None]
-
-                for indx, result_set in enumerate(results_sets) :
-                    #build dictionary keys
-                    columns = [col[0] for col in result_set.description]
-                    result_set.rowfactory = lambda *args: dict(zip(columns, args))
-
-                    for row in result_set:
-                        results.append(row)
-            connection.rollback() # just incase someone sends an insert/update statement
-
-    except (oracledb.Error, oracledb.NotSupportedError) as e :
-        error_obj, = e.args
-        error = {'status' : 'error', 'message' : error_obj.message}
-        print(error_obj)
-    return results, error
\ No newline at end of file
+        for chunk in oradata_stream(query, bind_args, params=params) :
+            results.extend(chunk)
+    except (_oracle_driver.Error, _oracle_driver.NotSupportedError) as e :
+        error = _oracle_error(e)
+    return results, error
+
+# Streaming variant: yields lists of row dicts of up to `arraysize` rows, so
+# callers can process a large term without holding every row at once.
+# Oracle errors are raised to the caller.
+def oradata_stream(query, bind_args, arraysize : int = ORACLE_ARRAYSIZE, params = oradata_connection_parameters) -> Iterator[List[Dict[str, Any]]] :
+
+    connection = _acquire_connection(params)
+    try :
+        connection.autocommit = False 
+        with connection.cursor() as cursor:
+            cursor.arraysize = arraysize
+            cursor.execute(query, bind_args)
+            
+            # cursor.description will also help identify when an "implied" cursor is used - since straight up select queries return a description, which is used to identify columns and build dicts
+            results_sets = ([cursor], cursor.getimplicitresults())[cursor.description is None]
+
+            for indx, result_set in enumerate(results_sets) :
+                #build dictionary keys
+                columns = [col[0] for col in result_set.description]
+                result_set.arraysize = arraysize
+                while True :
+                    rows = result_set.fetchmany(arraysize)
+                    if not rows :
+                        break
+                    yield [dict(zip(columns, row)) for row in rows]
+        connection.rollback() # just incase someone sends an insert/update statement
+    finally :
+        connection.close() # returns the session to the pool
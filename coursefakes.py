@@ -0,0 +1,707 @@
+from __future__ import annotations
+
+# Offline stand-ins for the course subsystem's backends (Mongo, Oracle and the
+# department helpers), used by the tests and the benchmark and load-test
+# harnesses. They implement only the calls the course code makes, with the
+# same return shapes.
+
+import copy
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import FastAPI
+from pymongo import InsertOne, UpdateOne
+from starlette.authentication import AuthCredentials, AuthenticationBackend, SimpleUser
+from starlette.middleware.authentication import AuthenticationMiddleware
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+
+ADMIN_ROLE = "******.Admin"
+
+
+# ---------------------------------------------------------------- Mongo
+
+def _get_field(doc: Dict[str, Any], field: str) -> Any:
+    value: Any = doc
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+# $set of a dotted field creates the embedded documents on the way
+def _set_field(doc: Dict[str, Any], field: str, value: Any) -> None:
+    *parents, last = field.split(".")
+    for part in parents:
+        if not isinstance(doc.get(part), dict):
+            doc[part] = {}
+        doc = doc[part]
+    doc[last] = value
+
+def _compare(value: Any, op: str, arg: Any) -> bool:
+    if op == "$in":
+        if isinstance(value, list):
+            return any(v in arg for v in value)
+        return value in arg
+    if op == "$nin":
+        return not _compare(value, "$in", arg)
+    if op == "$ne":
+        return value != arg
+    if op == "$exists":
+        return (value is not None) == bool(arg)
+    if op == "$regex":
+        return isinstance(value, str) and re.search(arg, value) is not None
+    if value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > arg
+        if op == "$gte":
+            return value >= arg
+        if op == "$lt":
+            return value < arg
+        if op == "$lte":
+            return value <= arg
+    except TypeError:
+        return False
+    raise NotImplementedError(f"fake collection does not support {op}")
+
+def _matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    for field, cond in (query or {}).items():
+        if field == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+            continue
+        if field == "$and":
+            if not all(_matches(doc, q) for q in cond):
+                return False
+            continue
+        value = _get_field(doc, field)
+        if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+            if not all(_compare(value, op, arg) for op, arg in cond.items() if op != "$options"):
+                return False
+        elif isinstance(value, list) and not isinstance(cond, list):
+            if cond not in value:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+# Documents hold scalars plus shallow lists/dicts, so one level of copying
+# keeps callers from mutating stored state (and is much cheaper than deepcopy)
+def _copy_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: (copy.copy(v) if isinstance(v, (list, dict)) else v) for k, v in doc.items()}
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return _copy_doc(doc)
+    include = {k for k, v in projection.items() if v and k != "_id"}
+    if include:
+        out = {k: (copy.copy(doc[k]) if isinstance(doc[k], (list, dict)) else doc[k]) for k in include if k in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            out["_id"] = doc["_id"]
+        return out
+    out = _copy_doc(doc)
+    for k, v in projection.items():
+        if not v:
+            out.pop(k, None)
+    return out
+
+def _sort_key(fields: List[Tuple[str, int]]):
+    # Mongo orders missing/null values first
+    def key(doc: Dict[str, Any]):
+        return [(_get_field(doc, f) is not None, _get_field(doc, f)) for f, _ in fields]
+    return key
+
+def _sort_docs(docs: List[Dict[str, Any]], spec: Any) -> List[Dict[str, Any]]:
+    if isinstance(spec, str):
+        spec = [(spec, 1)]
+    # apply keys right to left so earlier keys win (sorts are stable)
+    for field, direction in reversed(list(spec)):
+        docs.sort(key=_sort_key([(field, direction)]), reverse=direction < 0)
+    return docs
+
+
+class FakeCursor:
+    def __init__(self, docs: List[Dict[str, Any]], collection: Optional["FakeCollection"] = None,
+                 query: Optional[Dict[str, Any]] = None) -> None:
+        self._docs = docs
+        self._limit = 0
+        self._collection = collection
+        self._query = query or {}
+        self._sort: List[Tuple[str, int]] = []
+
+    def sort(self, key_or_list: Any, direction: Optional[int] = None) -> "FakeCursor":
+        spec = [(key_or_list, direction or 1)] if isinstance(key_or_list, str) else key_or_list
+        self._sort = list(spec)
+        _sort_docs(self._docs, spec)
+        return self
+
+    # Planner stand-in: an index is usable when its leading field is filtered
+    # on (or, with no usable filter, is the leading sort field)
+    def explain(self) -> Dict[str, Any]:
+        index = self._collection._usable_index(self._query, self._sort) if self._collection else None
+        if index is None:
+            plan: Dict[str, Any] = {"stage": "COLLSCAN"}
+        else:
+            plan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": index}}
+        if self._limit:
+            plan = {"stage": "LIMIT", "limitAmount": self._limit, "inputStage": plan}
+        return {"queryPlanner": {"winningPlan": plan}}
+
+    def limit(self, n: int) -> "FakeCursor":
+        self._limit = n
+        return self
+
+    def batch_size(self, n: int) -> "FakeCursor":
+        return self
+
+    def __iter__(self):
+        docs = self._docs[:self._limit] if self._limit else self._docs
+        return iter(docs)
+
+
+class FakeCollection:
+    def __init__(self, name: str, latency: float = 0.0) -> None:
+        self.name = name
+        # seconds slept per call, to model a network round trip
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.RLock()
+        self._docs: Dict[Any, Dict[str, Any]] = {}
+        # index name -> (fields, unique, key tuple -> _id for unique indexes)
+        self._indexes: Dict[str, Tuple[Tuple[str, ...], bool, Dict[Tuple[Any, ...], Any]]] = {}
+
+    def _round_trip(self) -> None:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    # -- indexes
+
+    def create_index(self, keys: Any, name: Optional[str] = None, unique: bool = False, **kwargs: Any) -> str:
+        self._round_trip()
+        spec = [(keys, 1)] if isinstance(keys, str) else list(keys)
+        fields = tuple(f for f, _ in spec)
+        name = name or "_".join(f"{f}_{d}" for f, d in spec)
+        with self._lock:
+            if name in self._indexes:
+                return name
+            entries: Dict[Tuple[Any, ...], Any] = {}
+            if unique:
+                for _id, doc in self._docs.items():
+                    key = tuple(doc.get(f) for f in fields)
+                    if key in entries:
+                        raise DuplicateKeyError(f"E11000 duplicate key error index: {name}")
+                    entries[key] = _id
+            self._indexes[name] = (fields, unique, entries)
+        return name
+
+    def index_information(self) -> Dict[str, Dict[str, Any]]:
+        self._round_trip()
+        info = {"_id_": {"key": [("_id", 1)]}}
+        for name, (fields, unique, _) in self._indexes.items():
+            info[name] = {"key": [(f, 1) for f in fields], "unique": unique}
+        return info
+
+    def _usable_index(self, query: Dict[str, Any], sort: List[Tuple[str, int]]) -> Optional[str]:
+        indexes = [("_id_", ("_id",))] + [(name, fields) for name, (fields, _, _) in self._indexes.items()]
+        for name, fields in indexes:
+            if fields[0] in query:
+                return name
+        if sort:
+            for name, fields in indexes:
+                if fields[0] == sort[0][0]:
+                    return name
+        return None
+
+    def _unique_violation(self, doc: Dict[str, Any], ignore_id: Any = None) -> Optional[str]:
+        for name, (fields, unique, entries) in self._indexes.items():
+            if unique:
+                owner = entries.get(tuple(doc.get(f) for f in fields))
+                if owner is not None and owner != ignore_id:
+                    return name
+        return None
+
+    def _store(self, doc: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+        for fields, unique, entries in self._indexes.values():
+            if unique:
+                if previous is not None:
+                    entries.pop(tuple(previous.get(f) for f in fields), None)
+                entries[tuple(doc.get(f) for f in fields)] = doc["_id"]
+        self._docs[doc["_id"]] = doc
+
+    def _candidates(self, query: Optional[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        query = query or {}
+        _id = query.get("_id")
+        if _id is not None and not isinstance(_id, dict):
+            doc = self._docs.get(_id)
+            return [doc] if doc is not None else []
+        # point lookups on a unique index skip the scan
+        for fields, unique, entries in self._indexes.values():
+            if unique and set(fields) <= set(query) and all(not isinstance(query[f], dict) for f in fields):
+                owner = entries.get(tuple(query[f] for f in fields))
+                return [self._docs[owner]] if owner is not None else []
+        return list(self._docs.values())
+
+    def _find_docs(self, query: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [d for d in self._candidates(query) if _matches(d, query)]
+
+    # -- reads
+
+    def find(self, filter: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None,
+             sort: Any = None, **kwargs: Any) -> FakeCursor:
+        self._round_trip()
+        with self._lock:
+            docs = [_project(d, projection) for d in self._find_docs(filter)]
+        cursor = FakeCursor(docs, self, filter)
+        if sort:
+            cursor.sort(sort)
+        return cursor
+
+    def find_one(self, filter: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None,
+                 sort: Any = None, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        self._round_trip()
+        with self._lock:
+            docs = self._find_docs(filter)
+            if sort:
+                _sort_docs(docs, sort)
+            return _project(docs[0], projection) if docs else None
+
+    def count_documents(self, filter: Optional[Dict[str, Any]] = None, **kwargs: Any) -> int:
+        self._round_trip()
+        with self._lock:
+            return len(self._find_docs(filter))
+
+    def estimated_document_count(self, **kwargs: Any) -> int:
+        self._round_trip()
+        with self._lock:
+            return len(self._docs)
+
+    # -- writes
+
+    def _insert(self, doc: Dict[str, Any]) -> Any:
+        doc.setdefault("_id", ObjectId())
+        stored = _copy_doc(doc)
+        if stored["_id"] in self._docs or self._unique_violation(stored):
+            raise DuplicateKeyError("E11000 duplicate key error")
+        self._store(stored)
+        return stored["_id"]
+
+    def insert_one(self, document: Dict[str, Any], **kwargs: Any) -> SimpleNamespace:
+        self._round_trip()
+        with self._lock:
+            return SimpleNamespace(inserted_id=self._insert(document), acknowledged=True)
+
+    def insert_many(self, documents: Iterable[Dict[str, Any]], ordered: bool = True, **kwargs: Any) -> SimpleNamespace:
+        result = self.bulk_write([InsertOne(d) for d in documents], ordered=ordered)
+        return SimpleNamespace(inserted_ids=result.inserted_ids, acknowledged=True)
+
+    def _apply_update(self, doc: Dict[str, Any], update: Dict[str, Any], inserting: bool) -> Dict[str, Any]:
+        new = _copy_doc(doc)
+        for op, fields in update.items():
+            if op == "$set" or (op == "$setOnInsert" and inserting):
+                for k, v in _copy_doc(fields).items():
+                    _set_field(new, k, v)
+            elif op == "$unset":
+                for k in fields:
+                    new.pop(k, None)
+            elif op == "$inc":
+                for k, v in fields.items():
+                    new[k] = new.get(k, 0) + v
+            elif op == "$push":
+                for k, v in fields.items():
+                    each = v["$each"] if isinstance(v, dict) and "$each" in v else [v]
+                    values = list(new.get(k) or []) + _copy_doc({"each": each})["each"]
+                    if isinstance(v, dict) and "$slice" in v:
+                        values = values[:v["$slice"]] if v["$slice"] >= 0 else values[v["$slice"]:]
+                    new[k] = values
+            elif op != "$setOnInsert":
+                raise NotImplementedError(f"fake collection does not support {op}")
+        return new
+
+    # returns (matched, modified, upserted_id)
+    def _update(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool) -> Tuple[int, int, Any]:
+        docs = self._find_docs(query)
+        if docs:
+            doc = docs[0]
+            new = self._apply_update(doc, update, inserting=False)
+            if new == doc:
+                return 1, 0, None
+            if self._unique_violation(new, ignore_id=doc["_id"]):
+                raise DuplicateKeyError("E11000 duplicate key error")
+            self._store(new, previous=doc)
+            return 1, 1, None
+        if not upsert:
+            return 0, 0, None
+        base = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+        new = self._apply_update(base, update, inserting=True)
+        return 0, 0, self._insert(new)
+
+    def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False, **kwargs: Any) -> SimpleNamespace:
+        self._round_trip()
+        with self._lock:
+            matched, modified, upserted_id = self._update(filter, update, upsert)
+        return SimpleNamespace(matched_count=matched, modified_count=modified, upserted_id=upserted_id, acknowledged=True)
+
+    def update_many(self, filter: Dict[str, Any], update: Dict[str, Any], **kwargs: Any) -> SimpleNamespace:
+        self._round_trip()
+        matched = modified = 0
+        with self._lock:
+            for doc in self._find_docs(filter):
+                new = self._apply_update(doc, update, inserting=False)
+                matched += 1
+                if new != doc:
+                    self._store(new, previous=doc)
+                    modified += 1
+        return SimpleNamespace(matched_count=matched, modified_count=modified, upserted_id=None, acknowledged=True)
+
+    # return_document: False/ReturnDocument.BEFORE or True/ReturnDocument.AFTER
+    def find_one_and_update(self, filter: Dict[str, Any], update: Dict[str, Any], projection: Optional[Dict[str, Any]] = None,
+                            upsert: bool = False, return_document: bool = False, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        self._round_trip()
+        with self._lock:
+            docs = self._find_docs(filter)
+            before = docs[0] if docs else None
+            _, _, upserted_id = self._update(filter, update, upsert)
+            if return_document:
+                after = self._docs.get(upserted_id if before is None else before["_id"])
+                return _project(after, projection) if after is not None else None
+            return _project(before, projection) if before is not None else None
+
+    def delete_many(self, filter: Dict[str, Any], **kwargs: Any) -> SimpleNamespace:
+        self._round_trip()
+        with self._lock:
+            docs = self._find_docs(filter)
+            for doc in docs:
+                for fields, unique, entries in self._indexes.values():
+                    if unique:
+                        entries.pop(tuple(doc.get(f) for f in fields), None)
+                del self._docs[doc["_id"]]
+        return SimpleNamespace(deleted_count=len(docs), acknowledged=True)
+
+    def bulk_write(self, requests: List[Any], ordered: bool = True, **kwargs: Any) -> SimpleNamespace:
+        self._round_trip()
+        counts = {"nInserted": 0, "nMatched": 0, "nModified": 0, "nUpserted": 0}
+        inserted_ids: List[Any] = []
+        upserted: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        with self._lock:
+            for index, op in enumerate(requests):
+                try:
+                    if isinstance(op, InsertOne):
+                        inserted_ids.append(self._insert(op._doc))
+                        counts["nInserted"] += 1
+                    elif isinstance(op, UpdateOne):
+                        matched, modified, upserted_id = self._update(op._filter, op._doc, bool(op._upsert))
+                        counts["nMatched"] += matched
+                        counts["nModified"] += modified
+                        if upserted_id is not None:
+                            counts["nUpserted"] += 1
+                            upserted.append({"index": index, "_id": upserted_id})
+                    else:
+                        raise NotImplementedError(f"fake collection does not support {type(op).__name__}")
+                except DuplicateKeyError as e:
+                    errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": getattr(op, "_doc", None)})
+                    if ordered:
+                        break
+        if errors:
+            raise BulkWriteError({**counts, "upserted": upserted, "writeErrors": errors, "writeConcernErrors": []})
+        return SimpleNamespace(
+            inserted_count=counts["nInserted"],
+            matched_count=counts["nMatched"],
+            modified_count=counts["nModified"],
+            upserted_count=counts["nUpserted"],
+            upserted_ids={u["index"]: u["_id"] for u in upserted},
+            inserted_ids=inserted_ids,
+            bulk_api_result={**counts, "upserted": upserted},
+            acknowledged=True,
+        )
+
+
+class FakeDatabase:
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self._collections: Dict[str, FakeCollection] = {}
+        self._lock = threading.Lock()
+
+    # drop-in for core.dbdata.db_collection
+    def collection(self, name: str) -> FakeCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = FakeCollection(name, latency=self.latency)
+            return self._collections[name]
+
+    def call_counts(self) -> Dict[str, int]:
+        return {name: col.calls for name, col in self._collections.items()}
+
+
+# ---------------------------------------------------------------- Oracle
+
+SUBJECTS = ["ACCT", "BIOL", "CHEM", "COMM", "CSCI", "ECON", "ENGL", "HIST", "MATH", "PHYS", "PSYC", "SOCI"]
+
+# Synthetic rows in the shape course_query returns
+def synthetic_term_rows(term_code: str, count: int, colleges: int = 400, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(f"{term_code}:{seed}")
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        college = i % colleges
+        subj = SUBJECTS[(i // colleges) % len(SUBJECTS)]
+        rows.append({
+            "TERM_CODE": term_code,
+            "COLLEGE_CODE": f"{college:06d}",
+            "COLLEGE_NAME": f"Community College {college}",
+            "TRANS_SUBJ": subj,
+            "TRANS_NUMB": str(100 + i // (colleges * len(SUBJECTS))),
+            "INST_SUBJ": rng.choice(SUBJECTS),
+            "INST_NUMB": "1910" if rng.random() < 0.3 else str(rng.randint(1000, 4999)),
+            "ACTIVITY_DATE": start + timedelta(minutes=i),
+        })
+    return rows
+
+
+class FakeOracleCursor:
+    def __init__(self, driver: "FakeOracleDriver") -> None:
+        self._driver = driver
+        self._rows: List[Dict[str, Any]] = []
+        self._pos = 0
+        self.description: Optional[List[Tuple[str]]] = None
+        self.arraysize = 100
+
+    def __enter__(self) -> "FakeOracleCursor":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def execute(self, query: str, bind_args: Optional[Dict[str, Any]] = None) -> None:
+        bind_args = bind_args or {}
+        if self._driver.query_latency:
+            time.sleep(self._driver.query_latency)
+        self._rows = [r for r in self._driver.rows_for(bind_args.get("term_code")) if self._driver.row_filter(r, bind_args)]
+        self._pos = 0
+        columns = list(self._rows[0]) if self._rows else list(FakeOracleDriver.COLUMNS)
+        self.description = [(c,) for c in columns]
+
+    def getimplicitresults(self) -> List[Any]:
+        return []
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        size = size or self.arraysize
+        chunk = self._rows[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return [tuple(r.values()) for r in chunk]
+
+
+class FakeOracleConnection:
+    def __init__(self, driver: "FakeOracleDriver") -> None:
+        self._driver = driver
+        self.autocommit = False
+
+    def cursor(self) -> FakeOracleCursor:
+        return FakeOracleCursor(self._driver)
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self._driver.pool.release()
+
+
+class FakeOraclePool:
+    def __init__(self, driver: "FakeOracleDriver", max: int = 8, **kwargs: Any) -> None:
+        self._driver = driver
+        self._slots = threading.BoundedSemaphore(max)
+        self.max = max
+        self.opened = 0
+        self.busy = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> FakeOracleConnection:
+        self._slots.acquire()
+        with self._lock:
+            self.busy += 1
+            self.opened = max(self.opened, self.busy)
+        if self._driver.connect_latency:
+            time.sleep(self._driver.connect_latency)
+        return FakeOracleConnection(self._driver)
+
+    def release(self) -> None:
+        with self._lock:
+            self.busy -= 1
+        self._slots.release()
+
+    def close(self) -> None:
+        return None
+
+
+# Stand-in for the oracledb module: set_oracle_driver(FakeOracleDriver(...))
+class FakeOracleDriver:
+    COLUMNS = ("TERM_CODE", "COLLEGE_CODE", "COLLEGE_NAME", "TRANS_SUBJ", "TRANS_NUMB",
+               "INST_SUBJ", "INST_NUMB", "ACTIVITY_DATE")
+
+    class Error(Exception):
+        pass
+
+    class NotSupportedError(Exception):
+        pass
+
+    def __init__(self, terms: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 row_source: Optional[Callable[[str], List[Dict[str, Any]]]] = None,
+                 query_latency: float = 0.0, connect_latency: float = 0.0) -> None:
+        self.terms = terms if terms is not None else {}
+        self.row_source = row_source
+        self.query_latency = query_latency
+        self.connect_latency = connect_latency
+        self.pool: Any = None
+
+    def rows_for(self, term_code: Optional[str]) -> List[Dict[str, Any]]:
+        if term_code not in self.terms and self.row_source is not None:
+            self.terms[term_code] = self.row_source(term_code)
+        return self.terms.get(term_code, [])
+
+    # Applies the optional bind arguments course_query adds to the base query
+    def row_filter(self, row: Dict[str, Any], bind_args: Dict[str, Any]) -> bool:
+        since = bind_args.get("since")
+        if since is not None and (row.get("ACTIVITY_DATE") is None or row["ACTIVITY_DATE"] <= since):
+            return False
+        code = row.get("COLLEGE_CODE") or ""
+        if bind_args.get("college_from") is not None and code < bind_args["college_from"]:
+            return False
+        return bind_args.get("college_to") is None or code < bind_args["college_to"]
+
+    def create_pool(self, **kwargs: Any) -> FakeOraclePool:
+        self.pool = FakeOraclePool(self, max=kwargs.get("max", 8))
+        return self.pool
+
+
+# ---------------------------------------------------------------- department
+
+# Stand-in for data.department. `names` overrides the name of some ids (None
+# = unknown, left out of the result); with `ordered_by_name` results come back
+# sorted by name rather than in request order, and with `with_ids` as
+# {"evaluator_id", "name"} records.
+class FakeDepartment:
+    def __init__(self, latency: float = 0.0, names: Optional[Dict[str, Optional[str]]] = None,
+                 ordered_by_name: bool = False, with_ids: bool = False) -> None:
+        self.latency = latency
+        self.names = names or {}
+        self.ordered_by_name = ordered_by_name
+        self.with_ids = with_ids
+        self.calls = 0
+
+    def get_evaluator_name(self, evaluator_ids: List[Any]) -> List[Any]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        found = [(str(e), self.names.get(str(e), f"Evaluator {e}")) for e in evaluator_ids]
+        found = [(e, name) for e, name in found if name is not None]
+        if self.ordered_by_name:
+            found.sort(key=lambda pair: pair[1])
+        if self.with_ids:
+            return [{"evaluator_id": e, "name": name} for e, name in found]
+        return [name for _, name in found]
+
+    def dept_for_evaluator(self, evaluator_id: Any) -> List[Dict[str, Any]]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [{"coll_code": "AS", "coll_desc": "Arts and Sciences",
+                 "dept_code": f"D{evaluator_id}", "dept_desc": f"Department {evaluator_id}"}]
+
+
+def seed_department_configs(db: FakeDatabase, subjects: Iterable[str] = SUBJECTS) -> None:
+    col = db.collection("departmentconfig")
+    for i, subj in enumerate(subjects):
+        col.insert_one({
+            "transfer_course": subj,
+            "evaluator": [f"E{i:03d}", f"E{i + 100:03d}"],
+            "coll_code": "AS",
+            "coll_desc": "Arts and Sciences",
+            "dept_code": subj,
+            "dept_desc": f"{subj} Department",
+            "updated_at": datetime(2024, 1, 1),
+        })
+
+
+# Request stand-in for calling routes directly; `body` is streamed back in
+# `chunk_size` byte pieces, so lines and records arrive split across chunks
+def fake_request(roles: Optional[List[str]] = None, headers: Optional[Dict[str, str]] = None,
+                 body: bytes = b"", chunk_size: int = 7) -> SimpleNamespace:
+    async def stream():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    return SimpleNamespace(user=SimpleNamespace(roles=roles or [ADMIN_ROLE]), headers=headers or {}, stream=stream)
+
+
+# ---------------------------------------------------------------- ASGI app
+
+class FakeUser(SimpleUser):
+    def __init__(self, username: str, roles: List[str]) -> None:
+        super().__init__(username)
+        self.roles = roles
+
+# Authenticates every request as one user with `roles`, in place of the real
+# token backend
+class FakeAuthBackend(AuthenticationBackend):
+    def __init__(self, roles: Optional[List[str]] = None) -> None:
+        self.roles = roles or [ADMIN_ROLE]
+
+    async def authenticate(self, conn: Any) -> Tuple[AuthCredentials, FakeUser]:
+        return AuthCredentials(["authenticated"]), FakeUser("load-admin", self.roles)
+
+# App serving the course router behind the authentication middleware, for
+# driving requests through routing, validation and serialisation (e.g. with
+# httpx.ASGITransport). Lifespan events aren't sent that way, so the router's
+# startup hooks (index check, cache warmer) don't run.
+def build_app(routes: Any, prefix: str = "/api", roles: Optional[List[str]] = None) -> FastAPI:
+    app = FastAPI()
+    app.include_router(routes.router, prefix=prefix)
+    app.add_middleware(AuthenticationMiddleware, backend=FakeAuthBackend(roles))
+    return app
+
+
+# Point the course data module and router at the fakes and reset their
+# process-local caches. Returns the objects so callers can inspect them.
+def install(coursedata: Any, routes: Any = None, db: Optional[FakeDatabase] = None,
+            driver: Optional[FakeOracleDriver] = None, department: Optional[FakeDepartment] = None) -> SimpleNamespace:
+    db = db or FakeDatabase()
+    driver = driver or FakeOracleDriver()
+    department = department or FakeDepartment()
+
+    coursedata.db_collection = db.collection
+    coursedata.department = department
+    coursedata.set_oracle_driver(driver)
+    coursedata.set_shared_store(None)
+    with coursedata._cache_lock:
+        coursedata._course_cache.clear()
+        coursedata._recent_terms.clear()
+    coursedata._indexes_ensured = False
+    coursedata._sync_reports.clear()
+    coursedata._evaluator_directory = coursedata.EvaluatorDirectory()
+    coursedata._course_write_behind = coursedata.CourseWriteBehind()
+    coursedata._dept_config_index = coursedata.DepartmentConfigIndex()
+    # routes that go through coursedata.metered_collection pick up the fake
+    # via coursedata.db_collection; only a plain db_collection import needs patching
+    if routes is not None and getattr(routes, "db_collection", None) is not coursedata.metered_collection:
+        routes.db_collection = db.collection
+    return SimpleNamespace(db=db, driver=driver, department=department)
+
+
+# ---------------------------------------------------------------- timing
+
+# Nearest-rank percentile of latency samples (0.0 when there are none)
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
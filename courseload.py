@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+# Offline load test replaying the CourseCard traffic pattern.
+#
+#   python courseload.py --admins 20 --duration 30 --mongo-latency 0.002
+#
+# Each simulated admin loads the term list (POST /course, revalidating with
+# the ETag from its previous load), then works through course cards: mostly
+# details opens, with sends, evaluator changes and list reloads mixed in per
+# --mix. Everything runs against the stand-ins in coursefakes (in-memory
+# Mongo, fake Oracle driver and department helpers, each with configurable
+# latency), so no database or network is needed.
+#
+# Requests go over httpx.ASGITransport to an app serving the course router
+# behind the authentication middleware (coursefakes.build_app, with a stub
+# backend that signs every request in as an admin), so latencies include
+# routing, query/body validation, auth, response serialisation and threadpool
+# queueing for sync routes. Per route it reports throughput and p50/p95/p99.
+
+import argparse
+import asyncio
+import importlib
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+import coursefakes
+from coursebench import _git_revision
+from data import course as coursedata
+
+LOAD_TERM = "209920"
+DEFAULT_MIX = "details=8,send=1,update=1,list=1"
+ROUTES = ("list", "details", "send", "update")
+
+
+def _parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown route {name!r} in mix (expected {', '.join(ROUTES)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+class LoadRun:
+    def __init__(self, routes: Any, app: Any, courses: List[Dict[str, Any]], mix: Dict[str, float],
+                 think_seconds: float, seed: int) -> None:
+        self.routes = routes
+        self.courses = courses
+        self.actions = list(mix)
+        self.weights = [mix[a] for a in self.actions]
+        self.think_seconds = think_seconds
+        self.seed = seed
+        self.samples: Dict[str, List[float]] = {name: [] for name in ROUTES}
+        self.errors: Dict[str, int] = {name: 0 for name in ROUTES}
+        self.rejected: Dict[str, int] = {name: 0 for name in ROUTES}
+        self.not_modified = 0
+        self.urls = {
+            "list": app.url_path_for("display_course"),
+            "details": app.url_path_for("get_course_details"),
+            "send": app.url_path_for("assign_evaluators_to_course"),
+            "update": app.url_path_for("update_evaluator"),
+        }
+
+    # One request; 5xx and transport failures count as errors, other 4xx as
+    # rejected. Bodies are built from the routes' own payload models.
+    async def _timed(self, client: httpx.AsyncClient, name: str, method: str, body: Any,
+                     params: Optional[Dict[str, str]] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response: Optional[httpx.Response] = await client.request(
+                method, self.urls[name], params=params, json=body.model_dump(mode="json"), headers=headers,
+            )
+            if response.status_code >= 500:
+                self.errors[name] += 1
+            elif response.status_code >= 400:
+                self.rejected[name] += 1
+        except Exception:
+            self.errors[name] += 1
+            response = None
+        self.samples[name].append((time.perf_counter() - started) * 1000.0)
+        return response
+
+    async def _list(self, client: httpx.AsyncClient, rng: random.Random, etag: Optional[str]) -> Optional[str]:
+        # most loads are unfiltered; some narrow by a college code prefix
+        search = "" if rng.random() < 0.7 else rng.choice(self.courses)["college_code"][:rng.randint(2, 6)]
+        response = await self._timed(
+            client, "list", "POST", self.routes.RequestsSearchFilter(search=search),
+            params={"term_code": LOAD_TERM}, headers={"If-None-Match": etag} if etag and not search else None,
+        )
+        if response is None or search:
+            return etag
+        if response.status_code == 304:
+            self.not_modified += 1
+        return response.headers.get("etag") or etag
+
+    async def admin(self, client: httpx.AsyncClient, index: int, deadline: float) -> None:
+        routes = self.routes
+        rng = random.Random(self.seed * 1000 + index)
+        etag = await self._list(client, rng, None)
+        while time.perf_counter() < deadline:
+            if self.think_seconds:
+                await asyncio.sleep(rng.expovariate(1.0 / self.think_seconds))
+            action = rng.choices(self.actions, self.weights)[0]
+            card = rng.choice(self.courses)
+            if action == "list":
+                etag = await self._list(client, rng, etag)
+            elif action == "details":
+                payload = routes.CourseDetailsPayload(id=card["_id"], trans_subj=card["trans_subj"])
+                await self._timed(client, "details", "POST", payload, params={"term_code": LOAD_TERM})
+            elif action == "send":
+                payload = routes.AssignEvaluatorsPayload(course_id=card["_id"], trans_subj=card["trans_subj"])
+                await self._timed(client, "send", "PATCH", payload)
+            else:
+                payload = routes.EvaluatorUpdate(id=card["_id"], evaluator_id=f"E{rng.randint(0, 199):03d}")
+                await self._timed(client, "update", "PATCH", payload)
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for name in ROUTES:
+            samples = self.samples[name]
+            if not samples:
+                continue
+            result[name] = {
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "rejected": self.rejected[name],
+                "throughput_rps": round(len(samples) / elapsed, 2),
+                "mean_ms": round(statistics.fmean(samples), 4),
+                "p50_ms": round(coursefakes.percentile(samples, 50), 4),
+                "p95_ms": round(coursefakes.percentile(samples, 95), 4),
+                "p99_ms": round(coursefakes.percentile(samples, 99), 4),
+                "max_ms": round(max(samples), 4),
+            }
+        return result
+
+
+def run_load(args: argparse.Namespace, routes: Any) -> Dict[str, Any]:
+    rows = coursefakes.synthetic_term_rows(LOAD_TERM, args.rows)
+    fakes = coursefakes.install(
+        coursedata, routes,
+        db=coursefakes.FakeDatabase(latency=args.mongo_latency),
+        driver=coursefakes.FakeOracleDriver(terms={LOAD_TERM: rows}, query_latency=args.oracle_latency),
+        department=coursefakes.FakeDepartment(latency=args.department_latency),
+    )
+    coursefakes.seed_department_configs(fakes.db)
+
+    # warm the term (and its indexes) unless the cold load is part of the test
+    started = time.perf_counter()
+    coursedata.ensure_course_indexes()
+    courses = coursedata.list_courses_for_term(LOAD_TERM)
+    warmup_seconds = time.perf_counter() - started
+    if args.cold:
+        coursefakes.install(coursedata, routes, db=fakes.db, driver=fakes.driver, department=fakes.department)
+
+    app = coursefakes.build_app(routes)
+    run = LoadRun(routes, app, courses, args.mix, args.think_ms / 1000.0, args.seed)
+
+    async def drive() -> float:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://courseload") as client:
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(run.admin(client, i, deadline) for i in range(args.admins)))
+            return time.perf_counter() - started
+
+    elapsed = asyncio.run(drive())
+    coursedata.flush_course_updates()
+    per_route = run.summary(elapsed)
+    total = sum(r["requests"] for r in per_route.values())
+    return {
+        "generated_at": datetime.utcnow().isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "rows": args.rows,
+            "admins": args.admins,
+            "duration_seconds": args.duration,
+            "think_ms": args.think_ms,
+            "mix": args.mix,
+            "mongo_latency": args.mongo_latency,
+            "oracle_latency": args.oracle_latency,
+            "department_latency": args.department_latency,
+            "cold": args.cold,
+            "seed": args.seed,
+        },
+        "warmup_seconds": round(warmup_seconds, 4),
+        "elapsed_seconds": round(elapsed, 4),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2),
+        "not_modified": run.not_modified,
+        "routes": per_route,
+        "cache": coursedata.course_cache_stats(),
+        "write_behind": coursedata.course_write_behind_stats(),
+        "mongo_calls": fakes.db.call_counts(),
+    }
+
+
+def _print_summary(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    config = report["config"]
+    print(f"== {config['admins']} admins, {config['rows']} rows, {report['elapsed_seconds']:.1f}s: "
+          f"{report['requests']} requests, {report['throughput_rps']:.1f} req/s")
+    base_routes = (baseline or {}).get("routes", {})
+    for name, stats in report["routes"].items():
+        line = (f"  {name:<8} {stats['requests']:7d} req {stats['throughput_rps']:9.1f} req/s  "
+                f"p50 {stats['p50_ms']:8.3f} ms  p95 {stats['p95_ms']:8.3f} ms  p99 {stats['p99_ms']:8.3f} ms  "
+                f"errors {stats['errors']}")
+        base = base_routes.get(name)
+        if base and base.get("p95_ms"):
+            line += f"  ({stats['p95_ms'] / base['p95_ms'] - 1:+.1%} p95 vs baseline)"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Offline CourseCard load test")
+    parser.add_argument("--admins", type=int, default=10, help="concurrent simulated admins")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--rows", type=int, default=20000, help="courses in the synthetic term")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX),
+                        help=f"relative weights of the card actions (default {DEFAULT_MIX})")
+    parser.add_argument("--think-ms", type=float, default=50.0, help="mean pause between an admin's actions")
+    parser.add_argument("--mongo-latency", type=float, default=0.001, help="seconds per fake Mongo call")
+    parser.add_argument("--oracle-latency", type=float, default=0.05, help="seconds per fake Oracle query")
+    parser.add_argument("--department-latency", type=float, default=0.002, help="seconds per fake department lookup")
+    parser.add_argument("--cold", action="store_true", help="start with an empty cache (first list refreshes)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--router-module", default="course", help="module that defines the course APIRouter")
+    parser.add_argument("--output", default="courseload.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    routes = importlib.import_module(args.router_module)
+    report = run_load(args, routes)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    _print_summary(report, baseline)
+    print(f"results written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+# Bulk send job counts come from what the server reports for each batch:
+# matched updates are sent, updates matching nothing are missing, and write
+# errors are failures against the course they were for.
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+TERM = "209930"
+
+
+def _setup():
+    fakes = coursefakes.install(
+        coursedata, routes,
+        driver=coursefakes.FakeOracleDriver(terms={TERM: coursefakes.synthetic_term_rows(TERM, 40)}),
+    )
+    coursefakes.seed_department_configs(fakes.db)
+    coursedata.list_courses_for_term(TERM)
+    return fakes
+
+
+def test_counts_follow_the_bulk_write_result():
+    fakes = _setup()
+    col = fakes.db.collection("course")
+    bulk_write = col.bulk_write
+    rejected = []
+
+    # a course is deleted after the send listed it, and the server rejects
+    # another update
+    def racing_bulk_write(ops, ordered=True, **kwargs):
+        col.delete_many({"_id": ops[0]._filter["_id"]})
+        rejected.append(ops[1]._filter["_id"])
+        result = bulk_write([op for i, op in enumerate(ops) if i != 1], ordered=ordered, **kwargs)
+        raise BulkWriteError({
+            "nMatched": result.matched_count, "nModified": result.modified_count,
+            "writeErrors": [{"index": 1, "code": 121, "errmsg": "Document failed validation"}],
+        })
+
+    col.bulk_write = racing_bulk_write
+    job = coursedata.bulk_send_to_evaluators(TERM)
+
+    assert job["status"] == "done"
+    assert (job["total"], job["sent"], job["missing"], job["failed"]) == (40, 38, 1, 1)
+    assert job["failures"] == [{"course_id": str(rejected[0]), "error": "Document failed validation"}]
+    stored = fakes.db.collection(coursedata.SEND_JOB_COLLECTION).find_one({"_id": job["job_id"]})
+    assert (stored["sent"], stored["missing"], stored["failed"]) == (38, 1, 1)
+
+    # the rejected course is still listed as waiting, in Mongo and the cache
+    assert col.find_one({"_id": ObjectId(rejected[0])})["status"] != "SE"
+    listed = {c["_id"] for c in coursedata.find_courses_for_term(TERM, ["RF", "RT"])}
+    assert listed == {str(rejected[0])}
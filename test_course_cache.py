@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+# The in-process term cache: concurrent cold reads share one refresh, a failed
+# refresh keeps serving the last good snapshot and backs off before trying
+# again, and terms past the count or byte budget are evicted least recently
+# used first. The departmentconfig index picks up edits through its
+# fingerprint or department_configs_changed().
+
+import threading
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+TERM = "209930"
+TERMS = ["209910", "209920", "209930"]
+
+
+def _setup():
+    fakes = coursefakes.install(
+        coursedata, routes,
+        driver=coursefakes.FakeOracleDriver(row_source=lambda term: coursefakes.synthetic_term_rows(term, 100)),
+    )
+    coursefakes.seed_department_configs(fakes.db)
+    return fakes
+
+
+# Counts refresh pipeline runs; each run waits for `gate` and raises while
+# `fail` is set
+class _Pipeline:
+    def __init__(self):
+        self.runs = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+        self._run = coursedata._run_refresh_pipeline
+
+    def __call__(self, term_code):
+        self.runs += 1
+        self.gate.wait()
+        if self.fail:
+            raise Exception("oracle unavailable")
+        return self._run(term_code)
+
+
+def _with_pipeline(test):
+    pipeline = _Pipeline()
+    original = coursedata._run_refresh_pipeline
+    coursedata._run_refresh_pipeline = pipeline
+    try:
+        test(pipeline)
+    finally:
+        coursedata._run_refresh_pipeline = original
+
+
+def _cached_terms():
+    with coursedata._cache_lock:
+        return [term for term, entry in coursedata._course_cache.items() if entry.has_data()]
+
+
+def test_concurrent_cold_reads_share_one_refresh():
+    _setup()
+
+    def run(pipeline):
+        pipeline.gate.clear()
+        results = []
+        readers = [threading.Thread(target=lambda: results.append(len(coursedata.list_courses_for_term(TERM))))
+                   for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        pipeline.gate.set()
+        for reader in readers:
+            reader.join()
+        assert results == [100] * 8
+        assert pipeline.runs == 1
+
+    _with_pipeline(run)
+
+
+def test_failed_refresh_serves_the_stale_copy_and_backs_off():
+    _setup()
+
+    def run(pipeline):
+        assert len(coursedata.list_courses_for_term(TERM)) == 100
+        entry = coursedata._course_cache[TERM]
+        entry.cache_timestamp = 1.0
+        pipeline.runs, pipeline.fail = 0, True
+        stale_serves = coursedata._cache_stats["stale_serves"]
+
+        # stale copy now, refresh in the background
+        assert len(coursedata.list_courses_for_term(TERM)) == 100
+        entry.refresh_done.wait()
+        assert entry.failures == 1 and entry.last_error is not None
+        assert entry.retry_at > coursedata.datetime.now().timestamp() + coursedata.REFRESH_BACKOFF_BASE - 5
+
+        # within the backoff no refresh is started
+        assert len(coursedata.list_courses_for_term(TERM)) == 100
+        assert pipeline.runs == 1
+        assert coursedata._cache_stats["stale_serves"] == stale_serves + 2
+
+        # the next failure doubles the delay
+        entry.retry_at = 0.0
+        coursedata.list_courses_for_term(TERM)
+        entry.refresh_done.wait()
+        assert entry.failures == 2
+        assert entry.retry_at > coursedata.datetime.now().timestamp() + 2 * coursedata.REFRESH_BACKOFF_BASE - 5
+
+        # a success clears the backoff and refreshes the snapshot
+        pipeline.fail = False
+        entry.retry_at = 0.0
+        coursedata.list_courses_for_term(TERM)
+        entry.refresh_done.wait()
+        assert (entry.failures, entry.retry_at, entry.last_error) == (0, 0.0, None)
+        assert not entry.is_expired()
+        assert pipeline.runs == 3
+
+    _with_pipeline(run)
+
+
+def test_failed_cold_refresh_raises_until_the_backoff_passes():
+    _setup()
+
+    def run(pipeline):
+        pipeline.fail = True
+        for _ in range(2):
+            try:
+                coursedata.list_courses_for_term(TERM)
+            except Exception as e:
+                assert str(e) == "oracle unavailable"
+            else:
+                raise AssertionError("cold read with a failed refresh returned")
+        assert pipeline.runs == 1
+
+        pipeline.fail = False
+        coursedata._course_cache[TERM].retry_at = 0.0
+        assert len(coursedata.list_courses_for_term(TERM)) == 100
+        assert pipeline.runs == 2
+
+    _with_pipeline(run)
+
+
+def test_terms_past_the_count_budget_are_evicted_least_recently_used_first():
+    _setup()
+    max_terms = coursedata.COURSE_CACHE_MAX_TERMS
+    coursedata.COURSE_CACHE_MAX_TERMS = 2
+    try:
+        coursedata.list_courses_for_term(TERMS[0])
+        coursedata.list_courses_for_term(TERMS[1])
+        # touch the older term so the other one is now least recently used
+        coursedata.list_courses_for_term(TERMS[0])
+        evictions = coursedata._cache_stats["evictions"]
+        coursedata.list_courses_for_term(TERMS[2])
+        assert sorted(_cached_terms()) == [TERMS[0], TERMS[2]]
+        assert coursedata._cache_stats["evictions"] == evictions + 1
+    finally:
+        coursedata.COURSE_CACHE_MAX_TERMS = max_terms
+
+
+def test_terms_past_the_byte_budget_are_evicted():
+    _setup()
+    max_terms, max_bytes = coursedata.COURSE_CACHE_MAX_TERMS, coursedata.COURSE_CACHE_MAX_BYTES
+    coursedata.COURSE_CACHE_MAX_TERMS = None
+    try:
+        coursedata.list_courses_for_term(TERMS[0])
+        one_term = coursedata._course_cache[TERMS[0]].size_bytes
+        # room for two terms of this size, not three
+        coursedata.COURSE_CACHE_MAX_BYTES = int(one_term * 2.5)
+        coursedata.list_courses_for_term(TERMS[1])
+        assert sorted(_cached_terms()) == TERMS[:2]
+        coursedata.list_courses_for_term(TERMS[2])
+        assert sorted(_cached_terms()) == TERMS[1:]
+        with coursedata._cache_lock:
+            total = sum(entry.size_bytes for entry in coursedata._course_cache.values())
+        assert total <= coursedata.COURSE_CACHE_MAX_BYTES
+    finally:
+        coursedata.COURSE_CACHE_MAX_TERMS, coursedata.COURSE_CACHE_MAX_BYTES = max_terms, max_bytes
+
+
+def test_department_config_edits_are_picked_up_by_fingerprint_or_notification():
+    fakes = _setup()
+    check_seconds = coursedata.DEPT_CONFIG_CHECK_SECONDS
+    coursedata.DEPT_CONFIG_CHECK_SECONDS = 0
+    col = fakes.db.collection("departmentconfig")
+    try:
+        assert coursedata.get_dept_config("MATH")["dept_desc"] == "MATH Department"
+        assert coursedata.get_dept_config("ASTR") is None
+
+        # an in-place edit leaves count and newest _id alone: not seen yet
+        col.update_one({"transfer_course": "MATH"}, {"$set": {"dept_desc": "Mathematics"}})
+        assert coursedata.get_dept_config("MATH")["dept_desc"] == "MATH Department"
+
+        # ...until the editor reports it
+        coursedata.department_configs_changed()
+        assert coursedata.get_dept_config("MATH")["dept_desc"] == "Mathematics"
+
+        # a new config changes the fingerprint
+        coursefakes.seed_department_configs(fakes.db, ["ASTR"])
+        assert coursedata.get_dept_config("ASTR")["dept_desc"] == "ASTR Department"
+
+        # an edit reported by another worker bumps the shared version
+        col.update_one({"transfer_course": "MATH"}, {"$set": {"dept_desc": "Math"}})
+        coursedata._bump_cache_version(coursedata.DEPT_CONFIG_VERSION_KEY)
+        assert coursedata.get_dept_config("MATH")["dept_desc"] == "Math"
+    finally:
+        coursedata.DEPT_CONFIG_CHECK_SECONDS = check_seconds
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+# get_course_details under parallel load, against the coursefakes stand-ins
+# with real (sleeping) Mongo and department latency. Blocking calls made on
+# the event loop thread would serialise concurrent requests, so p99 would
+# grow with the number of requests in flight; run off the loop it stays close
+# to the latency of one request on its own.
+
+import asyncio
+import time
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+TERM = "209930"
+MONGO_LATENCY = 0.01
+DEPARTMENT_LATENCY = 0.01
+# every request in flight gets a thread for each of its parallel lookups
+CONCURRENCY = coursedata.DB_EXECUTOR_WORKERS // 2
+REQUESTS_PER_CLIENT = 10
+# allowed p99 under load, as a multiple of the p50 of one request at a time
+P99_FACTOR = 3
+
+
+def _setup():
+    fakes = coursefakes.install(
+        coursedata, routes,
+        db=coursefakes.FakeDatabase(latency=MONGO_LATENCY),
+        driver=coursefakes.FakeOracleDriver(terms={TERM: coursefakes.synthetic_term_rows(TERM, 2000)}),
+        department=coursefakes.FakeDepartment(latency=DEPARTMENT_LATENCY),
+    )
+    coursefakes.seed_department_configs(fakes.db)
+    courses = coursedata.list_courses_for_term(TERM)
+    payloads = [routes.CourseDetailsPayload(id=c["_id"], trans_subj=c["trans_subj"]) for c in courses[::50]]
+    return fakes, payloads
+
+
+async def _timed_details(request, payload) -> float:
+    started = time.perf_counter()
+    result = await routes.get_course_details(request, TERM, payload)
+    assert result.status == "success"
+    return (time.perf_counter() - started) * 1000.0
+
+
+def test_course_details_p99_stays_flat_under_parallel_requests():
+    _, payloads = _setup()
+    request = coursefakes.fake_request()
+
+    async def sequential():
+        return [await _timed_details(request, payloads[i % len(payloads)]) for i in range(REQUESTS_PER_CLIENT * 2)]
+
+    async def client(index: int):
+        return [
+            await _timed_details(request, payloads[(index * REQUESTS_PER_CLIENT + i) % len(payloads)])
+            for i in range(REQUESTS_PER_CLIENT)
+        ]
+
+    async def parallel():
+        results = await asyncio.gather(*(client(i) for i in range(CONCURRENCY)))
+        return [sample for samples in results for sample in samples]
+
+    # warm the evaluator directory and departmentconfig index first
+    asyncio.run(sequential())
+    alone = asyncio.run(sequential())
+    loaded = asyncio.run(parallel())
+    coursedata.flush_course_updates()
+
+    alone_p50 = coursefakes.percentile(alone, 50)
+    loaded_p99 = coursefakes.percentile(loaded, 99)
+    assert len(loaded) == CONCURRENCY * REQUESTS_PER_CLIENT
+    assert loaded_p99 <= P99_FACTOR * alone_p50, (
+        f"p99 {loaded_p99:.1f} ms with {CONCURRENCY} parallel requests vs p50 {alone_p50:.1f} ms alone"
+    )
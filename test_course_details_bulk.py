@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+# The bulk details route resolves up to BULK_DETAILS_MAX_IDS courses per
+# request; a longer id list is rejected by validation (422) before any lookup.
+
+import asyncio
+
+import httpx
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+TERM = "209930"
+PATH = "/api********/details/bulk"
+
+
+def _setup():
+    fakes = coursefakes.install(
+        coursedata, routes,
+        driver=coursefakes.FakeOracleDriver(terms={TERM: coursefakes.synthetic_term_rows(TERM, 300)}),
+    )
+    coursefakes.seed_department_configs(fakes.db)
+    courses = coursedata.list_courses_for_term(TERM)
+    return fakes, [c["_id"] for c in courses]
+
+
+def _post(ids):
+    async def post():
+        transport = httpx.ASGITransport(app=coursefakes.build_app(routes))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(PATH, params={"term_code": TERM}, json={"ids": ids})
+
+    return asyncio.run(post())
+
+
+def test_id_lists_past_the_cap_are_rejected_before_any_lookup():
+    fakes, ids = _setup()
+    coursedata._course_write_behind = coursedata.CourseWriteBehind(flush_seconds=3600)
+    try:
+        at_cap = _post(ids[:routes.BULK_DETAILS_MAX_IDS])
+        assert at_cap.status_code == 200
+        assert len(at_cap.json()["data"]) == routes.BULK_DETAILS_MAX_IDS
+
+        calls = fakes.db.call_counts()
+        over_cap = _post(ids[:routes.BULK_DETAILS_MAX_IDS + 1])
+        assert over_cap.status_code == 422
+        assert fakes.db.call_counts() == calls
+    finally:
+        coursedata._course_write_behind.stop()
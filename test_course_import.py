@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+# Bulk manual course import: CSV records are split by csv.reader as the body
+# streams in, so quoting mistakes cost one row rather than the rest of the
+# upload, and every row comes back as inserted, duplicate or invalid.
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+HEADER = "term_code,college_code,college_name,trans_subj,trans_numb\n"
+
+
+def _setup():
+    return coursefakes.install(coursedata, routes)
+
+
+def _import(body: str, format=None, headers=None):
+    request = coursefakes.fake_request(headers=headers, body=body.encode())
+    result = asyncio.run(routes.import_manual_courses(request, format=format))
+    return result.data
+
+
+def _statuses(report):
+    return [(r["line"], r["status"]) for r in report["rows"]]
+
+
+def test_stray_quote_costs_only_its_own_row():
+    _setup()
+    report = _import(
+        HEADER
+        + '209930,000001,Quote"s College,MATH,101\n'
+        + '209930,000002,"Open College,MATH,102\n'
+        + '209930,000003,Third College,MATH,103\n'
+        + '209930,000004,Fourth College,MATH,104\n'
+    )
+    assert _statuses(report) == [(2, "inserted"), (3, "invalid"), (4, "inserted"), (5, "inserted")]
+    stored = coursedata.db_collection("course").find_one({"college_code": "000001"})
+    assert stored["college_name"] == 'Quote"s College'
+
+
+def test_stray_quote_mid_upload_is_given_up_on():
+    _setup()
+    lines = ['209930,000000,"Open College,MATH,100\n']
+    lines += [f"209930,{i:06d},College {i},MATH,{100 + i}\n" for i in range(1, routes.CSV_RECORD_MAX_LINES + 5)]
+    report = _import(HEADER + "".join(lines))
+    assert report["rows"][0] == {"line": 2, "status": "invalid", "error": "unreadable csv row"}
+    assert report["inserted"] == len(lines) - 1
+
+
+def test_quoted_field_over_several_lines():
+    _setup()
+    report = _import(HEADER + '209930,000001,"Line one\nline two\r\nline three",MATH,101\n209930,000002,Next,MATH,102')
+    assert _statuses(report) == [(2, "inserted"), (5, "inserted")]
+    stored = coursedata.db_collection("course").find_one({"college_code": "000001"})
+    assert stored["college_name"] == "Line one\nline two\nline three"
+
+
+def test_repeats_in_the_file_and_existing_courses_are_duplicates():
+    _setup()
+    _import(HEADER + "209930,000001,First,MATH,101\n")
+    report = _import(
+        HEADER
+        + "209930,000001,First again,MATH,101\n"
+        + "209930,000002,Second,MATH,102\n"
+        + "209930,000002,Second again,math,102\n"
+    )
+    assert _statuses(report) == [(2, "duplicate"), (3, "inserted"), (4, "duplicate")]
+    assert report["rows"][2]["error"] == "same course as line 3"
+    assert coursedata.db_collection("course").count_documents({"term_code": "209930"}) == 2
+
+
+def test_invalid_jsonl_lines_are_reported_by_line():
+    _setup()
+    report = _import(
+        '{"term_code": "209930", "college_code": "000001", "trans_subj": "MATH", "trans_numb": "101"}\n'
+        "\n"
+        '{"term_code": "209930", "college_code": "000002"\n'
+        '["not", "an", "object"]\n'
+        '{"term_code": "209930", "college_code": "000003", "trans_subj": "MATH"}\n',
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert _statuses(report) == [(1, "inserted"), (3, "invalid"), (4, "invalid"), (5, "invalid")]
+    assert report["invalid"] == 3
+
+
+def test_import_refuses_to_run_without_the_course_key_index():
+    fakes = _setup()
+    coursedata.ensure_course_indexes()
+    fakes.db.collection("course")._indexes.pop("uq_course_key")
+    with pytest.raises(HTTPException) as raised:
+        _import(HEADER + "209930,000001,First,MATH,101\n")
+    assert "uq_course_key" in raised.value.detail
+    assert fakes.db.collection("course").count_documents({}) == 0
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+# /metrics is per worker and admin-only; the on/off switch is a shared
+# setting that every worker follows, not a flag of the worker that got the PATCH.
+
+import os
+
+import pytest
+from fastapi import HTTPException
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+
+def _setup():
+    enabled = coursedata.METRICS_ENABLED
+    return coursefakes.install(coursedata, routes), enabled
+
+
+def test_toggle_is_shared_through_mongo():
+    _, enabled = _setup()
+    try:
+        routes.toggle_course_metrics(coursefakes.fake_request(), enabled=False)
+        assert coursedata.METRICS_ENABLED is False
+        # another worker still recording until it reads the setting
+        coursedata.METRICS_ENABLED = True
+        coursedata._load_metrics_setting()
+        assert coursedata.METRICS_ENABLED is False
+
+        routes.toggle_course_metrics(coursefakes.fake_request(), enabled=True)
+        coursedata.METRICS_ENABLED = False
+        coursedata._load_metrics_setting()
+        assert coursedata.METRICS_ENABLED is True
+    finally:
+        coursedata.METRICS_ENABLED = enabled
+
+
+def test_unset_setting_keeps_the_environment_default():
+    _, enabled = _setup()
+    coursedata._load_metrics_setting()
+    assert coursedata.METRICS_ENABLED is enabled
+
+
+def test_metrics_are_labelled_by_worker_and_need_the_admin_role():
+    _setup()
+    body = routes.course_metrics(coursefakes.fake_request()).body.decode()
+    samples = [line for line in body.splitlines() if line and not line.startswith("#")]
+    assert samples and all(f'worker="{os.getpid()}"' in line for line in samples)
+
+    for call in (lambda request: routes.course_metrics(request),
+                 lambda request: routes.toggle_course_metrics(request, enabled=False)):
+        with pytest.raises(HTTPException) as raised:
+            call(coursefakes.fake_request(roles=["Reader"]))
+        assert raised.value.status_code == 403
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+# POST /course/refresh starts a background job and returns at once; the
+# per-term reports are polled from GET /course/refresh/{job_id}, which any
+# worker can answer since the job lives in Mongo.
+
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+TERMS = ["209910", "209920", "209930"]
+ORACLE_LATENCY = 0.2
+
+
+def _setup():
+    return coursefakes.install(
+        coursedata, routes,
+        driver=coursefakes.FakeOracleDriver(
+            terms={term: coursefakes.synthetic_term_rows(term, 200) for term in TERMS},
+            query_latency=ORACLE_LATENCY,
+        ),
+    )
+
+
+def _start(terms, roles=None):
+    return routes.refresh_course_terms(coursefakes.fake_request(roles=roles), routes.RefreshTermsPayload(term_codes=terms)).data
+
+
+def _wait(job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = routes.refresh_course_terms_status(coursefakes.fake_request(), job_id).data
+        if job["status"] in ("done", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def test_refresh_runs_in_the_background_and_reports_each_term():
+    _setup()
+    started = time.perf_counter()
+    job = _start(TERMS + [TERMS[0]])
+    assert time.perf_counter() - started < ORACLE_LATENCY
+    assert job["status"] == "pending" and job["term_codes"] == TERMS
+    assert job["terms"] == {term: None for term in TERMS}
+
+    done = _wait(job["job_id"])
+    assert done["status"] == "done" and done["finished_at"] is not None
+    assert {term: report["status"] for term, report in done["terms"].items()} == {term: "refreshed" for term in TERMS}
+    assert all(report["rows"] == 200 for report in done["terms"].values())
+
+
+def test_jobs_beyond_the_active_limit_are_refused():
+    _setup()
+    active = coursedata.REFRESH_JOBS_MAX_ACTIVE
+    coursedata.REFRESH_JOBS_MAX_ACTIVE = 2
+    try:
+        first = _start(TERMS[:1])
+        second = _start(TERMS[1:2])
+        with pytest.raises(HTTPException) as raised:
+            _start(TERMS[2:])
+        assert raised.value.status_code == 429
+    finally:
+        coursedata.REFRESH_JOBS_MAX_ACTIVE = active
+    assert _wait(first["job_id"])["status"] == "done"
+    assert _wait(second["job_id"])["status"] == "done"
+    # finished jobs free their places
+    assert _wait(_start(TERMS[2:])["job_id"])["status"] == "done"
+
+
+def test_refresh_jobs_need_the_admin_role():
+    _setup()
+    with pytest.raises(HTTPException) as raised:
+        _start(TERMS, roles=["Reader"])
+    assert raised.value.status_code == 403
+    with pytest.raises(HTTPException) as raised:
+        routes.refresh_course_terms_status(coursefakes.fake_request(roles=["Reader"]), "x")
+    assert raised.value.status_code == 403
+    with pytest.raises(HTTPException) as raised:
+        routes.refresh_course_terms_status(coursefakes.fake_request(), "missing")
+    assert raised.value.status_code == 404
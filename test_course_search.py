@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+# Course search: the index of a searched term is carried over to a reloaded
+# snapshot (only new or edited courses are re-tokenized) and must match a
+# full rebuild; ranking with heapq.nsmallest must match a full sort.
+
+import time
+
+from bson import ObjectId
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+TERM = "209930"
+
+
+def _setup():
+    fakes = coursefakes.install(
+        coursedata, routes,
+        driver=coursefakes.FakeOracleDriver(terms={TERM: coursefakes.synthetic_term_rows(TERM, 3000, colleges=50)}),
+    )
+    coursedata.list_courses_for_term(TERM)
+    return fakes
+
+
+def _postings(index):
+    return {field: {token: sorted(rows) for token, rows in postings.items()}
+            for field, postings in index.postings.items()}
+
+
+def _entry():
+    with coursedata._cache_lock:
+        return coursedata._course_cache[TERM]
+
+
+def test_reloaded_snapshot_carries_the_search_index_over():
+    fakes = _setup()
+    assert coursedata.search_courses_for_term(TERM, "math")["total"] > 0
+    col = fakes.db.collection("course")
+    docs = list(col.find({"term_code": TERM}))
+    col.update_one({"_id": docs[10]["_id"]}, {"$set": {"college_name": "Lakeside Polytechnic"}})
+    col.delete_many({"_id": docs[20]["_id"]})
+    col.insert_one({**{k: v for k, v in docs[30].items() if k != "_id"}, "_id": ObjectId(),
+                    "college_code": "000000", "trans_subj": "ZOOL", "trans_numb": "201"})
+
+    coursedata._cache_term(TERM, coursedata._load_term_from_mongo(TERM), time.time())
+    entry = _entry()
+    assert entry.search_index is not None
+    rebuilt = coursedata._build_search_index(list(entry.rows), dict(entry.field_pos))
+    assert _postings(entry.search_index) == _postings(rebuilt)
+    assert entry.search_index.tokens == rebuilt.tokens
+
+    assert coursedata.search_courses_for_term(TERM, "lakeside")["total"] == 1
+    assert coursedata.search_courses_for_term(TERM, "zool201")["results"][0]["trans_subj"] == "ZOOL"
+    assert str(docs[20]["_id"]) not in {r["_id"] for r in coursedata.search_courses_for_term(TERM, docs[20]["college_code"])["results"]}
+
+
+def test_pages_match_a_full_sort():
+    _setup()
+    entry = _entry()
+    coursedata._ensure_search_index(entry)
+    scores = entry.search_index.search(["comm", "1"])
+    expected = sorted(scores, key=lambda i: (-scores[i], i))
+    ids = [coursedata.CourseCacheEntry.unpack(tuple(entry.fields), entry.rows[i])["_id"] for i in expected]
+
+    pages = []
+    for page in range(1, 4):
+        result = coursedata.search_courses_for_term(TERM, "comm 1", page=page, page_size=25)
+        assert result["total"] == len(expected)
+        pages += [r["_id"] for r in result["results"]]
+    assert pages == ids[:75]
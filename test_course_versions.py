@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+# Snapshot versions, ETags and ?since= deltas of the course list follow the
+# per-term write sequence, not updated_at: writes stamped by a skewed clock,
+# or landing after a reader already saw a newer one, still show up.
+
+import json
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+TERM = "209930"
+
+
+def _setup():
+    fakes = coursefakes.install(
+        coursedata, routes,
+        driver=coursefakes.FakeOracleDriver(terms={TERM: coursefakes.synthetic_term_rows(TERM, 300)}),
+    )
+    courses = coursedata.find_courses_for_term(TERM, ["RF", "RT"])
+    return fakes, courses
+
+
+def _list(headers=None, since=None):
+    return routes.display_course(coursefakes.fake_request(headers=headers), TERM,
+                                 routes.RequestsSearchFilter(search=""), since=since)
+
+
+def _delta(since):
+    return json.loads(_list(since=since).body)["data"]
+
+
+# A write made by another worker: lands in Mongo, then (unless `sequence` is
+# off, i.e. the writer hasn't got that far yet) takes its sequence value
+def _write_elsewhere(fakes, course_id, fields, sequence=True, **overrides):
+    fields = {**coursedata.course_write_fields(fields), **overrides}
+    fakes.db.collection("course").update_one({"_id": ObjectId(course_id)}, {"$set": fields})
+    if sequence:
+        coursedata._sequence_term_writes(TERM, fields["seq_pending"])
+    return fields
+
+
+def test_write_with_an_older_stamp_still_moves_the_version():
+    fakes, courses = _setup()
+    first = _list()
+    etag, version = first.headers["etag"], int(first.headers["x-course-version"])
+    assert _list(headers={"if-none-match": etag}).status_code == 304
+
+    _write_elsewhere(fakes, courses[0]["_id"], {"status": "RT"})
+    # stamped by a host whose clock is well behind
+    _write_elsewhere(fakes, courses[1]["_id"], {"status": "RT"}, updated_at=datetime(2000, 1, 1))
+
+    second = _list(headers={"if-none-match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    changed = [c["_id"] for c in _delta(version)["courses"]]
+    assert sorted(changed) == sorted([courses[0]["_id"], courses[1]["_id"]])
+
+
+def test_delta_includes_a_write_that_landed_after_a_newer_one():
+    fakes, courses = _setup()
+    version = int(_list().headers["x-course-version"])
+
+    # the first writer's update has landed but not been sequenced yet when a
+    # second writer finishes and moves the counter
+    slow = _write_elsewhere(fakes, courses[0]["_id"], {"status": "RT"}, sequence=False)
+    _write_elsewhere(fakes, courses[1]["_id"], {"status": "RT"})
+    delta = _delta(version)
+    assert {c["_id"] for c in delta["courses"]} == {courses[0]["_id"], courses[1]["_id"]}
+
+    # once sequenced, the slow write is in the delta from the version just served
+    served = delta["version"]
+    coursedata._sequence_term_writes(TERM, slow["seq_pending"])
+    _write_elsewhere(fakes, courses[2]["_id"], {"note": "x"})
+    assert courses[2]["_id"] in {c["_id"] for c in _delta(served)["courses"]}
+    stored = fakes.db.collection("course").find_one({"_id": ObjectId(courses[0]["_id"])})
+    assert "seq_pending" not in stored and stored["seq"] > version
+
+
+def test_delta_after_a_local_write_and_a_concurrent_remote_one():
+    fakes, courses = _setup()
+    version = int(_list().headers["x-course-version"])
+
+    local = coursedata.course_write_fields({"status": "SE"})
+    fakes.db.collection("course").update_one({"_id": ObjectId(courses[0]["_id"])}, {"$set": local})
+    _write_elsewhere(fakes, courses[1]["_id"], {"status": "SE"})
+    coursedata.update_cached_course(TERM, courses[0]["_id"], local)
+
+    delta = _delta(version)
+    assert delta["version"] > version
+    # SE drops out of the RF/RT listing
+    assert set(delta["removed"]) == {courses[0]["_id"], courses[1]["_id"]}
+    assert _delta(delta["version"])["removed"] == []
+
+
+def test_remote_writes_wait_for_the_check_interval_local_ones_do_not():
+    fakes, courses = _setup()
+    interval = coursedata.WRITE_CHECK_SECONDS
+    coursedata.WRITE_CHECK_SECONDS = 60
+    try:
+        version = int(_list().headers["x-course-version"])
+        # another worker's write moves the shared counter only
+        _write_elsewhere(fakes, courses[0]["_id"], {"status": "RT"}, sequence=False)
+        fakes.db.collection(coursedata.CACHE_VERSION_COLLECTION).update_one(
+            {"_id": coursedata._term_version_key(TERM)}, {"$inc": {"version": 1}})
+        assert int(_list().headers["x-course-version"]) == version
+
+        local = coursedata.course_write_fields({"status": "RT"})
+        fakes.db.collection("course").update_one({"_id": ObjectId(courses[1]["_id"])}, {"$set": local})
+        coursedata._sequence_term_writes(TERM, local["seq_pending"])
+        changed = {c["_id"] for c in _delta(version)["courses"]}
+        assert {courses[0]["_id"], courses[1]["_id"]} <= changed
+    finally:
+        coursedata.WRITE_CHECK_SECONDS = interval
+
+
+def test_synced_inserts_are_in_the_delta_and_empty_syncs_skip_the_key_scan():
+    fakes, courses = _setup()
+    version = int(_list().headers["x-course-version"])
+
+    key_loads = []
+    existing_keys = coursedata._existing_course_keys
+    coursedata._existing_course_keys = lambda term: key_loads.append(term) or existing_keys(term)
+    try:
+        report = coursedata._insert_new_courses_from_oracle(TERM)
+        assert not report["full_sync"] and report["fetched"] == 0
+        assert key_loads == []
+
+        rows = fakes.driver.terms[TERM]
+        new_row = {**rows[-1], "TRANS_NUMB": "999", "ACTIVITY_DATE": rows[-1]["ACTIVITY_DATE"] + timedelta(days=1)}
+        rows.append(new_row)
+        report = coursedata._insert_new_courses_from_oracle(TERM)
+        assert report["inserted"] == 1 and key_loads == [TERM]
+    finally:
+        coursedata._existing_course_keys = existing_keys
+
+    stored = fakes.db.collection("course").find_one({"term_code": TERM, "trans_numb": "999"})
+    assert "seq_pending" not in stored and stored["seq"] > version
+    assert str(stored["_id"]) in {c["_id"] for c in _delta(version)["courses"]}
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+# Read-path backfills are queued and written later, only while the course
+# still has the values they were computed from; a synchronous write to the
+# course drops its queued backfill.
+
+import asyncio
+
+from bson import ObjectId
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+TERM = "209930"
+
+
+def _setup():
+    fakes = coursefakes.install(
+        coursedata, routes,
+        driver=coursefakes.FakeOracleDriver(terms={TERM: coursefakes.synthetic_term_rows(TERM, 50)}),
+    )
+    coursefakes.seed_department_configs(fakes.db)
+    # flushed by the tests, not the background thread
+    coursedata._course_write_behind = coursedata.CourseWriteBehind(flush_seconds=3600)
+    course = coursedata.find_courses_for_term(TERM, ["RF", "RT"])[0]
+    return fakes, course
+
+
+def _details(course):
+    payload = routes.CourseDetailsPayload(id=course["_id"], trans_subj=course["trans_subj"])
+    return asyncio.run(routes.get_course_details(coursefakes.fake_request(), TERM, payload)).data
+
+
+def _stored(fakes, course):
+    return fakes.db.collection("course").find_one({"_id": ObjectId(course["_id"])})
+
+
+def _cached(course):
+    with coursedata._cache_lock:
+        entry = coursedata._course_cache[TERM]
+        return coursedata.CourseCacheEntry.unpack(tuple(entry.fields), entry.rows[entry.by_id[course["_id"]]])
+
+
+def test_backfill_is_skipped_once_the_course_was_assigned_elsewhere():
+    fakes, course = _setup()
+    write_behind = coursedata._course_write_behind
+    try:
+        assert _details(course)["assigned_evaluator"] is not None
+        assert write_behind.get_stats()["pending"] == 1
+
+        # another worker assigns the course before the backfill is flushed
+        fakes.db.collection("course").update_one(
+            {"_id": ObjectId(course["_id"])},
+            {"$set": coursedata.course_write_fields({"assigned_evaluator": "E999", "evaluators": ["E999"]})},
+        )
+        assert write_behind.flush() == 0
+        stats = write_behind.get_stats()
+        assert (stats["skipped"], stats["written"], stats["pending"]) == (1, 0, 0)
+        stored = _stored(fakes, course)
+        assert stored["assigned_evaluator"] == "E999" and stored["evaluators"] == ["E999"]
+    finally:
+        write_behind.stop(timeout=1)
+
+
+def test_synchronous_write_drops_the_queued_backfill():
+    fakes, course = _setup()
+    write_behind = coursedata._course_write_behind
+    try:
+        _details(course)
+        assert write_behind.get_stats()["pending"] == 1
+
+        payload = routes.EvaluatorUpdate(id=course["_id"], evaluator_id="E777")
+        asyncio.run(routes.update_evaluator(coursefakes.fake_request(), payload))
+        stats = write_behind.get_stats()
+        assert (stats["discarded"], stats["pending"]) == (1, 0)
+
+        assert write_behind.flush() == 0
+        stored = _stored(fakes, course)
+        assert stored["assigned_evaluator"] == "E777" and stored["evaluators"] == ["E777"]
+        assert _cached(course)["assigned_evaluator"] == "E777"
+    finally:
+        write_behind.stop(timeout=1)
+
+
+def test_backfill_is_written_while_the_course_is_unchanged():
+    fakes, course = _setup()
+    write_behind = coursedata._course_write_behind
+    try:
+        details = _details(course)
+        assert write_behind.flush() == 1
+        stored = _stored(fakes, course)
+        assert stored["assigned_evaluator"] == details["assigned_evaluator"]
+        assert "seq_pending" not in stored and stored["seq"] > 0
+    finally:
+        write_behind.stop(timeout=1)
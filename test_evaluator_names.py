@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+# Evaluator names are matched to ids by the id the department helper returns
+# with each name, never by position: the helper may sort or drop names.
+
+import course as routes
+import coursefakes
+from data import course as coursedata
+
+IDS = ["E3", "E1", "E2"]
+NAMES = {"E1": "Zed", "E2": "Amy", "E3": "Mia"}
+
+
+def _setup(**department):
+    return coursefakes.install(coursedata, routes, department=coursefakes.FakeDepartment(**department))
+
+
+def test_names_keyed_by_returned_ids():
+    fakes = _setup(names=NAMES, ordered_by_name=True, with_ids=True)
+    names = coursedata.evaluator_names(IDS)
+    assert [n["name"] for n in names] == ["Mia", "Zed", "Amy"]
+    assert fakes.department.calls == 1
+
+
+def test_plain_names_are_looked_up_one_id_at_a_time():
+    fakes = _setup(names=NAMES, ordered_by_name=True)
+    assert coursedata.evaluator_names(IDS) == ["Mia", "Zed", "Amy"]
+    assert fakes.department.calls == 1 + len(IDS)
+    # cached per id afterwards
+    assert coursedata.evaluator_names(["E2", "E1"]) == ["Amy", "Zed"]
+    assert fakes.department.calls == 1 + len(IDS)
+
+
+def test_unknown_ids_are_left_out_not_shifted():
+    _setup(names={**NAMES, "E1": None})
+    assert coursedata.evaluator_names(IDS) == ["Mia", "Amy"]
+    _setup(names={**NAMES, "E1": None}, with_ids=True)
+    assert [n["name"] for n in coursedata.evaluator_names(IDS)] == ["Mia", "Amy"]